@@ -0,0 +1,563 @@
+"""
+Benchmarks del sistema de biblioteca.
+
+Uso:
+    python Benchmark_biblioteca.py memoria [--libros N]
+    python Benchmark_biblioteca.py escritura [--libros N] [--repeticiones N]
+    python Benchmark_biblioteca.py servidor [--libros N] [--tasa N] [--segundos N]
+    python Benchmark_biblioteca.py historial [--prestamos N] [--libros N]
+    python Benchmark_biblioteca.py aproximada [--libros N] [--palabras N]
+    python Benchmark_biblioteca.py arranque [--libros N] [--repeticiones N]
+    python Benchmark_biblioteca.py importacion [--filas N] [--duplicadas F]
+    python Benchmark_biblioteca.py respaldo [--libros N] [--prestamos N]
+    python Benchmark_biblioteca.py vistas [--libros N] [--repeticiones N]
+
+Cada subcomando mide una parte del sistema y muestra los resultados en
+una tabla de Rich.
+"""
+
+import argparse
+import asyncio
+import csv
+import gc
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+from rich.console import Console
+from rich.table import Table
+
+import Biblioteca
+from Biblioteca import (
+    ARCHIVO_BIBLIOTECA,
+    Catalogo,
+    Libro,
+    cargar_datos,
+    guardar_datos,
+    prestar_libro,
+    prestar_libros_lote,
+    ruta_cache,
+    ver_todos_los_libros,
+)
+from Biblioteca_historial import SIN_DEVOLVER, HistorialPrestamos
+from Biblioteca_importar import importar_archivo
+from Biblioteca_respaldo import respaldar, restaurar
+from Biblioteca_servidor import ClienteBiblioteca, ServidorBiblioteca
+
+console = Console()
+
+
+def generar_libros(cantidad: int) -> list[dict]:
+    """
+    Genera libros sintéticos con el esquema de diccionario del catálogo.
+
+    Args:
+        cantidad: Número de libros a generar
+
+    Returns:
+        Lista de diccionarios de libro
+    """
+    return [
+        {
+            "libro_id": f"{i:07d}",
+            "titulo": f"Libro de prueba {i}",
+            "autor": f"Autor {i % 5000}",
+            "isbn": f"978-{i:010d}",
+            "prestado_a": None,
+            "fecha_prestamo": None,
+        }
+        for i in range(cantidad)
+    ]
+
+
+def _memoria_contenedores(cantidad: int, como_libro: bool) -> int:
+    """Mide los bytes que ocupan solo los registros (sin los textos)."""
+    libros = generar_libros(cantidad)
+    gc.collect()
+    tracemalloc.start()
+    if como_libro:
+        registros = [Libro.desde_dict(libro) for libro in libros]
+    else:
+        registros = [dict(libro) for libro in libros]
+    actual, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del registros
+    return actual
+
+
+def benchmark_memoria(args: argparse.Namespace) -> None:
+    """Compara la memoria de ``Libro`` frente a diccionarios."""
+    bytes_dict = _memoria_contenedores(args.libros, como_libro=False)
+    bytes_libro = _memoria_contenedores(args.libros, como_libro=True)
+    escala = 1_000_000 / args.libros
+
+    tabla = Table(title=f"Memoria de {args.libros:,} registros (sin textos)")
+    tabla.add_column("Representación", style="cyan")
+    tabla.add_column("Bytes/libro", justify="right")
+    tabla.add_column("MiB por 1M libros", justify="right", style="green")
+    for nombre, total in (("dict", bytes_dict), ("Libro (slots)", bytes_libro)):
+        tabla.add_row(
+            nombre,
+            f"{total / args.libros:,.1f}",
+            f"{total * escala / 2**20:,.1f}",
+        )
+    console.print(tabla)
+    ahorro = (bytes_dict - bytes_libro) * escala / 2**20
+    console.print(f"Ahorro por 1M libros: [bold green]{ahorro:,.1f} MiB[/bold green]")
+
+
+def _cronometrar(funcion, repeticiones: int) -> float:
+    """Retorna los milisegundos promedio de ``repeticiones`` llamadas."""
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        funcion()
+    return (time.perf_counter() - inicio) * 1000 / repeticiones
+
+
+def benchmark_escritura(args: argparse.Namespace) -> None:
+    """Compara la escritura directa con la atómica de ``guardar_datos``."""
+    libros = generar_libros(args.libros)
+
+    with tempfile.TemporaryDirectory() as directorio:
+        archivo = str(Path(directorio) / "biblioteca.json")
+
+        def escritura_directa() -> None:
+            with open(archivo, "w", encoding="utf-8") as f:
+                json.dump(libros, f, ensure_ascii=False, indent=2)
+
+        def escritura_con_cambio(sincronizar: bool) -> None:
+            # Alterna un préstamo para que el contenido cambie siempre
+            libro = libros[0]
+            libro["prestado_a"] = None if libro["prestado_a"] else "Benchmark"
+            guardar_datos(libros, archivo, sincronizar=sincronizar)
+
+        casos = [
+            ("open('w') + json.dump (anterior)", escritura_directa),
+            ("atómica con fsync", lambda: escritura_con_cambio(True)),
+            ("atómica sin fsync", lambda: escritura_con_cambio(False)),
+            ("sin cambios (se omite)", lambda: guardar_datos(libros, archivo)),
+        ]
+
+        tabla = Table(title=f"Escritura de {args.libros:,} libros")
+        tabla.add_column("Modo", style="cyan")
+        tabla.add_column("ms/escritura", justify="right", style="green")
+        for nombre, funcion in casos:
+            tabla.add_row(nombre, f"{_cronometrar(funcion, args.repeticiones):,.1f}")
+        console.print(tabla)
+
+
+async def _carga_servidor(args: argparse.Namespace, archivo: str) -> dict:
+    """Envía peticiones a ritmo fijo y mide la latencia de cada una."""
+    servidor = ServidorBiblioteca(cargar_datos(archivo), archivo)
+    puerto = await servidor.iniciar(puerto=0)
+    clientes: asyncio.Queue = asyncio.Queue()
+    for _ in range(args.conexiones):
+        cliente = ClienteBiblioteca(puerto)
+        # Calentamiento: abre la conexión antes de empezar a medir
+        await cliente.buscar("prueba 0")
+        clientes.put_nowait(cliente)
+
+    aleatorio = random.Random(0)
+    latencias: list[float] = []
+
+    async def solicitar(programada: float, indice: int) -> None:
+        cliente = await clientes.get()
+        try:
+            libro_id = f"{aleatorio.randrange(args.libros):07d}"
+            tipo = indice % 4
+            if tipo == 0:
+                await cliente.prestar(libro_id, f"Quiosco {indice % 10}")
+            elif tipo == 1:
+                await cliente.devolver(libro_id)
+            else:
+                await cliente.buscar(f"prueba {aleatorio.randrange(args.libros)}")
+        finally:
+            clientes.put_nowait(cliente)
+        # Se mide desde el momento programado para no ocultar las esperas
+        latencias.append(time.perf_counter() - programada)
+
+    total = args.tasa * args.segundos
+    bucle = asyncio.get_running_loop()
+    tareas = []
+    inicio = time.perf_counter()
+    for indice in range(total):
+        programada = inicio + indice / args.tasa
+        espera = programada - time.perf_counter()
+        if espera > 0:
+            await asyncio.sleep(espera)
+        tareas.append(bucle.create_task(solicitar(programada, indice)))
+    await asyncio.gather(*tareas)
+    duracion = time.perf_counter() - inicio
+
+    while not clientes.empty():
+        await clientes.get_nowait().cerrar()
+    await servidor.cerrar()
+
+    percentiles = statistics.quantiles(latencias, n=100)
+    return {
+        "peticiones/s": total / duracion,
+        "p50 (ms)": percentiles[49] * 1000,
+        "p99 (ms)": percentiles[98] * 1000,
+        "ops/lote": servidor.operaciones / max(servidor.lotes, 1),
+    }
+
+
+def benchmark_servidor(args: argparse.Namespace) -> None:
+    """Mide la latencia del servidor HTTP bajo una tasa fija de peticiones."""
+    with tempfile.TemporaryDirectory() as directorio:
+        archivo = str(Path(directorio) / "biblioteca.json")
+        guardar_datos(generar_libros(args.libros), archivo)
+        resultados = asyncio.run(_carga_servidor(args, archivo))
+
+    tabla = Table(title=f"Servidor a {args.tasa:,} peticiones/s")
+    tabla.caption = "50% búsquedas, 25% préstamos, 25% devoluciones"
+    tabla.add_column("Métrica", style="cyan")
+    tabla.add_column("Valor", justify="right", style="green")
+    for nombre, valor in resultados.items():
+        tabla.add_row(nombre, f"{valor:,.2f}")
+    console.print(tabla)
+
+
+def benchmark_historial(args: argparse.Namespace) -> None:
+    """Mide las consultas vectorizadas sobre un historial sintético."""
+    generador = np.random.default_rng(0)
+    aprendices = args.libros // 10
+    inicio = generador.integers(1_600_000_000, 1_700_000_000, args.prestamos)
+    fin = inicio + generador.integers(3_600, 30 * 86_400, args.prestamos)
+    fin[generador.random(args.prestamos) < args.abiertos] = SIN_DEVOLVER
+    historial = HistorialPrestamos.desde_codigos(
+        [f"{i:07d}" for i in range(args.libros)],
+        [f"Aprendiz {i}" for i in range(aprendices)],
+        {
+            "libro": generador.zipf(1.5, args.prestamos) % args.libros,
+            "aprendiz": generador.integers(0, aprendices, args.prestamos),
+            "inicio": inicio,
+            "fin": fin,
+        },
+    )
+
+    casos = [
+        ("libros más prestados (top 10)", lambda: historial.mas_prestados(10)),
+        ("duración promedio", historial.duracion_promedio),
+        (
+            "aprendices más activos (top 10)",
+            lambda: historial.aprendices_mas_activos(10),
+        ),
+    ]
+    tabla = Table(title=f"Consultas sobre {args.prestamos:,} préstamos")
+    tabla.add_column("Consulta", style="cyan")
+    tabla.add_column("ms", justify="right", style="green")
+    for nombre, funcion in casos:
+        tabla.add_row(nombre, f"{_cronometrar(funcion, args.repeticiones):,.1f}")
+    console.print(tabla)
+
+
+_SILABAS = ["ba", "ca", "de", "fi", "go", "lu", "ma", "ne", "po", "qui", "ra", "so"]
+
+
+def _con_error(palabra: str, generador: random.Random) -> str:
+    """Introduce un error de escritura: borra, cambia o duplica una letra."""
+    posicion = generador.randrange(len(palabra))
+    error = generador.choice(["borrar", "cambiar", "duplicar"])
+    if error == "borrar":
+        return palabra[:posicion] + palabra[posicion + 1 :]
+    if error == "cambiar":
+        letra = generador.choice("abcdefghijklmnopqrstuvwxyz")
+        return palabra[:posicion] + letra + palabra[posicion + 1 :]
+    return palabra[:posicion] + palabra[posicion] + palabra[posicion:]
+
+
+def benchmark_aproximada(args: argparse.Namespace) -> None:
+    """Mide la búsqueda aproximada por trigramas sobre un catálogo grande."""
+    generador = random.Random(0)
+    vocabulario = sorted(
+        {
+            "".join(generador.choices(_SILABAS, k=generador.randint(2, 4)))
+            for _ in range(args.palabras)
+        }
+    )
+    libros = [
+        {
+            "libro_id": f"{i:07d}",
+            "titulo": " ".join(generador.choices(vocabulario, k=3)),
+            "autor": " ".join(generador.choices(vocabulario, k=2)),
+            "isbn": f"978-{i:010d}",
+            "prestado_a": None,
+            "fecha_prestamo": None,
+        }
+        for i in range(args.libros)
+    ]
+    catalogo = Catalogo(libros)
+    consultas = [
+        " ".join(
+            _con_error(palabra, generador)
+            for palabra in generador.choice(libros)["titulo"].split()[:2]
+        )
+        for _ in range(args.consultas)
+    ]
+
+    inicio = time.perf_counter()
+    catalogo.buscar_aproximado(consultas[0])
+    construccion = time.perf_counter() - inicio
+
+    tiempos = []
+    for consulta in consultas:
+        inicio = time.perf_counter()
+        catalogo.buscar_aproximado(consulta)
+        tiempos.append(time.perf_counter() - inicio)
+    percentiles = statistics.quantiles(tiempos, n=100)
+
+    tabla = Table(title=f"Búsqueda aproximada en {args.libros:,} libros")
+    tabla.caption = f"{len(vocabulario):,} palabras distintas"
+    tabla.add_column("Métrica", style="cyan")
+    tabla.add_column("ms", justify="right", style="green")
+    tabla.add_row("construcción del índice", f"{construccion * 1000:,.1f}")
+    tabla.add_row("consulta p50", f"{percentiles[49] * 1000:,.2f}")
+    tabla.add_row("consulta p99", f"{percentiles[98] * 1000:,.2f}")
+    console.print(tabla)
+
+
+def _tiempo_hasta_menu(directorio: str) -> float:
+    """Lanza la aplicación y mide cuánto tarda en pedir la primera opción."""
+    inicio = time.perf_counter()
+    proceso = subprocess.Popen(
+        [sys.executable, str(Path(__file__).with_name("Biblioteca.py"))],
+        cwd=directorio,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        env={**os.environ, "PYTHONUNBUFFERED": "1"},
+    )
+    salida = b""
+    while b"Seleccione" not in salida:
+        bloque = proceso.stdout.read1(4096)
+        if not bloque:
+            proceso.kill()
+            raise RuntimeError("La aplicación terminó sin mostrar el menú")
+        salida += bloque
+    transcurrido = time.perf_counter() - inicio
+    proceso.communicate(b"7\ny\n")
+    return transcurrido
+
+
+def benchmark_arranque(args: argparse.Namespace) -> None:
+    """Mide el tiempo hasta el primer menú, sin y con caché del catálogo."""
+    with tempfile.TemporaryDirectory() as directorio:
+        archivo = Path(directorio) / ARCHIVO_BIBLIOTECA
+        cache = Path(ruta_cache(str(archivo)))
+        guardar_datos(generar_libros(args.libros), str(archivo))
+
+        tiempos_sin_cache = []
+        for _ in range(args.repeticiones):
+            cache.unlink(missing_ok=True)
+            tiempos_sin_cache.append(_tiempo_hasta_menu(directorio))
+        tiempos_con_cache = [
+            _tiempo_hasta_menu(directorio) for _ in range(args.repeticiones)
+        ]
+        inicio = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "pass"], check=True)
+        interprete = time.perf_counter() - inicio
+
+    tabla = Table(title=f"Tiempo hasta el primer menú ({args.libros:,} libros)")
+    tabla.caption = f"mediana de {args.repeticiones} arranques"
+    tabla.add_column("Arranque", style="cyan")
+    tabla.add_column("ms", justify="right", style="green")
+    tabla.add_row("solo el intérprete", f"{interprete * 1000:,.1f}")
+    tabla.add_row(
+        "sin caché (JSON)", f"{statistics.median(tiempos_sin_cache) * 1000:,.1f}"
+    )
+    tabla.add_row("con caché", f"{statistics.median(tiempos_con_cache) * 1000:,.1f}")
+    console.print(tabla)
+
+
+def benchmark_importacion(args: argparse.Namespace) -> None:
+    """Mide la importación de un CSV grande con filas repetidas por ISBN."""
+    generador = random.Random(0)
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta_csv = Path(directorio) / "catalogo.csv"
+        with open(ruta_csv, "w", encoding="utf-8", newline="") as f:
+            escritor = csv.writer(f)
+            escritor.writerow(["libro_id", "titulo", "autor", "isbn"])
+            for i in range(args.filas):
+                # Una parte de las filas repite el ISBN de otra anterior
+                isbn = (
+                    generador.randrange(i)
+                    if i and generador.random() < args.duplicadas
+                    else i
+                )
+                escritor.writerow(
+                    [
+                        f"{i:07d}",
+                        f"Libro de prueba {i}",
+                        f"Autor {i % 5000}",
+                        f"978{isbn:010d}",
+                    ]
+                )
+
+        archivo = str(Path(directorio) / "biblioteca.json")
+        catalogo = Catalogo()
+        resumen = importar_archivo(catalogo, str(ruta_csv), archivo)
+
+    tabla = Table(title=f"Importación de {args.filas:,} filas CSV")
+    tabla.add_column("Métrica", style="cyan")
+    tabla.add_column("Valor", justify="right", style="green")
+    tabla.add_row("importadas", f"{resumen.importadas:,}")
+    for motivo, cantidad in resumen.descartadas.items():
+        tabla.add_row(f"descartadas ({motivo})", f"{cantidad:,}")
+    tabla.add_row("segundos (con el guardado)", f"{resumen.segundos:,.2f}")
+    tabla.add_row("filas/s", f"{resumen.filas_por_segundo:,.0f}")
+    console.print(tabla)
+
+
+def benchmark_respaldo(args: argparse.Namespace) -> None:
+    """Compara un respaldo completo con uno incremental tras unos préstamos."""
+    generador = random.Random(0)
+    with tempfile.TemporaryDirectory() as directorio:
+        archivo = str(Path(directorio) / "biblioteca.json")
+        respaldos = Path(directorio) / "respaldos"
+        guardar_datos(generar_libros(args.libros), archivo)
+
+        filas = []
+        inicio = time.perf_counter()
+        completo = respaldar(archivo, respaldos)
+        filas.append(("completo", completo, time.perf_counter() - inicio))
+
+        libros = cargar_datos(archivo)
+        prestamos = [
+            (f"{i:07d}", f"Aprendiz {i}")
+            for i in generador.sample(range(args.libros), args.prestamos)
+        ]
+        prestar_libros_lote(libros, prestamos, archivo, diario=True)
+        inicio = time.perf_counter()
+        delta = respaldar(archivo, respaldos)
+        filas.append(("delta", delta, time.perf_counter() - inicio))
+
+        inicio = time.perf_counter()
+        restaurar(archivo, respaldos)
+        segundos_restaurar = time.perf_counter() - inicio
+
+        tabla = Table(
+            title=f"Respaldo de {args.libros:,} libros ({args.prestamos:,} préstamos)"
+        )
+        tabla.add_column("Respaldo", style="cyan")
+        tabla.add_column("Libros", justify="right")
+        tabla.add_column("Tamaño", justify="right", style="green")
+        tabla.add_column("Segundos", justify="right", style="green")
+        for nombre, respaldo, segundos in filas:
+            tabla.add_row(
+                nombre,
+                f"{respaldo.libros:,}",
+                f"{respaldo.ruta.stat().st_size / 1024:,.1f} KiB",
+                f"{segundos:.2f}",
+            )
+        tabla.add_row(
+            "restaurar (completo + delta)", "", "", f"{segundos_restaurar:.2f}"
+        )
+    console.print(tabla)
+
+
+def benchmark_vistas(args: argparse.Namespace) -> None:
+    """Mide "Ver todos los libros" sin caché, repetida y tras un préstamo."""
+    catalogo = Catalogo(
+        [Libro.desde_dict(libro) for libro in generar_libros(args.libros)]
+    )
+    consola = Biblioteca.console.resolver()
+    salida_original = consola.file
+    with (
+        open(os.devnull, "w", encoding="utf-8") as nulo,
+        tempfile.TemporaryDirectory() as directorio,
+    ):
+        consola.file = nulo
+        try:
+            inicio = time.perf_counter()
+            ver_todos_los_libros(catalogo)
+            primera = time.perf_counter() - inicio
+            repetida = _cronometrar(
+                lambda: ver_todos_los_libros(catalogo), args.repeticiones
+            )
+            prestar_libro(
+                catalogo, "0000000", "Ana", str(Path(directorio) / "biblioteca.json")
+            )
+            inicio = time.perf_counter()
+            ver_todos_los_libros(catalogo)
+            tras_prestamo = time.perf_counter() - inicio
+        finally:
+            consola.file = salida_original
+
+    tabla = Table(title=f"Ver todos los libros ({args.libros:,} libros)")
+    tabla.add_column("Vista", style="cyan")
+    tabla.add_column("Milisegundos", justify="right", style="green")
+    tabla.add_row("primera (renderiza)", f"{primera * 1000:,.1f}")
+    tabla.add_row("repetida (caché)", f"{repetida:,.2f}")
+    tabla.add_row("tras un préstamo (renderiza)", f"{tras_prestamo * 1000:,.1f}")
+    console.print(tabla)
+
+
+def main() -> None:
+    """Ejecuta el benchmark indicado en la línea de comandos."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    memoria = subparsers.add_parser("memoria", help="Libro frente a dict")
+    memoria.add_argument("--libros", type=int, default=1_000_000)
+    memoria.set_defaults(funcion=benchmark_memoria)
+
+    escritura = subparsers.add_parser("escritura", help="ruta de guardado")
+    escritura.add_argument("--libros", type=int, default=100_000)
+    escritura.add_argument("--repeticiones", type=int, default=5)
+    escritura.set_defaults(funcion=benchmark_escritura)
+
+    servidor = subparsers.add_parser("servidor", help="latencia del servicio HTTP")
+    servidor.add_argument("--libros", type=int, default=10_000)
+    servidor.add_argument("--tasa", type=int, default=1000)
+    servidor.add_argument("--segundos", type=int, default=5)
+    servidor.add_argument("--conexiones", type=int, default=64)
+    servidor.set_defaults(funcion=benchmark_servidor)
+
+    historial = subparsers.add_parser("historial", help="consultas del historial")
+    historial.add_argument("--prestamos", type=int, default=10_000_000)
+    historial.add_argument("--libros", type=int, default=100_000)
+    historial.add_argument("--abiertos", type=float, default=0.01)
+    historial.add_argument("--repeticiones", type=int, default=5)
+    historial.set_defaults(funcion=benchmark_historial)
+
+    aproximada = subparsers.add_parser("aproximada", help="búsqueda por trigramas")
+    aproximada.add_argument("--libros", type=int, default=1_000_000)
+    aproximada.add_argument("--palabras", type=int, default=50_000)
+    aproximada.add_argument("--consultas", type=int, default=200)
+    aproximada.set_defaults(funcion=benchmark_aproximada)
+
+    arranque = subparsers.add_parser("arranque", help="tiempo hasta el menú")
+    arranque.add_argument("--libros", type=int, default=100_000)
+    arranque.add_argument("--repeticiones", type=int, default=3)
+    arranque.set_defaults(funcion=benchmark_arranque)
+
+    importacion = subparsers.add_parser("importacion", help="importación masiva")
+    importacion.add_argument("--filas", type=int, default=1_000_000)
+    importacion.add_argument("--duplicadas", type=float, default=0.05)
+    importacion.set_defaults(funcion=benchmark_importacion)
+
+    respaldo = subparsers.add_parser("respaldo", help="respaldo incremental")
+    respaldo.add_argument("--libros", type=int, default=1_000_000)
+    respaldo.add_argument("--prestamos", type=int, default=100)
+    respaldo.set_defaults(funcion=benchmark_respaldo)
+
+    vistas = subparsers.add_parser("vistas", help="caché de tablas renderizadas")
+    vistas.add_argument("--libros", type=int, default=5_000)
+    vistas.add_argument("--repeticiones", type=int, default=20)
+    vistas.set_defaults(funcion=benchmark_vistas)
+
+    args = parser.parse_args()
+    args.funcion(args)
+
+
+if __name__ == "__main__":
+    main()
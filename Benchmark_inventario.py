@@ -0,0 +1,218 @@
+"""
+Benchmarks del inventario del vivero.
+
+Uso:
+    python Benchmark_inventario.py ventas [--productos N] [--ventas N] [--lote N]
+    python Benchmark_inventario.py consultas [--ventas N] [--dias N] [--productos N]
+
+Cada subcomando mide una parte del sistema y muestra los resultados en
+una tabla de Rich.
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+from rich.console import Console
+from rich.table import Table
+
+import Inventario_json
+from Inventario_json import Inventario, guardar_inventario, registrar_ventas
+from Inventario_ventas import SEGUNDOS_POR_DIA, RegistroVentas, a_segundos_locales
+
+console = Console()
+
+CATEGORIAS = ["Flores", "Arbustos", "Macetas", "Semillas", "Herramientas"]
+
+
+def generar_productos(cantidad: int) -> list[dict]:
+    """
+    Genera productos sintéticos con el esquema del inventario.
+
+    Args:
+        cantidad: Número de productos a generar
+
+    Returns:
+        Lista de diccionarios con ``id``, ``nombre``, ``cantidad``,
+        ``precio`` y ``categoria``
+    """
+    rng = random.Random(42)
+    return [
+        {
+            "id": producto_id,
+            "nombre": f"Producto {producto_id}",
+            "cantidad": rng.randint(1_000, 100_000),
+            "precio": rng.randint(500, 50_000),
+            "categoria": rng.choice(CATEGORIAS),
+        }
+        for producto_id in range(1, cantidad + 1)
+    ]
+
+
+def generar_ventas(productos: int, cantidad: int) -> list[tuple[int, int]]:
+    """Genera pares (id, cantidad) de ventas; algunas piden de más."""
+    rng = random.Random(7)
+    return [
+        (rng.randint(1, productos), rng.choice((1, 1, 2, 3, 200_000)))
+        for _ in range(cantidad)
+    ]
+
+
+def _vender_de_a_una(
+    inventario: Inventario, ventas: list[tuple[int, int]], archivo: str
+) -> None:
+    """Vende como el menú antes del lote: guardar tras cada venta."""
+    for producto_id, cantidad in ventas:
+        producto = inventario.buscar_por_id(producto_id)
+        if cantidad <= producto["cantidad"]:
+            inventario.actualizar(producto, cantidad=producto["cantidad"] - cantidad)
+            guardar_inventario(inventario, archivo)
+
+
+def benchmark_ventas(args: argparse.Namespace) -> None:
+    """Compara guardar tras cada venta con ``registrar_ventas`` por lotes."""
+    ventas = generar_ventas(args.productos, args.ventas)
+    salida_original = Inventario_json.console.file
+    filas = []
+    with (
+        open(os.devnull, "w", encoding="utf-8") as nulo,
+        tempfile.TemporaryDirectory() as directorio,
+    ):
+        Inventario_json.console.file = nulo
+        try:
+            archivo = str(Path(directorio) / "individual.json")
+            inventario = Inventario(generar_productos(args.productos))
+            # Guardar tras cada venta es lento: basta una muestra
+            muestra = ventas[: args.lote]
+            inicio = time.perf_counter()
+            _vender_de_a_una(inventario, muestra, archivo)
+            filas.append(
+                ("una por guardado", len(muestra), time.perf_counter() - inicio)
+            )
+
+            archivo = str(Path(directorio) / "lotes.json")
+            inventario = Inventario(generar_productos(args.productos))
+            inicio = time.perf_counter()
+            for desde in range(0, len(ventas), args.lote):
+                registrar_ventas(inventario, ventas[desde : desde + args.lote], archivo)
+            filas.append(
+                (f"lotes de {args.lote:,}", len(ventas), time.perf_counter() - inicio)
+            )
+        finally:
+            Inventario_json.console.file = salida_original
+
+    tabla = Table(title=f"Ventas sobre {args.productos:,} productos")
+    tabla.add_column("Modo", style="cyan")
+    tabla.add_column("Ventas", justify="right")
+    tabla.add_column("Segundos", justify="right")
+    tabla.add_column("Ventas/s", justify="right", style="green")
+    for modo, cantidad, segundos in filas:
+        tabla.add_row(
+            modo, f"{cantidad:,}", f"{segundos:.2f}", f"{cantidad / segundos:,.0f}"
+        )
+    console.print(tabla)
+
+
+def _cronometrar(funcion, repeticiones: int) -> float:
+    """Retorna los milisegundos promedio de ``repeticiones`` llamadas."""
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        funcion()
+    return (time.perf_counter() - inicio) * 1000 / repeticiones
+
+
+def _recorriendo_ventas(
+    registro: RegistroVentas, desde: datetime, hasta: datetime
+) -> np.ndarray:
+    """Unidades por producto sumando cada venta, sin los acumulados."""
+    fechas = registro.columna("fecha")
+    elegidas = (fechas >= a_segundos_locales(desde)) & (
+        fechas < a_segundos_locales(hasta)
+    )
+    return np.bincount(
+        registro.columna("producto")[elegidas],
+        weights=registro.columna("cantidad")[elegidas],
+    )
+
+
+def benchmark_consultas(args: argparse.Namespace) -> None:
+    """Mide las consultas del registro de ventas sobre meses de ventas."""
+    generador = np.random.default_rng(0)
+    inicio_ventas = datetime(2026, 1, 1)
+    fechas = np.sort(
+        a_segundos_locales(inicio_ventas)
+        + generador.integers(0, args.dias * SEGUNDOS_POR_DIA, args.ventas)
+    )
+    productos = generador.zipf(1.3, args.ventas) % args.productos
+    registro = RegistroVentas(args.ventas)
+    inicio = time.perf_counter()
+    # Un lote por día, como llegarían desde registrar_ventas
+    cortes = np.searchsorted(
+        fechas,
+        a_segundos_locales(inicio_ventas) + SEGUNDOS_POR_DIA * np.arange(1, args.dias),
+    )
+    for lote in np.split(np.arange(args.ventas), cortes):
+        registro.agregar_columnas(
+            fechas[lote],
+            productos[lote].tolist(),
+            [CATEGORIAS[p % len(CATEGORIAS)] for p in productos[lote].tolist()],
+            generador.integers(1, 5, len(lote)),
+            generador.integers(500, 50_000, len(lote)),
+        )
+    carga = time.perf_counter() - inicio
+
+    mes = (inicio_ventas + timedelta(days=30, hours=9), inicio_ventas + timedelta(60))
+    casos = [
+        ("ingresos por día (todo)", lambda: registro.ingresos_por_periodo("dia")),
+        (
+            "ingresos por hora (un mes)",
+            lambda: registro.ingresos_por_periodo("hora", *mes),
+        ),
+        ("más vendidos (todo, top 10)", lambda: registro.mas_vendidos(10)),
+        ("más vendidos (un mes, top 10)", lambda: registro.mas_vendidos(10, *mes)),
+        ("categorías (todo)", registro.categorias_mas_vendidas),
+        (
+            "más vendidos (un mes) recorriendo ventas",
+            lambda: _recorriendo_ventas(registro, *mes),
+        ),
+    ]
+    tabla = Table(
+        title=f"Consultas sobre {args.ventas:,} ventas en {args.dias} días "
+        f"(carga: {carga:.1f} s)"
+    )
+    tabla.add_column("Consulta", style="cyan")
+    tabla.add_column("ms", justify="right", style="green")
+    for nombre, funcion in casos:
+        tabla.add_row(nombre, f"{_cronometrar(funcion, args.repeticiones):,.2f}")
+    console.print(tabla)
+
+
+def main() -> None:
+    """Ejecuta el benchmark indicado en la línea de comandos."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    ventas = subparsers.add_parser("ventas", help="ventas individuales o por lotes")
+    ventas.add_argument("--productos", type=int, default=5_000)
+    ventas.add_argument("--ventas", type=int, default=100_000)
+    ventas.add_argument("--lote", type=int, default=1_000)
+    ventas.set_defaults(funcion=benchmark_ventas)
+
+    consultas = subparsers.add_parser("consultas", help="registro de ventas")
+    consultas.add_argument("--ventas", type=int, default=5_000_000)
+    consultas.add_argument("--dias", type=int, default=180)
+    consultas.add_argument("--productos", type=int, default=5_000)
+    consultas.add_argument("--repeticiones", type=int, default=20)
+    consultas.set_defaults(funcion=benchmark_consultas)
+
+    args = parser.parse_args()
+    args.funcion(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,20 +6,531 @@ el préstamo de libros en una biblioteca, con persistencia en JSON
 y presentación usando Rich.
 """
 
+import codecs
+import gc
+import heapq
+import importlib
 import json
-from datetime import datetime
+import os
+import pickle
+import sys
+import weakref
+from collections import Counter, OrderedDict
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, fields
+from datetime import datetime, timedelta
+from itertools import islice, takewhile
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from rich.console import Console
-from rich.panel import Panel
-from rich.prompt import Confirm, Prompt
-from rich.table import Table
+import Biblioteca_sqlite
+import Bloqueo_archivo
+from Biblioteca_busqueda import TOP_K, IndiceTexto
+from Escritura_atomica import abrir_atomico, escribir_atomico
 
-console = Console()
+if TYPE_CHECKING:
+    from Biblioteca_historial import HistorialPrestamos
+
+
+class _Diferido:
+    """
+    Referencia a un módulo (o a un objeto suyo) que se importa al usarla.
+
+    Rich y NumPy tardan en importarse; con esta referencia solo se cargan
+    si de verdad se muestran tablas o se lleva el historial, y un script
+    que solo consulta el catálogo no los importa. Los atributos y las
+    llamadas se delegan en el objeto real.
+    """
+
+    def __init__(self, modulo: str, nombre: str | None = None, instanciar=False):
+        """
+        Prepara la referencia sin importar nada todavía.
+
+        Args:
+            modulo: Nombre del módulo a importar
+            nombre: Objeto del módulo a usar (None para el módulo mismo)
+            instanciar: Si es True, se usa una instancia del objeto
+        """
+        self._modulo = modulo
+        self._nombre = nombre
+        self._instanciar = instanciar
+        self._objeto = None
+
+    def resolver(self):
+        """Importa (la primera vez) y retorna el objeto real."""
+        if self._objeto is None:
+            objeto = importlib.import_module(self._modulo)
+            if self._nombre is not None:
+                objeto = getattr(objeto, self._nombre)
+            self._objeto = objeto() if self._instanciar else objeto
+        return self._objeto
+
+    def __getattr__(self, nombre: str):
+        return getattr(self.resolver(), nombre)
+
+    def __call__(self, *args, **kwargs):
+        return self.resolver()(*args, **kwargs)
+
+
+console = _Diferido("rich.console", "Console", instanciar=True)
+Confirm = _Diferido("rich.prompt", "Confirm")
+Panel = _Diferido("rich.panel", "Panel")
+Progress = _Diferido("rich.progress", "Progress")
+Prompt = _Diferido("rich.prompt", "Prompt")
+Table = _Diferido("rich.table", "Table")
+Biblioteca_historial = _Diferido("Biblioteca_historial")
 
 
 ARCHIVO_BIBLIOTECA = "biblioteca.json"
 
+# Tamaño (en bytes) a partir del cual el diario se integra en el archivo principal
+UMBRAL_COMPACTACION = 1024 * 1024
+
+# Tamaño de cada lectura del cargador incremental y tamaño de archivo a partir
+# del cual se muestra una barra de progreso al cargar
+TAM_BLOQUE_LECTURA = 256 * 1024
+UMBRAL_PROGRESO = 16 * 1024 * 1024
+
+# Motivos de rechazo de las operaciones por lote
+MOTIVO_NO_ENCONTRADO = "no encontrado"
+MOTIVO_DUPLICADO = "duplicado en el lote"
+MOTIVO_YA_PRESTADO = "ya prestado"
+MOTIVO_NO_PRESTADO = "no prestado"
+MOTIVO_ERROR_GUARDADO = "error al guardar"
+MOTIVO_LIMITE_APRENDIZ = "límite de préstamos del aprendiz"
+MOTIVO_ID_EXISTENTE = "ID ya existente"
+MOTIVO_DATOS_INCOMPLETOS = "faltan libro_id o titulo"
+
+# Libros por página al navegar el catálogo completo
+TAM_PAGINA = 20
+
+# Tablas ya renderizadas que se conservan por catálogo (ver ``CacheVistas``)
+MAX_VISTAS_EN_CACHE = 32
+
+# Días que dura un préstamo antes de vencer
+DIAS_PRESTAMO = 14
+
+# Máximo por defecto de libros que un aprendiz puede tener prestados a la
+# vez en un catálogo (None para no limitar; ver ``Catalogo.max_prestamos``)
+MAX_PRESTAMOS_POR_APRENDIZ = None
+
+
+@dataclass(slots=True)
+class Libro:
+    """
+    Registro compacto de un libro del catálogo.
+
+    Guarda los mismos campos que el diccionario de libro, pero con
+    ``__slots__`` en lugar de un ``dict`` por instancia. Admite acceso por
+    clave (``libro["titulo"]``, ``libro.get("autor")``) para que las
+    funciones escritas para diccionarios funcionen sin cambios.
+    """
+
+    libro_id: str
+    titulo: str
+    autor: str = "Desconocido"
+    isbn: str | None = None
+    prestado_a: str | None = None
+    fecha_prestamo: str | None = None
+    fecha_vencimiento: str | None = None
+
+    @classmethod
+    def desde_dict(cls, datos: dict) -> "Libro":
+        """
+        Crea un libro a partir del diccionario del esquema JSON.
+
+        Args:
+            datos: Diccionario con las claves del libro
+
+        Returns:
+            Registro ``Libro`` equivalente
+        """
+        return cls(**{clave: datos[clave] for clave in _CAMPOS_LIBRO if clave in datos})
+
+    def a_dict(self) -> dict:
+        """
+        Convierte el libro al diccionario del esquema JSON.
+
+        Returns:
+            Diccionario con las claves del libro
+        """
+        # Los campos son textos o None: no hace falta la copia profunda
+        # de ``dataclasses.asdict``, que es varias veces más lenta
+        return {campo: getattr(self, campo) for campo in _ORDEN_CAMPOS_LIBRO}
+
+    def __getitem__(self, clave: str):
+        if clave not in _CAMPOS_LIBRO:
+            raise KeyError(clave)
+        return getattr(self, clave)
+
+    def __setitem__(self, clave: str, valor) -> None:
+        if clave not in _CAMPOS_LIBRO:
+            raise KeyError(clave)
+        setattr(self, clave, valor)
+
+    def __contains__(self, clave: str) -> bool:
+        return clave in _CAMPOS_LIBRO
+
+    def get(self, clave: str, defecto=None):
+        """Retorna el valor de un campo, o ``defecto`` si no existe."""
+        if clave not in _CAMPOS_LIBRO:
+            return defecto
+        return getattr(self, clave)
+
+
+_ORDEN_CAMPOS_LIBRO = tuple(campo.name for campo in fields(Libro))
+_CAMPOS_LIBRO = frozenset(_ORDEN_CAMPOS_LIBRO)
+
+
+def a_dict(libro: dict | Libro) -> dict:
+    """
+    Convierte un libro (diccionario o ``Libro``) al esquema JSON.
+
+    Args:
+        libro: Libro a convertir
+
+    Returns:
+        Diccionario del libro
+    """
+    return libro.a_dict() if isinstance(libro, Libro) else libro
+
+
+def calcular_vencimiento(libro: dict | Libro) -> str | None:
+    """
+    Obtiene la fecha de vencimiento (ISO) del préstamo de un libro.
+
+    Los préstamos guardados antes de existir ``fecha_vencimiento`` vencen
+    ``DIAS_PRESTAMO`` días después de ``fecha_prestamo``.
+
+    Args:
+        libro: Libro a consultar
+
+    Returns:
+        Fecha de vencimiento en formato ISO, o None si no está prestado
+    """
+    if libro["prestado_a"] is None:
+        return None
+    if libro.get("fecha_vencimiento"):
+        return libro["fecha_vencimiento"]
+    if not libro.get("fecha_prestamo"):
+        return None
+    inicio = datetime.fromisoformat(libro["fecha_prestamo"])
+    return (inicio + timedelta(days=DIAS_PRESTAMO)).isoformat()
+
+
+class Catalogo:
+    """
+    Catálogo de libros con índices en memoria.
+
+    Envuelve la lista de libros cargada y mantiene un índice por
+    ``libro_id`` y otro secundario por ``isbn``, de modo que las búsquedas
+    puntuales son O(1), además de un índice invertido de texto para
+    ``buscar_libro``, el conjunto de libros prestados para
+    ``ver_libros_prestados`` (también agrupado por aprendiz) y un
+    montículo (min-heap) de préstamos por fecha de vencimiento. Se
+    comporta como una secuencia de libros, por lo que las funciones que
+    recorren la lista siguen funcionando igual.
+
+    Para el modo multipuesto recuerda además qué instantánea del archivo
+    cargó (``firma_instantanea``) y hasta qué byte del diario tiene
+    aplicado (``posicion_diario``). Si se le asigna un ``historial``
+    (ver ``Biblioteca_historial.cargar_historial``), los préstamos y
+    devoluciones se registran también en él. ``max_prestamos`` es el
+    límite de libros prestados por aprendiz (None, por defecto, para no
+    limitar); se comprueba con el índice por aprendiz, sin recorrer los
+    libros.
+    """
+
+    def __init__(self, libros: list[dict | Libro] | None = None) -> None:
+        """
+        Crea el catálogo e indexa los libros recibidos.
+
+        Args:
+            libros: Lista de libros a envolver (se conserva la misma lista)
+        """
+        self.firma_instantanea: tuple[int, int, int] | None = None
+        self.posicion_diario = 0
+        self.historial: "HistorialPrestamos | None" = None
+        self.max_prestamos: int | None = MAX_PRESTAMOS_POR_APRENDIZ
+        self.version = 0
+        self.reemplazar(libros if libros is not None else [])
+        self.version = 0
+
+    def reemplazar(self, libros: list[dict | Libro]) -> None:
+        """
+        Sustituye todos los libros del catálogo y reconstruye los índices.
+
+        Args:
+            libros: Nueva lista de libros (se conserva la misma lista)
+        """
+        self._libros = libros
+        self._por_id: dict[str, dict | Libro] = {}
+        self._por_isbn: dict[str, dict | Libro] = {}
+        self._prestados: dict[str, dict | Libro] = {}
+        self._por_aprendiz: dict[str, dict[str, dict | Libro]] = {}
+        self._aprendiz_de: dict[str, str] = {}
+        self._vencimientos: list[tuple[str, str]] = []
+        self._vencimiento_vigente: dict[str, str] = {}
+        self._vencimientos_obsoletos = 0
+        self.indice_texto = IndiceTexto()
+
+        for libro in self._libros:
+            self._indexar(libro)
+        self.version += 1
+
+    def __len__(self) -> int:
+        return len(self._libros)
+
+    def __iter__(self):
+        return iter(self._libros)
+
+    def __getitem__(self, posicion):
+        return self._libros[posicion]
+
+    def _indexar(self, libro: dict | Libro) -> None:
+        """Registra un libro en los índices por ID, ISBN, préstamo y texto."""
+        libro_id = libro["libro_id"]
+        self._por_id[libro_id] = libro
+        if libro.get("isbn"):
+            self._por_isbn[libro["isbn"]] = libro
+        if libro["prestado_a"] is not None:
+            self._prestados[libro_id] = libro
+        else:
+            self._prestados.pop(libro_id, None)
+        self._indexar_aprendiz(libro_id, libro)
+        self._indexar_vencimiento(libro_id, calcular_vencimiento(libro))
+        self.indice_texto.actualizar(libro)
+
+    def _indexar_aprendiz(self, libro_id: str, libro: dict | Libro) -> None:
+        """Mueve el libro al grupo de su aprendiz actual (si está prestado)."""
+        aprendiz = libro["prestado_a"]
+        anterior = self._aprendiz_de.get(libro_id)
+        if aprendiz == anterior:
+            return
+        if anterior is not None:
+            del self._aprendiz_de[libro_id]
+            grupo = self._por_aprendiz[anterior]
+            del grupo[libro_id]
+            if not grupo:
+                del self._por_aprendiz[anterior]
+        if aprendiz is not None:
+            self._aprendiz_de[libro_id] = aprendiz
+            self._por_aprendiz.setdefault(aprendiz, {})[libro_id] = libro
+
+    def _indexar_vencimiento(self, libro_id: str, vencimiento: str | None) -> None:
+        """
+        Actualiza el montículo de vencimientos de forma perezosa.
+
+        Las entradas que dejan de valer (devoluciones) no se sacan del
+        montículo: se ignoran al recorrerlo y se purgan cuando superan a
+        la mitad de las entradas.
+        """
+        anterior = self._vencimiento_vigente.get(libro_id)
+        if vencimiento == anterior:
+            return
+        if anterior is not None:
+            del self._vencimiento_vigente[libro_id]
+            self._vencimientos_obsoletos += 1
+        if vencimiento is not None:
+            self._vencimiento_vigente[libro_id] = vencimiento
+            heapq.heappush(self._vencimientos, (vencimiento, libro_id))
+
+        if self._vencimientos_obsoletos > len(self._vencimientos) // 2:
+            self._vencimientos = [
+                (fecha, clave) for clave, fecha in self._vencimiento_vigente.items()
+            ]
+            heapq.heapify(self._vencimientos)
+            self._vencimientos_obsoletos = 0
+
+    def _recorrer_vencimientos(self) -> Iterator[tuple[str, dict | Libro]]:
+        """
+        Recorre los préstamos vigentes en orden de vencimiento.
+
+        No modifica el montículo: explora su árbol con una frontera
+        auxiliar, así obtener los k primeros cuesta O(k log k) más las
+        entradas obsoletas que se encuentren.
+        """
+        monticulo = self._vencimientos
+        frontera = [(monticulo[0], 0)] if monticulo else []
+        vistos: set[str] = set()
+        while frontera:
+            (vencimiento, libro_id), posicion = heapq.heappop(frontera)
+            for hijo in (2 * posicion + 1, 2 * posicion + 2):
+                if hijo < len(monticulo):
+                    heapq.heappush(frontera, (monticulo[hijo], hijo))
+            if (
+                self._vencimiento_vigente.get(libro_id) == vencimiento
+                and libro_id not in vistos
+            ):
+                vistos.add(libro_id)
+                yield vencimiento, self._por_id[libro_id]
+
+    def vencidos(self, ahora: datetime | None = None) -> list[dict | Libro]:
+        """
+        Retorna los préstamos vencidos, del más antiguo al más reciente.
+
+        Args:
+            ahora: Momento de referencia (por defecto, el actual)
+
+        Returns:
+            Lista de libros cuyo vencimiento ya pasó
+        """
+        limite = (ahora or datetime.now()).isoformat()
+        return [
+            libro
+            for _, libro in takewhile(
+                lambda par: par[0] < limite, self._recorrer_vencimientos()
+            )
+        ]
+
+    def proximos_vencimientos(self, cantidad: int) -> list[dict | Libro]:
+        """
+        Retorna los ``cantidad`` préstamos que vencen primero.
+
+        Args:
+            cantidad: Número de préstamos a retornar
+
+        Returns:
+            Lista de libros prestados ordenada por vencimiento
+        """
+        return [libro for _, libro in islice(self._recorrer_vencimientos(), cantidad)]
+
+    def agregar(self, libro: dict | Libro) -> None:
+        """
+        Agrega un libro al catálogo y a sus índices.
+
+        Args:
+            libro: Diccionario del libro a agregar
+        """
+        self._libros.append(libro)
+        self._indexar(libro)
+        self.version += 1
+
+    def buscar_por_id(self, libro_id: str) -> dict | Libro | None:
+        """
+        Busca un libro por su ID en O(1).
+
+        Args:
+            libro_id: ID del libro a buscar
+
+        Returns:
+            Libro si se encuentra, None en caso contrario
+        """
+        return self._por_id.get(libro_id)
+
+    def buscar_por_isbn(self, isbn: str) -> dict | Libro | None:
+        """
+        Busca un libro por su ISBN en O(1).
+
+        Args:
+            isbn: ISBN del libro a buscar
+
+        Returns:
+            Libro si se encuentra, None en caso contrario
+        """
+        return self._por_isbn.get(isbn)
+
+    def registrar_cambio(self, libro: dict | Libro) -> None:
+        """
+        Actualiza los índices tras prestar o devolver un libro.
+
+        Args:
+            libro: Libro que acaba de modificarse
+        """
+        self._indexar(libro)
+        self.version += 1
+
+    def prestados(self) -> list[dict | Libro]:
+        """
+        Retorna los libros prestados sin recorrer el catálogo.
+
+        Returns:
+            Lista de libros prestados, ordenados por ID
+        """
+        return [self._prestados[libro_id] for libro_id in sorted(self._prestados)]
+
+    def prestamos_de(self, nombre_aprendiz: str) -> list[dict | Libro]:
+        """
+        Retorna los libros que tiene prestados un aprendiz.
+
+        Args:
+            nombre_aprendiz: Nombre del aprendiz
+
+        Returns:
+            Lista de libros prestados al aprendiz, ordenados por ID
+        """
+        grupo = self._por_aprendiz.get(nombre_aprendiz, {})
+        return [grupo[libro_id] for libro_id in sorted(grupo)]
+
+    def cantidad_prestamos(self, nombre_aprendiz: str) -> int:
+        """
+        Cuenta los libros que tiene prestados un aprendiz, en O(1).
+
+        Args:
+            nombre_aprendiz: Nombre del aprendiz
+
+        Returns:
+            Número de libros prestados al aprendiz
+        """
+        return len(self._por_aprendiz.get(nombre_aprendiz, ()))
+
+    def buscar_texto(self, query: str) -> list[dict | Libro]:
+        """
+        Busca libros por título, autor o ISBN usando el índice invertido.
+
+        Cada término de la consulta se busca por prefijo y sin acentos;
+        un libro debe contener todos los términos para aparecer.
+
+        Args:
+            query: Términos de búsqueda
+
+        Returns:
+            Lista de libros encontrados (todo el catálogo si la consulta
+            está vacía)
+        """
+        ids = self.indice_texto.buscar(query)
+        if ids is None:
+            return list(self._libros)
+        return [self._por_id[libro_id] for libro_id in ids]
+
+    def buscar_aproximado(
+        self, query: str, cantidad: int = TOP_K
+    ) -> list[dict | Libro]:
+        """
+        Busca los libros más parecidos a la consulta, aunque tenga errores.
+
+        Usa el índice de trigramas del vocabulario de títulos y autores,
+        que se construye en la primera búsqueda aproximada y luego se
+        mantiene al día con cada cambio del catálogo.
+
+        Args:
+            query: Términos de búsqueda (p. ej. "Quijte")
+            cantidad: Número máximo de libros a retornar
+
+        Returns:
+            Lista de libros, del más al menos parecido
+        """
+        return [
+            self._por_id[libro_id]
+            for libro_id, _ in self.indice_texto.buscar_aproximado(query, cantidad)
+        ]
+
+    def a_lista(self) -> list[dict | Libro]:
+        """
+        Retorna la lista de libros envuelta por el catálogo.
+
+        Returns:
+            Lista de diccionarios con los libros
+        """
+        return self._libros
+
+
+def _registrar_cambio(libros: list[dict] | Catalogo, libro: dict | Libro) -> None:
+    """Avisa al catálogo (si lo hay) de que un libro fue modificado."""
+    if isinstance(libros, Catalogo):
+        libros.registrar_cambio(libro)
+
 
 def crear_biblioteca_inicial() -> list[dict]:
     """
@@ -36,6 +547,7 @@ def crear_biblioteca_inicial() -> list[dict]:
             "isbn": "978-0307474728",
             "prestado_a": None,
             "fecha_prestamo": None,
+            "fecha_vencimiento": None,
         },
         {
             "libro_id": "002",
@@ -44,6 +556,7 @@ def crear_biblioteca_inicial() -> list[dict]:
             "isbn": "978-8424936464",
             "prestado_a": None,
             "fecha_prestamo": None,
+            "fecha_vencimiento": None,
         },
         {
             "libro_id": "003",
@@ -52,6 +565,7 @@ def crear_biblioteca_inicial() -> list[dict]:
             "isbn": "978-0451524935",
             "prestado_a": None,
             "fecha_prestamo": None,
+            "fecha_vencimiento": None,
         },
         {
             "libro_id": "004",
@@ -60,6 +574,7 @@ def crear_biblioteca_inicial() -> list[dict]:
             "isbn": "978-0156012195",
             "prestado_a": None,
             "fecha_prestamo": None,
+            "fecha_vencimiento": None,
         },
         {
             "libro_id": "005",
@@ -68,70 +583,760 @@ def crear_biblioteca_inicial() -> list[dict]:
             "isbn": "978-0141439518",
             "prestado_a": None,
             "fecha_prestamo": None,
+            "fecha_vencimiento": None,
         },
     ]
 
 
-def cargar_datos(archivo: str = ARCHIVO_BIBLIOTECA) -> list[dict]:
+def iterar_libros_json(
+    archivo: str,
+    tam_bloque: int = TAM_BLOQUE_LECTURA,
+    progreso: Callable[[int, int], None] | None = None,
+) -> Iterator[dict]:
+    """
+    Recorre el arreglo JSON de la biblioteca libro por libro.
+
+    En lugar de ``json.load`` (que necesita el texto completo en memoria
+    además de los diccionarios), lee el archivo por bloques y decodifica
+    cada elemento con ``JSONDecoder.raw_decode``. Los textos repetidos,
+    como los nombres de autor, se internan para no duplicarlos.
+
+    Args:
+        archivo: Ruta del archivo JSON (un arreglo de libros)
+        tam_bloque: Bytes a leer en cada bloque
+        progreso: Función opcional que recibe (bytes leídos, bytes totales)
+
+    Yields:
+        Diccionario de cada libro en el orden del archivo
+
+    Raises:
+        json.JSONDecodeError: Si el contenido no es un arreglo JSON válido
+    """
+    decodificador = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    total = Path(archivo).stat().st_size
+    leidos = 0
+    buffer = ""
+    pos = 0
+    fin = False
+
+    with open(archivo, "rb") as f:
+
+        def leer_mas() -> None:
+            nonlocal buffer, pos, leidos, fin
+            datos = f.read(tam_bloque)
+            leidos += len(datos)
+            fin = not datos
+            buffer = buffer[pos:] + utf8.decode(datos, final=fin)
+            pos = 0
+            if progreso is not None:
+                progreso(leidos, total)
+
+        def siguiente_caracter() -> str:
+            """Salta espacios y retorna el siguiente carácter ('' al final)."""
+            nonlocal pos
+            while True:
+                while pos < len(buffer) and buffer[pos].isspace():
+                    pos += 1
+                if pos < len(buffer) or fin:
+                    return buffer[pos] if pos < len(buffer) else ""
+                leer_mas()
+
+        if siguiente_caracter() != "[":
+            raise json.JSONDecodeError("Se esperaba un arreglo JSON", buffer, pos)
+        pos += 1
+
+        if siguiente_caracter() == "]":
+            return
+
+        while True:
+            siguiente_caracter()
+            while True:
+                try:
+                    libro, pos = decodificador.raw_decode(buffer, pos)
+                    break
+                except json.JSONDecodeError:
+                    if fin:
+                        raise
+                    leer_mas()
+
+            for clave in ("autor", "prestado_a"):
+                if isinstance(libro.get(clave), str):
+                    libro[clave] = sys.intern(libro[clave])
+            yield libro
+
+            separador = siguiente_caracter()
+            if separador == "]":
+                return
+            if separador != ",":
+                raise json.JSONDecodeError("Se esperaba ',' o ']'", buffer, pos)
+            pos += 1
+
+
+def cargar_datos(
+    archivo: str = ARCHIVO_BIBLIOTECA,
+    progreso: Callable[[int, int], None] | None = None,
+    cache: bool = True,
+    silencioso: bool = False,
+) -> Catalogo:
     """
     Carga los datos de la biblioteca desde el archivo JSON.
 
+    El archivo se lee de forma incremental y cada libro pasa directamente
+    al catálogo como registro ``Libro`` compacto, sin mantener a la vez el
+    texto completo y los objetos.
+    Si existe un diario de préstamos pendiente, sus entradas se aplican
+    sobre la última instantánea para recuperar el estado más reciente.
+    La lectura se hace con un bloqueo compartido, para no leer una
+    instantánea a medio compactar por otro puesto.
+
+    El catálogo ya indexado se guarda además en ``<archivo>.cache``; si
+    la instantánea no cambió desde entonces (mismo inodo, fecha de
+    modificación y tamaño), se carga de ahí sin volver a leer el JSON ni
+    reconstruir los índices. El diario se aplica igual en ambos casos.
+
     Args:
         archivo: Nombre del archivo JSON con los datos de la biblioteca
+        progreso: Función opcional que recibe (bytes leídos, bytes totales);
+            si no se indica, los archivos grandes muestran una barra de
+            progreso
+        cache: Si es False, no se lee ni se escribe la caché
+        silencioso: Si es True, no se muestran mensajes ni barra de
+            progreso (los errores van en texto plano a la salida de
+            errores), así un script no inicializa la interfaz de Rich
 
     Returns:
-        Lista de diccionarios con los libros de la biblioteca
+        Catálogo indexado con los libros de la biblioteca
     """
     archivo_path = Path(archivo)
 
+    if Biblioteca_sqlite.es_archivo_sqlite(archivo):
+        return _cargar_datos_sqlite(archivo, silencioso)
+
     try:
         if archivo_path.exists():
-            with open(archivo_path, encoding="utf-8") as f:
-                libros = json.load(f)
-            console.print(f"[green]✓[/green] Biblioteca cargada: {len(libros)} libros")
-            return libros
+            with Bloqueo_archivo.bloquear(archivo, compartido=True):
+                firma = firma_instantanea(archivo)
+                clave = _clave_cache(firma)
+                catalogo = _leer_cache(archivo, clave) if cache else None
+                leido_del_json = catalogo is None
+                if leido_del_json:
+                    catalogo = _leer_catalogo_json(archivo, progreso, silencioso)
+                catalogo.firma_instantanea = firma
+                aplicar_diario(catalogo, archivo)
+            # Fuera del bloqueo, para no demorar a los demás puestos
+            if cache and leido_del_json:
+                _escribir_cache(catalogo, archivo, clave)
+            if not silencioso:
+                console.print(
+                    f"[green]✓[/green] Biblioteca cargada: {len(catalogo)} libros"
+                )
+            return catalogo
         else:
             libros = crear_biblioteca_inicial()
-            guardar_datos(libros, archivo)
-            console.print(
-                "[yellow]⚠[/yellow] Archivo no encontrado. "
+            guardar_datos(libros, archivo, silencioso=silencioso)
+            if not silencioso:
+                console.print(
+                    "[yellow]⚠[/yellow] Archivo no encontrado. "
+                    "Se creó una biblioteca inicial."
+                )
+            catalogo = Catalogo([Libro.desde_dict(libro) for libro in libros])
+            catalogo.firma_instantanea = firma_instantanea(archivo)
+            return catalogo
+    except json.JSONDecodeError as e:
+        _mostrar_error(f"Error al leer el archivo JSON: {e}", silencioso)
+        return Catalogo()
+    except Exception as e:
+        _mostrar_error(f"Error inesperado: {e}", silencioso)
+        return Catalogo()
+
+
+def _mostrar_error(mensaje: str, silencioso: bool = False) -> None:
+    """Muestra un error con Rich, o en texto plano por la salida de errores."""
+    if silencioso:
+        print(f"✗ {mensaje}", file=sys.stderr)
+    else:
+        console.print(f"[red]✗[/red] {mensaje}")
+
+
+def _leer_catalogo_json(
+    archivo: str, progreso: Callable[[int, int], None] | None, silencioso: bool
+) -> Catalogo:
+    """Lee e indexa el archivo JSON (con barra de progreso si es grande)."""
+    catalogo = Catalogo()
+    if (
+        progreso is None
+        and not silencioso
+        and Path(archivo).stat().st_size > UMBRAL_PROGRESO
+    ):
+        with Progress(console=console.resolver(), transient=True) as barra:
+            tarea = barra.add_task("Cargando biblioteca...", total=None)
+
+            def progreso_barra(leidos: int, total: int) -> None:
+                barra.update(tarea, completed=leidos, total=total)
+
+            for libro in iterar_libros_json(archivo, progreso=progreso_barra):
+                catalogo.agregar(Libro.desde_dict(libro))
+    else:
+        for libro in iterar_libros_json(archivo, progreso=progreso):
+            catalogo.agregar(Libro.desde_dict(libro))
+    return catalogo
+
+
+def _cargar_datos_sqlite(archivo: str, silencioso: bool = False) -> Catalogo:
+    """Carga el catálogo desde una base SQLite (creándola si hace falta)."""
+    try:
+        if Biblioteca_sqlite.existe_biblioteca(archivo):
+            libros = Biblioteca_sqlite.cargar_libros(archivo)
+            mensaje = f"[green]✓[/green] Biblioteca cargada: {len(libros)} libros"
+        else:
+            libros = crear_biblioteca_inicial()
+            Biblioteca_sqlite.guardar_libros(libros, archivo)
+            mensaje = (
+                "[yellow]⚠[/yellow] Base de datos vacía. "
                 "Se creó una biblioteca inicial."
             )
-            return libros
-    except json.JSONDecodeError as e:
-        console.print(f"[red]✗[/red] Error al leer el archivo JSON: {e}")
-        return []
+        if not silencioso:
+            console.print(mensaje)
+        return Catalogo([Libro.desde_dict(libro) for libro in libros])
     except Exception as e:
-        console.print(f"[red]✗[/red] Error inesperado: {e}")
-        return []
+        _mostrar_error(f"Error al leer la base de datos: {e}", silencioso)
+        return Catalogo()
 
 
-def guardar_datos(libros: list[dict], archivo: str = ARCHIVO_BIBLIOTECA) -> None:
+def guardar_datos(
+    libros: list[dict] | Catalogo,
+    archivo: str = ARCHIVO_BIBLIOTECA,
+    sincronizar: bool = True,
+    silencioso: bool = False,
+) -> bool:
     """
     Guarda los datos actuales de la biblioteca en el archivo JSON.
 
+    La escritura es atómica (archivo temporal + renombrado), así que un
+    corte a mitad de la escritura no deja el archivo truncado; si el
+    contenido no cambió, no se reescribe. La instantánea completa
+    reemplaza al diario de préstamos, por lo que este se elimina después
+    de escribirla (y en ese caso el archivo se reescribe siempre, para
+    que los demás puestos detecten la nueva instantánea). Si ``archivo``
+    es una base SQLite, la base queda igual al catálogo (ver
+    ``Biblioteca_sqlite.guardar_libros``).
+
     Args:
         libros: Lista de libros a guardar
         archivo: Nombre del archivo JSON donde guardar los datos
+        sincronizar: Si es False, se omite el ``fsync`` (más rápido, pero
+            un corte de luz puede perder la última escritura)
+        silencioso: Si es True, un error se informa en texto plano por la
+            salida de errores, sin usar Rich
+
+    Returns:
+        True si los datos se guardaron, False si hubo un error
+    """
+    try:
+        if Biblioteca_sqlite.es_archivo_sqlite(archivo):
+            Biblioteca_sqlite.guardar_libros(libros, archivo)
+            return True
+        contenido = json.dumps(
+            [a_dict(libro) for libro in libros], ensure_ascii=False, indent=2
+        )
+        diario_path = Path(ruta_diario(archivo))
+        escribir_atomico(
+            archivo,
+            contenido,
+            sincronizar=sincronizar,
+            omitir_sin_cambios=not diario_path.exists(),
+        )
+        diario_path.unlink(missing_ok=True)
+        if isinstance(libros, Catalogo):
+            libros.firma_instantanea = firma_instantanea(archivo)
+            libros.posicion_diario = 0
+        return True
+    except Exception as e:
+        _mostrar_error(f"Error al guardar datos: {e}", silencioso)
+        return False
+
+
+def ruta_diario(archivo: str = ARCHIVO_BIBLIOTECA) -> str:
+    """
+    Retorna la ruta del diario de préstamos asociado a un archivo.
+
+    Args:
+        archivo: Nombre del archivo JSON de la biblioteca
+
+    Returns:
+        Ruta del archivo de diario (una línea JSON por operación)
+    """
+    return f"{archivo}.diario"
+
+
+def registrar_en_diario(
+    libros_modificados: list[dict], archivo: str = ARCHIVO_BIBLIOTECA
+) -> int:
+    """
+    Añade al diario el estado de préstamo actual de uno o varios libros.
+
+    Cada línea guarda el estado resultante (no la operación), así que
+    volver a aplicar el diario es idempotente. Todas las líneas se
+    escriben con una sola llamada de escritura. Si el diario termina en
+    una línea incompleta (un corte a mitad de escritura), se cierra antes
+    para no mezclarla con las nuevas entradas.
+
+    Args:
+        libros_modificados: Libros recién prestados o devueltos
+        archivo: Nombre del archivo JSON de la biblioteca
+
+    Returns:
+        Tamaño del diario en bytes tras la escritura
+    """
+    lineas = [
+        json.dumps(
+            {
+                "libro_id": libro["libro_id"],
+                "prestado_a": libro["prestado_a"],
+                "fecha_prestamo": libro["fecha_prestamo"],
+                "fecha_vencimiento": libro.get("fecha_vencimiento"),
+            },
+            ensure_ascii=False,
+        )
+        + "\n"
+        for libro in libros_modificados
+    ]
+    datos = "".join(lineas).encode("utf-8")
+    with open(ruta_diario(archivo), "a+b") as f:
+        tamano = f.seek(0, 2)
+        if tamano:
+            f.seek(tamano - 1)
+            if f.read(1) != b"\n":
+                datos = b"\n" + datos
+        f.write(datos)
+        return f.tell()
+
+
+def ruta_cambios(archivo: str = ARCHIVO_BIBLIOTECA) -> str:
+    """
+    Retorna la ruta del registro de cambios usado por los respaldos.
+
+    Args:
+        archivo: Nombre del archivo de la biblioteca
+
+    Returns:
+        Ruta del archivo ``.cambios`` (un ``libro_id`` JSON por línea)
+    """
+    return f"{archivo}.cambios"
+
+
+def anotar_cambios(libro_ids: Iterable[str], archivo: str = ARCHIVO_BIBLIOTECA) -> None:
+    """
+    Anota qué libros cambiaron desde el último respaldo.
+
+    El registro lo crea el primer respaldo (ver ``Biblioteca_respaldo``)
+    y lo vacía cada respaldo siguiente; mientras no exista no se anota
+    nada, así que sin respaldos no crece. Se llama después de persistir:
+    si un respaldo se hace justo en medio, el libro aparece también en
+    el siguiente, pero nunca se pierde. Un error al anotar solo se
+    informa, porque los datos ya están guardados.
+
+    Args:
+        libro_ids: IDs de los libros recién agregados o modificados
+        archivo: Nombre del archivo de la biblioteca
+    """
+    datos = "".join(
+        json.dumps(libro_id, ensure_ascii=False) + "\n" for libro_id in libro_ids
+    ).encode("utf-8")
+    if not datos:
+        return
+    try:
+        descriptor = os.open(ruta_cambios(archivo), os.O_WRONLY | os.O_APPEND)
+    except FileNotFoundError:
+        return
+    except OSError as e:
+        console.print(f"[red]✗[/red] Error al anotar cambios para el respaldo: {e}")
+        return
+    try:
+        os.write(descriptor, datos)
+    except OSError as e:
+        console.print(f"[red]✗[/red] Error al anotar cambios para el respaldo: {e}")
+    finally:
+        os.close(descriptor)
+
+
+def aplicar_diario(
+    catalogo: Catalogo, archivo: str = ARCHIVO_BIBLIOTECA, desde: int = 0
+) -> int:
+    """
+    Reaplica sobre el catálogo las entradas pendientes del diario.
+
+    Una última línea incompleta (por ejemplo tras un corte de luz) se
+    ignora en lugar de invalidar todo el diario. Al terminar,
+    ``catalogo.posicion_diario`` queda en el byte siguiente a la última
+    línea completa leída.
+
+    Args:
+        catalogo: Catálogo cargado desde la última instantánea
+        archivo: Nombre del archivo JSON de la biblioteca
+        desde: Byte del diario a partir del cual leer (0 para todo)
+
+    Returns:
+        Número de entradas aplicadas
+    """
+    aplicadas = 0
+    posicion = desde if Path(ruta_diario(archivo)).exists() else 0
+    for posicion, entrada in _recorrer_diario(archivo, desde):
+        libro = catalogo.buscar_por_id(entrada["libro_id"])
+        if libro is None:
+            continue
+        _aplicar_entrada(libro, entrada)
+        catalogo.registrar_cambio(libro)
+        aplicadas += 1
+    catalogo.posicion_diario = posicion
+    return aplicadas
+
+
+def _recorrer_diario(archivo: str, desde: int = 0) -> Iterator[tuple[int, dict]]:
+    """
+    Recorre las entradas completas del diario a partir de un byte.
+
+    Yields:
+        Pares (byte siguiente a la línea, entrada); las líneas dañadas se
+        saltan y una última línea incompleta termina el recorrido
+    """
+    try:
+        f = open(ruta_diario(archivo), "rb")
+    except FileNotFoundError:
+        return
+    with f:
+        f.seek(desde)
+        posicion = desde
+        for linea in f:
+            if not linea.endswith(b"\n"):
+                break
+            posicion += len(linea)
+            try:
+                entrada = json.loads(linea)
+            except json.JSONDecodeError:
+                continue
+            yield posicion, entrada
+
+
+def _aplicar_entrada(libro: dict | Libro, entrada: dict) -> None:
+    """Copia en el libro el estado de préstamo de una entrada del diario."""
+    libro["prestado_a"] = entrada["prestado_a"]
+    libro["fecha_prestamo"] = entrada["fecha_prestamo"]
+    libro["fecha_vencimiento"] = entrada.get("fecha_vencimiento")
+
+
+def iterar_libros_vigentes(archivo: str = ARCHIVO_BIBLIOTECA) -> Iterator[dict]:
+    """
+    Recorre el estado actual de los libros sin construir el catálogo.
+
+    Lee la instantánea de forma incremental y le superpone el diario de
+    préstamos, sin los índices de ``Catalogo``; sirve para recorridos
+    completos como los respaldos. Mientras dura el recorrido se mantiene
+    un bloqueo compartido sobre el archivo.
+
+    Args:
+        archivo: Nombre del archivo de la biblioteca (JSON o SQLite)
+
+    Yields:
+        Diccionario de cada libro, en el orden del archivo
+    """
+    if Biblioteca_sqlite.es_archivo_sqlite(archivo):
+        yield from Biblioteca_sqlite.cargar_libros(archivo)
+        return
+
+    with Bloqueo_archivo.bloquear(archivo, compartido=True):
+        # El diario es pequeño (se compacta al superar UMBRAL_COMPACTACION)
+        pendientes = {
+            entrada["libro_id"]: entrada for _, entrada in _recorrer_diario(archivo)
+        }
+        for libro in iterar_libros_json(archivo):
+            entrada = pendientes.get(libro["libro_id"])
+            if entrada is not None:
+                _aplicar_entrada(libro, entrada)
+            yield libro
+
+
+def firma_instantanea(archivo: str = ARCHIVO_BIBLIOTECA) -> tuple[int, int, int]:
+    """
+    Identifica la versión actual del archivo principal de la biblioteca.
+
+    Cada reescritura reemplaza el archivo por uno nuevo, así que la firma
+    (inodo, fecha de modificación y tamaño) cambia siempre que otro
+    puesto guarda o compacta la biblioteca.
+
+    Args:
+        archivo: Nombre del archivo JSON de la biblioteca
+
+    Returns:
+        Tupla que identifica la instantánea
+    """
+    estado = Path(archivo).stat()
+    return (estado.st_ino, estado.st_mtime_ns, estado.st_size)
+
+
+def ruta_cache(archivo: str = ARCHIVO_BIBLIOTECA) -> str:
+    """
+    Retorna la ruta de la caché del catálogo asociada a un archivo.
+
+    La caché es un ``pickle`` del catálogo indexado: como todo ``pickle``,
+    solo debe cargarse si se confía en el directorio de los datos, igual
+    que el propio archivo JSON.
+
+    Args:
+        archivo: Nombre del archivo JSON de la biblioteca
+
+    Returns:
+        Ruta del archivo ``.cache``
+    """
+    return f"{archivo}.cache"
+
+
+def _clave_cache(firma: tuple[int, int, int]) -> tuple:
+    """Clave de la caché: la instantánea y la versión del código del catálogo."""
+    modulos = (__file__, sys.modules[IndiceTexto.__module__].__file__)
+    return (firma, tuple(Path(modulo).stat().st_mtime_ns for modulo in modulos))
+
+
+def _leer_cache(archivo: str, clave: tuple) -> Catalogo | None:
+    """Carga el catálogo de la caché, o None si falta o no corresponde."""
+    recolector_activo = gc.isenabled()
+    try:
+        with open(ruta_cache(archivo), "rb") as f:
+            if pickle.load(f) != clave:
+                return None
+            # Sin el recolector de ciclos, crear millones de objetos es
+            # bastante más rápido
+            gc.disable()
+            catalogo = pickle.load(f)
+    except Exception:
+        # Caché inexistente, dañada o de otra versión: se lee el JSON
+        return None
+    finally:
+        if recolector_activo:
+            gc.enable()
+    return catalogo if isinstance(catalogo, Catalogo) else None
+
+
+def _escribir_cache(catalogo: Catalogo, archivo: str, clave: tuple) -> None:
+    """
+    Guarda el catálogo recién leído en la caché.
+
+    Se escribe directamente en el archivo temporal, sin armar antes el
+    ``pickle`` completo en memoria. El catálogo puede traer ya aplicado
+    el diario de su instantánea: cada entrada guarda el estado completo
+    del préstamo, así que volver a aplicarlo al leer la caché no cambia
+    el resultado.
     """
     try:
-        with open(archivo, "w", encoding="utf-8") as f:
-            json.dump(libros, f, ensure_ascii=False, indent=2)
+        with abrir_atomico(ruta_cache(archivo), sincronizar=False) as f:
+            pickle.dump(clave, f, pickle.HIGHEST_PROTOCOL)
+            pickle.dump(catalogo, f, pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        # La caché es opcional: si no se puede escribir (disco, o un
+        # catálogo que no se deja serializar) solo se pierde velocidad al
+        # iniciar, nunca el catálogo ya leído
+        pass
+
+
+def _leer_instantanea(catalogo: Catalogo, archivo: str) -> None:
+    """Carga en el catálogo la instantánea y el diario completos."""
+    catalogo.reemplazar(
+        [Libro.desde_dict(libro) for libro in iterar_libros_json(archivo)]
+    )
+    catalogo.firma_instantanea = firma_instantanea(archivo)
+    aplicar_diario(catalogo, archivo)
+
+
+def _sincronizar(catalogo: Catalogo, archivo: str) -> int:
+    """Sincroniza el catálogo con el disco (el llamador tiene el bloqueo)."""
+    if firma_instantanea(archivo) != catalogo.firma_instantanea:
+        _leer_instantanea(catalogo, archivo)
+        return len(catalogo)
+    return aplicar_diario(catalogo, archivo, desde=catalogo.posicion_diario)
+
+
+def sincronizar_catalogo(catalogo: Catalogo, archivo: str = ARCHIVO_BIBLIOTECA) -> int:
+    """
+    Incorpora al catálogo los cambios guardados por otros puestos.
+
+    Verificación optimista: si la instantánea del archivo no cambió desde
+    la última lectura, solo se leen las entradas nuevas del diario; si
+    otro puesto la reescribió (por ejemplo al compactar), se recarga el
+    catálogo completo.
+
+    Args:
+        catalogo: Catálogo cargado con ``cargar_datos``
+        archivo: Nombre del archivo JSON de la biblioteca
+
+    Returns:
+        Número de libros actualizados (0 si el catálogo no se cargó de
+        un archivo JSON)
+    """
+    if catalogo.firma_instantanea is None:
+        return 0
+    with Bloqueo_archivo.bloquear(archivo, compartido=True):
+        return _sincronizar(catalogo, archivo)
+
+
+@contextmanager
+def _sesion_compartida(
+    libros: list[dict] | Catalogo, archivo: str, diario: bool
+) -> Iterator[None]:
+    """
+    Bloquea el archivo y sincroniza el catálogo mientras dura el bloque.
+
+    Solo aplica en modo diario con un catálogo cargado desde un archivo
+    JSON; así, entre la validación de un préstamo y su escritura en el
+    diario ningún otro puesto puede modificar la biblioteca.
+    """
+    if (
+        not diario
+        or not isinstance(libros, Catalogo)
+        or libros.firma_instantanea is None
+        or Biblioteca_sqlite.es_archivo_sqlite(archivo)
+    ):
+        yield
+        return
+
+    with Bloqueo_archivo.bloquear(archivo):
+        _sincronizar(libros, archivo)
+        yield
+
+
+def compactar_diario(
+    libros: list[dict] | Catalogo, archivo: str = ARCHIVO_BIBLIOTECA
+) -> None:
+    """
+    Integra el diario en una nueva instantánea del archivo principal.
+
+    Args:
+        libros: Lista de libros o catálogo con el estado actual
+        archivo: Nombre del archivo JSON de la biblioteca
+    """
+    guardar_datos(libros, archivo)
+
+
+def _persistir_cambios(
+    libros: list[dict] | Catalogo,
+    libros_modificados: list[dict],
+    archivo: str,
+    diario: bool,
+) -> bool:
+    """Persiste préstamos o devoluciones según el modo elegido."""
+    try:
+        if Biblioteca_sqlite.es_archivo_sqlite(archivo):
+            Biblioteca_sqlite.actualizar_prestamos(libros_modificados, archivo)
+        elif not diario:
+            if not guardar_datos(libros, archivo):
+                return False
+        else:
+            tamano = registrar_en_diario(libros_modificados, archivo)
+            if isinstance(libros, Catalogo):
+                libros.posicion_diario = tamano
+            if tamano > UMBRAL_COMPACTACION:
+                compactar_diario(libros, archivo)
     except Exception as e:
         console.print(f"[red]✗[/red] Error al guardar datos: {e}")
+        return False
+    anotar_cambios((libro["libro_id"] for libro in libros_modificados), archivo)
+    return True
 
 
-def buscar_libro_por_id(libros: list[dict], libro_id: str) -> dict | None:
+def _estado_prestamo(libro: dict) -> tuple[str | None, str | None, str | None]:
+    """Retorna (prestado_a, fecha_prestamo, fecha_vencimiento) de un libro."""
+    return (
+        libro["prestado_a"],
+        libro["fecha_prestamo"],
+        libro.get("fecha_vencimiento"),
+    )
+
+
+def _restaurar_prestamos(
+    libros: list[dict] | Catalogo,
+    libros_modificados: list[dict],
+    anteriores: list[tuple[str | None, str | None, str | None]],
+) -> None:
+    """
+    Deshace en memoria préstamos o devoluciones que no se pudieron guardar.
+
+    Devuelve a cada libro su estado anterior (ver ``_estado_prestamo``) y
+    actualiza los índices del catálogo.
+    """
+    for libro, estado in zip(libros_modificados, anteriores):
+        libro["prestado_a"], libro["fecha_prestamo"], libro["fecha_vencimiento"] = (
+            estado
+        )
+        _registrar_cambio(libros, libro)
+
+
+def _anotar_historial(
+    libros: list[dict] | Catalogo,
+    archivo: str,
+    cambios: list[tuple[dict, str | None, str | None]],
+    prestar: bool,
+) -> None:
+    """
+    Registra en el historial los préstamos o devoluciones ya persistidos.
+
+    Las devoluciones se añaden siempre al archivo de historial; además,
+    si el catálogo tiene un historial en memoria, se actualiza.
+
+    Args:
+        libros: Lista de libros o catálogo de la biblioteca
+        archivo: Nombre del archivo de la biblioteca
+        cambios: Tuplas (libro, prestado_a anterior, fecha_prestamo anterior)
+        prestar: True si son préstamos, False si son devoluciones
+    """
+    historial = libros.historial if isinstance(libros, Catalogo) else None
+    if prestar:
+        if historial is not None:
+            for libro, _, _ in cambios:
+                historial.registrar_prestamo(
+                    libro["libro_id"], libro["prestado_a"], libro["fecha_prestamo"]
+                )
+        return
+
+    fin = datetime.now().isoformat()
+    try:
+        Biblioteca_historial.anotar_devoluciones(
+            archivo,
+            [
+                {
+                    "libro_id": libro["libro_id"],
+                    "aprendiz": prestado_a,
+                    "inicio": fecha_prestamo,
+                    "fin": fin,
+                }
+                for libro, prestado_a, fecha_prestamo in cambios
+            ],
+        )
+    except OSError as e:
+        console.print(f"[red]✗[/red] Error al guardar el historial: {e}")
+    if historial is not None:
+        for libro, prestado_a, fecha_prestamo in cambios:
+            historial.registrar_devolucion(
+                libro["libro_id"], prestado_a, fecha_prestamo, fin
+            )
+
+
+def buscar_libro_por_id(libros: list[dict] | Catalogo, libro_id: str) -> dict | None:
     """
     Busca un libro por su ID.
 
+    Con un ``Catalogo`` la búsqueda usa su índice (O(1)); con una lista
+    simple se recorre de forma lineal.
+
     Args:
-        libros: Lista de libros en la biblioteca
+        libros: Lista de libros o catálogo de la biblioteca
         libro_id: ID del libro a buscar
 
     Returns:
         Diccionario del libro si se encuentra, None en caso contrario
     """
+    if isinstance(libros, Catalogo):
+        return libros.buscar_por_id(libro_id)
+
     for libro in libros:
         if libro["libro_id"] == libro_id:
             return libro
@@ -139,148 +1344,804 @@ def buscar_libro_por_id(libros: list[dict], libro_id: str) -> dict | None:
 
 
 def prestar_libro(
-    libros: list[dict],
+    libros: list[dict] | Catalogo,
     libro_id: str,
     nombre_aprendiz: str,
     archivo: str = ARCHIVO_BIBLIOTECA,
+    diario: bool = False,
 ) -> bool:
     """
     Marca un libro como prestado a un aprendiz.
 
     Args:
-        libros: Lista de libros en la biblioteca
+        libros: Lista de libros o catálogo de la biblioteca
         libro_id: ID del libro a prestar
         nombre_aprendiz: Nombre de la persona que toma prestado el libro
         archivo: Nombre del archivo para persistir los cambios
+        diario: Si es True, se añade una línea al diario en lugar de
+            reescribir el archivo completo; con un catálogo cargado por
+            ``cargar_datos``, la operación se hace con el archivo
+            bloqueado y tras incorporar los cambios de otros puestos
 
     Returns:
         True si el préstamo fue exitoso, False en caso contrario
     """
-    libro = buscar_libro_por_id(libros, libro_id)
+    with _sesion_compartida(libros, archivo, diario):
+        libro = buscar_libro_por_id(libros, libro_id)
 
-    if libro is None:
-        console.print(f"[red]✗[/red] Libro con ID '{libro_id}' no encontrado.")
-        return False
+        if libro is None:
+            console.print(f"[red]✗[/red] Libro con ID '{libro_id}' no encontrado.")
+            return False
 
-    if libro["prestado_a"] is not None:
-        console.print(
-            f"[yellow]⚠[/yellow] El libro '{libro['titulo']}' ya está "
-            f"prestado a: {libro['prestado_a']}"
-        )
-        return False
+        if libro["prestado_a"] is not None:
+            console.print(
+                f"[yellow]⚠[/yellow] El libro '{libro['titulo']}' ya está "
+                f"prestado a: {libro['prestado_a']}"
+            )
+            return False
 
-    libro["prestado_a"] = nombre_aprendiz
-    libro["fecha_prestamo"] = datetime.now().isoformat()
-    guardar_datos(libros, archivo)
+        limite = _limite_prestamos(libros)
+        if limite is not None and libros.cantidad_prestamos(nombre_aprendiz) >= limite:
+            console.print(
+                f"[yellow]⚠[/yellow] {nombre_aprendiz} ya tiene {limite} libros "
+                "prestados, el máximo permitido."
+            )
+            return False
+
+        anterior = _estado_prestamo(libro)
+        ahora = datetime.now()
+        libro["prestado_a"] = nombre_aprendiz
+        libro["fecha_prestamo"] = ahora.isoformat()
+        vencimiento = ahora + timedelta(days=DIAS_PRESTAMO)
+        libro["fecha_vencimiento"] = vencimiento.isoformat()
+        _registrar_cambio(libros, libro)
+        if not _persistir_cambios(libros, [libro], archivo, diario):
+            _restaurar_prestamos(libros, [libro], [anterior])
+            return False
+        _anotar_historial(libros, archivo, [(libro, None, None)], prestar=True)
 
-    console.print(
-        f"[green]✓[/green] Libro '{libro['titulo']}' prestado "
-        f"exitosamente a {nombre_aprendiz}"
-    )
-    return True
+        console.print(
+            f"[green]✓[/green] Libro '{libro['titulo']}' prestado "
+            f"exitosamente a {nombre_aprendiz}"
+        )
+        return True
 
 
 def devolver_libro(
-    libros: list[dict], libro_id: str, archivo: str = ARCHIVO_BIBLIOTECA
+    libros: list[dict] | Catalogo,
+    libro_id: str,
+    archivo: str = ARCHIVO_BIBLIOTECA,
+    diario: bool = False,
 ) -> bool:
     """
     Marca un libro como disponible (no prestado).
 
     Args:
-        libros: Lista de libros en la biblioteca
+        libros: Lista de libros o catálogo de la biblioteca
         libro_id: ID del libro a devolver
         archivo: Nombre del archivo para persistir los cambios
+        diario: Si es True, se añade una línea al diario (igual que en
+            ``prestar_libro``)
 
     Returns:
         True si la devolución fue exitosa, False en caso contrario
     """
-    libro = buscar_libro_por_id(libros, libro_id)
+    with _sesion_compartida(libros, archivo, diario):
+        libro = buscar_libro_por_id(libros, libro_id)
 
-    if libro is None:
-        console.print(f"[red]✗[/red] Libro con ID '{libro_id}' no encontrado.")
-        return False
+        if libro is None:
+            console.print(f"[red]✗[/red] Libro con ID '{libro_id}' no encontrado.")
+            return False
+
+        if libro["prestado_a"] is None:
+            console.print(
+                f"[yellow]⚠[/yellow] El libro '{libro['titulo']}' no está prestado."
+            )
+            return False
+
+        anterior = _estado_prestamo(libro)
+        prestado_a, fecha_prestamo, _ = anterior
+        libro["prestado_a"] = None
+        libro["fecha_prestamo"] = None
+        libro["fecha_vencimiento"] = None
+        _registrar_cambio(libros, libro)
+        if not _persistir_cambios(libros, [libro], archivo, diario):
+            _restaurar_prestamos(libros, [libro], [anterior])
+            return False
+        _anotar_historial(
+            libros, archivo, [(libro, prestado_a, fecha_prestamo)], prestar=False
+        )
 
-    if libro["prestado_a"] is None:
         console.print(
-            f"[yellow]⚠[/yellow] El libro '{libro['titulo']}' no está prestado."
+            f"[green]✓[/green] Libro '{libro['titulo']}' devuelto "
+            f"exitosamente por {prestado_a}"
         )
-        return False
+        return True
 
-    prestado_a = libro["prestado_a"]
-    libro["prestado_a"] = None
-    libro["fecha_prestamo"] = None
-    guardar_datos(libros, archivo)
 
-    console.print(
-        f"[green]✓[/green] Libro '{libro['titulo']}' devuelto "
-        f"exitosamente por {prestado_a}"
+def _limite_prestamos(libros: list[dict] | Catalogo) -> int | None:
+    """
+    Retorna el máximo de préstamos por aprendiz que aplica a los libros.
+
+    Solo un catálogo tiene límite: lo comprueba con su índice por
+    aprendiz, mientras que en una lista simple habría que recorrerla.
+    """
+    return libros.max_prestamos if isinstance(libros, Catalogo) else None
+
+
+def _agregar_libro(libros: list[dict] | Catalogo, libro: dict) -> None:
+    """Agrega un libro (como ``Libro`` compacto si es un catálogo)."""
+    if isinstance(libros, Catalogo):
+        libros.agregar(Libro.desde_dict(libro))
+    else:
+        libros.append(libro)
+
+
+def _truncar_libros(libros: list[dict] | Catalogo, cantidad: int) -> None:
+    """Quita los libros agregados después de los primeros ``cantidad``."""
+    if isinstance(libros, Catalogo):
+        lista = libros.a_lista()
+        del lista[cantidad:]
+        libros.reemplazar(lista)
+    else:
+        del libros[cantidad:]
+
+
+def incorporar_libros(
+    libros: list[dict] | Catalogo,
+    nuevos: Iterable[dict],
+    archivo: str = ARCHIVO_BIBLIOTECA,
+    diario: bool = False,
+) -> int | None:
+    """
+    Agrega al catálogo libros ya validados, persistiendo una sola vez.
+
+    ``nuevos`` se consume dentro de la sesión (en modo ``diario``, con el
+    bloqueo exclusivo y el catálogo ya sincronizado), así que puede ser
+    un generador que valide cada libro contra el catálogo a medida que
+    se agregan. Como el diario solo registra préstamos, se guarda siempre
+    la instantánea completa. Si la persistencia falla, los libros
+    agregados se quitan.
+
+    Args:
+        libros: Lista de libros o catálogo de la biblioteca
+        nuevos: Diccionarios de los libros a agregar
+        archivo: Nombre del archivo para persistir los cambios
+        diario: Si es True, se coordina con los demás puestos
+
+    Returns:
+        Número de libros agregados, o None si no se pudieron guardar
+    """
+    with _sesion_compartida(libros, archivo, diario):
+        cantidad_previa = len(libros)
+        for datos in nuevos:
+            libro = {
+                "prestado_a": None,
+                "fecha_prestamo": None,
+                "fecha_vencimiento": None,
+                **datos,
+            }
+            _agregar_libro(libros, libro)
+
+        agregados = len(libros) - cantidad_previa
+        if agregados == 0:
+            return 0
+        if guardar_datos(libros, archivo):
+            anotar_cambios(
+                (libro["libro_id"] for libro in libros[cantidad_previa:]), archivo
+            )
+            return agregados
+        _truncar_libros(libros, cantidad_previa)
+        return None
+
+
+def agregar_libros(
+    libros: list[dict] | Catalogo,
+    nuevos: Iterable[dict],
+    archivo: str = ARCHIVO_BIBLIOTECA,
+    diario: bool = False,
+) -> list[dict]:
+    """
+    Agrega varios libros nuevos al catálogo, persistiendo una sola vez.
+
+    Se rechazan los libros sin ``libro_id`` o ``titulo`` y los que
+    repiten un ID del catálogo o del mismo lote. Los préstamos que
+    traigan se conservan. Ver ``incorporar_libros``.
+
+    Args:
+        libros: Lista de libros o catálogo de la biblioteca
+        nuevos: Diccionarios de los libros a agregar
+        archivo: Nombre del archivo para persistir los cambios
+        diario: Si es True, se coordina con los demás puestos
+
+    Returns:
+        Un diccionario por libro con ``libro_id``, ``exito`` y ``motivo``
+        (None si se agregó)
+    """
+    resultados = []
+
+    def validos() -> Iterator[dict]:
+        # Se ejecuta ya dentro de la sesión de ``incorporar_libros``
+        existentes = {libro["libro_id"] for libro in libros}
+        for datos in nuevos:
+            libro_id = datos.get("libro_id")
+            if not libro_id or not datos.get("titulo"):
+                motivo = MOTIVO_DATOS_INCOMPLETOS
+            elif libro_id in existentes:
+                motivo = MOTIVO_ID_EXISTENTE
+            else:
+                motivo = None
+                existentes.add(libro_id)
+            resultados.append(
+                {"libro_id": libro_id, "exito": motivo is None, "motivo": motivo}
+            )
+            if motivo is None:
+                yield datos
+
+    if incorporar_libros(libros, validos(), archivo, diario) is None:
+        for resultado in resultados:
+            if resultado["exito"]:
+                resultado["exito"] = False
+                resultado["motivo"] = MOTIVO_ERROR_GUARDADO
+    return resultados
+
+
+def _motivo_rechazo(
+    libro: dict | None, libro_id: str, vistos: set[str], prestar: bool
+) -> str | None:
+    """Retorna por qué se rechaza una solicitud del lote (None si es válida)."""
+    if libro is None:
+        return MOTIVO_NO_ENCONTRADO
+    if libro_id in vistos:
+        return MOTIVO_DUPLICADO
+    if prestar and libro["prestado_a"] is not None:
+        return MOTIVO_YA_PRESTADO
+    if not prestar and libro["prestado_a"] is None:
+        return MOTIVO_NO_PRESTADO
+    return None
+
+
+def _procesar_lote(
+    libros: list[dict] | Catalogo,
+    solicitudes: list[tuple[str, str | None]],
+    prestar: bool,
+    archivo: str,
+    diario: bool,
+) -> list[dict]:
+    """
+    Valida, aplica y persiste un lote de préstamos o devoluciones.
+
+    Primero se valida todo el lote contra el índice; luego se aplican las
+    solicitudes válidas y se persiste una única vez. Si la persistencia
+    falla, los cambios en memoria se deshacen.
+    """
+    if isinstance(libros, Catalogo):
+        buscar = libros.buscar_por_id
+    else:
+        buscar = {libro["libro_id"]: libro for libro in libros}.get
+    limite = _limite_prestamos(libros) if prestar else None
+
+    resultados = []
+    aceptados = []
+    vistos: set[str] = set()
+    en_lote: Counter[str] = Counter()
+    for libro_id, nombre_aprendiz in solicitudes:
+        libro = buscar(libro_id)
+        motivo = _motivo_rechazo(libro, libro_id, vistos, prestar)
+        if (
+            motivo is None
+            and limite is not None
+            and libros.cantidad_prestamos(nombre_aprendiz) + en_lote[nombre_aprendiz]
+            >= limite
+        ):
+            motivo = MOTIVO_LIMITE_APRENDIZ
+        if motivo is None:
+            aceptados.append((libro, nombre_aprendiz))
+            en_lote[nombre_aprendiz] += 1
+        vistos.add(libro_id)
+        resultados.append(
+            {"libro_id": libro_id, "exito": motivo is None, "motivo": motivo}
+        )
+
+    if not aceptados:
+        return resultados
+
+    anteriores = [_estado_prestamo(libro) for libro, _ in aceptados]
+    ahora = datetime.now()
+    fecha = ahora.isoformat() if prestar else None
+    vencimiento = (
+        (ahora + timedelta(days=DIAS_PRESTAMO)).isoformat() if prestar else None
     )
-    return True
+    for libro, nombre_aprendiz in aceptados:
+        libro["prestado_a"] = nombre_aprendiz
+        libro["fecha_prestamo"] = fecha
+        libro["fecha_vencimiento"] = vencimiento
+        _registrar_cambio(libros, libro)
+
+    modificados = [libro for libro, _ in aceptados]
+    if _persistir_cambios(libros, modificados, archivo, diario):
+        _anotar_historial(
+            libros,
+            archivo,
+            [
+                (libro, prestado_a, fecha_prestamo)
+                for libro, (prestado_a, fecha_prestamo, _) in zip(
+                    modificados, anteriores
+                )
+            ],
+            prestar,
+        )
+        return resultados
+
+    _restaurar_prestamos(libros, modificados, anteriores)
+    for resultado in resultados:
+        if resultado["exito"]:
+            resultado["exito"] = False
+            resultado["motivo"] = MOTIVO_ERROR_GUARDADO
+    return resultados
 
 
-def buscar_libro(libros: list[dict], query: str) -> list[dict]:
+def prestar_libros_lote(
+    libros: list[dict] | Catalogo,
+    prestamos: list[tuple[str, str]],
+    archivo: str = ARCHIVO_BIBLIOTECA,
+    diario: bool = False,
+) -> list[dict]:
     """
-    Busca libros por título o autor (búsqueda insensible a mayúsculas).
+    Presta varios libros de una vez, persistiendo una sola vez.
+
+    Pensado para procesos masivos (p. ej. inicio de semestre): no muestra
+    nada por consola y retorna el resultado de cada solicitud.
+
+    Args:
+        libros: Lista de libros o catálogo de la biblioteca
+        prestamos: Pares (libro_id, nombre_aprendiz)
+        archivo: Nombre del archivo para persistir los cambios
+        diario: Si es True, los cambios se añaden al diario
+
+    Returns:
+        Un diccionario por solicitud con ``libro_id``, ``exito`` y
+        ``motivo`` (None si tuvo éxito)
+
+    Example:
+        >>> prestar_libros_lote(libros, [("001", "Ana"), ("999", "Luis")])
+        [{'libro_id': '001', 'exito': True, 'motivo': None},
+         {'libro_id': '999', 'exito': False, 'motivo': 'no encontrado'}]
+    """
+    with _sesion_compartida(libros, archivo, diario):
+        return _procesar_lote(libros, prestamos, True, archivo, diario)
+
+
+def devolver_libros_lote(
+    libros: list[dict] | Catalogo,
+    libro_ids: list[str],
+    archivo: str = ARCHIVO_BIBLIOTECA,
+    diario: bool = False,
+) -> list[dict]:
+    """
+    Devuelve varios libros de una vez, persistiendo una sola vez.
 
     Args:
-        libros: Lista de libros en la biblioteca
+        libros: Lista de libros o catálogo de la biblioteca
+        libro_ids: IDs de los libros a devolver
+        archivo: Nombre del archivo para persistir los cambios
+        diario: Si es True, los cambios se añaden al diario
+
+    Returns:
+        Un diccionario por solicitud con ``libro_id``, ``exito`` y
+        ``motivo`` (None si tuvo éxito)
+    """
+    solicitudes = [(libro_id, None) for libro_id in libro_ids]
+    with _sesion_compartida(libros, archivo, diario):
+        return _procesar_lote(libros, solicitudes, False, archivo, diario)
+
+
+def obtener_resultados_busqueda(
+    libros: list[dict] | Catalogo,
+    query: str,
+    archivo: str | None = None,
+    aproximado: bool = False,
+) -> list[dict]:
+    """
+    Busca libros por título o autor sin mostrarlos.
+
+    Con un ``Catalogo`` se usa su índice invertido (búsqueda por prefijo
+    de cada término, sin acentos, que también cubre el ISBN); con una
+    lista simple se hace una búsqueda de subcadena lineal. Si ``archivo``
+    es una base SQLite, la búsqueda se hace con su tabla FTS5.
+
+    En modo ``aproximado`` se retornan los ``TOP_K`` libros más parecidos
+    por trigramas, de modo que "Quijte" encuentra "Don Quijote". Con una
+    lista simple se indexa primero una copia en un catálogo temporal.
+
+    Args:
+        libros: Lista de libros o catálogo de la biblioteca
         query: Término de búsqueda
+        archivo: Base SQLite opcional donde consultar
+        aproximado: Si es True, tolera errores de escritura
 
     Returns:
         Lista de diccionarios con los libros encontrados
     """
+    if aproximado:
+        catalogo = libros if isinstance(libros, Catalogo) else Catalogo(list(libros))
+        return catalogo.buscar_aproximado(query)
+    if archivo is not None and Biblioteca_sqlite.es_archivo_sqlite(archivo):
+        return Biblioteca_sqlite.buscar_texto(archivo, query)
+    if isinstance(libros, Catalogo):
+        return libros.buscar_texto(query)
     query_lower = query.lower()
-    resultados = [
+    return [
         libro
         for libro in libros
         if query_lower in libro["titulo"].lower()
         or query_lower in libro.get("autor", "").lower()
     ]
 
+
+def buscar_libro(
+    libros: list[dict] | Catalogo,
+    query: str,
+    archivo: str | None = None,
+    aproximado: bool = False,
+    silencioso: bool = False,
+) -> list[dict]:
+    """
+    Busca libros por título o autor (búsqueda insensible a mayúsculas).
+
+    Args:
+        libros: Lista de libros o catálogo de la biblioteca
+        query: Término de búsqueda
+        archivo: Base SQLite opcional donde consultar
+        aproximado: Si es True, muestra los libros más parecidos aunque
+            la consulta tenga errores de escritura
+        silencioso: Si es True, solo retorna los resultados, sin mostrar
+            nada (un script no inicializa la interfaz de Rich)
+
+    Returns:
+        Lista de diccionarios con los libros encontrados
+    """
+    resultados = obtener_resultados_busqueda(libros, query, archivo, aproximado)
+
+    if silencioso:
+        return resultados
     if not resultados:
         console.print(f"[yellow]⚠[/yellow] No se encontraron libros con: '{query}'")
         return []
 
-    mostrar_libros(resultados, f"Resultados de búsqueda: '{query}'")
+    titulo = "Resultados aproximados" if aproximado else "Resultados de búsqueda"
+    _mostrar_vista(
+        libros,
+        archivo,
+        ("busqueda", query, aproximado),
+        lambda: mostrar_libros(resultados, f"{titulo}: '{query}'"),
+    )
     return resultados
 
 
-def ver_libros_prestados(libros: list[dict]) -> list[dict]:
+def obtener_libros_prestados(
+    libros: list[dict] | Catalogo, archivo: str | None = None
+) -> list[dict]:
+    """
+    Obtiene los libros prestados sin mostrarlos.
+
+    Con un ``Catalogo`` se usa su índice de préstamos y, si ``archivo`` es
+    una base SQLite, una consulta sobre el índice de ``prestado_a``; solo
+    una lista simple se recorre completa.
+
+    Args:
+        libros: Lista de libros o catálogo de la biblioteca
+        archivo: Base SQLite opcional donde consultar
+
+    Returns:
+        Lista de diccionarios con los libros prestados
+    """
+    if archivo is not None and Biblioteca_sqlite.es_archivo_sqlite(archivo):
+        return Biblioteca_sqlite.libros_prestados(archivo)
+    if isinstance(libros, Catalogo):
+        return libros.prestados()
+    return [libro for libro in libros if libro["prestado_a"] is not None]
+
+
+def obtener_prestamos_aprendiz(
+    libros: list[dict] | Catalogo, nombre_aprendiz: str, archivo: str | None = None
+) -> list[dict]:
+    """
+    Obtiene los libros que tiene prestados un aprendiz.
+
+    Con un ``Catalogo`` se usa su índice por aprendiz y, si ``archivo`` es
+    una base SQLite, una consulta sobre el índice de ``prestado_a``; solo
+    una lista simple se recorre completa.
+
+    Args:
+        libros: Lista de libros o catálogo de la biblioteca
+        nombre_aprendiz: Nombre del aprendiz
+        archivo: Base SQLite opcional donde consultar
+
+    Returns:
+        Lista de diccionarios con los libros prestados al aprendiz
+    """
+    if archivo is not None and Biblioteca_sqlite.es_archivo_sqlite(archivo):
+        return Biblioteca_sqlite.libros_de_aprendiz(archivo, nombre_aprendiz)
+    if isinstance(libros, Catalogo):
+        return libros.prestamos_de(nombre_aprendiz)
+    return [libro for libro in libros if libro["prestado_a"] == nombre_aprendiz]
+
+
+def ver_libros_prestados(
+    libros: list[dict] | Catalogo, archivo: str | None = None
+) -> list[dict]:
     """
     Muestra todos los libros que están prestados actualmente.
 
     Args:
-        libros: Lista de libros en la biblioteca
+        libros: Lista de libros o catálogo de la biblioteca
+        archivo: Base SQLite opcional donde consultar
 
     Returns:
         Lista de diccionarios con los libros prestados
     """
-    prestados = [libro for libro in libros if libro["prestado_a"] is not None]
+    prestados = obtener_libros_prestados(libros, archivo)
 
     if not prestados:
         console.print("[cyan]ℹ[/cyan] No hay libros prestados actualmente.")
         return []
 
-    mostrar_libros(prestados, "Libros Prestados", mostrar_prestamo=True)
+    _mostrar_vista(
+        libros,
+        archivo,
+        ("prestados",),
+        lambda: mostrar_libros(prestados, "Libros Prestados", mostrar_prestamo=True),
+    )
     return prestados
 
 
-def ver_todos_los_libros(libros: list[dict]) -> None:
+def ver_libros_vencidos(
+    libros: list[dict] | Catalogo,
+    archivo: str | None = None,
+    ahora: datetime | None = None,
+) -> list[dict]:
+    """
+    Muestra los libros prestados cuyo plazo de devolución ya venció.
+
+    Con un ``Catalogo`` se recorre su montículo de vencimientos, así que
+    solo se visitan los préstamos vencidos; en otro caso se filtran los
+    libros de ``obtener_libros_prestados``.
+
+    Args:
+        libros: Lista de libros o catálogo de la biblioteca
+        archivo: Base SQLite opcional donde consultar
+        ahora: Momento de referencia (por defecto, el actual)
+
+    Returns:
+        Lista de libros vencidos, del vencimiento más antiguo al más reciente
+    """
+    if isinstance(libros, Catalogo) and not (
+        archivo is not None and Biblioteca_sqlite.es_archivo_sqlite(archivo)
+    ):
+        vencidos = libros.vencidos(ahora)
+    else:
+        limite = (ahora or datetime.now()).isoformat()
+        vencidos = sorted(
+            (
+                libro
+                for libro in obtener_libros_prestados(libros, archivo)
+                if (calcular_vencimiento(libro) or limite) < limite
+            ),
+            key=calcular_vencimiento,
+        )
+
+    if not vencidos:
+        console.print("[cyan]ℹ[/cyan] No hay préstamos vencidos.")
+        return []
+
+    mostrar_libros(
+        vencidos, "Préstamos Vencidos", mostrar_prestamo=True, mostrar_vencimiento=True
+    )
+    return vencidos
+
+
+def paginar_libros(
+    libros: list[dict] | Catalogo, pagina: int, tam_pagina: int = TAM_PAGINA
+) -> tuple[list[dict], int]:
+    """
+    Obtiene solo los libros de una página del catálogo.
+
+    Se toma una porción de la secuencia, así que el costo depende del
+    tamaño de página y no del número total de libros.
+
+    Args:
+        libros: Lista de libros o catálogo de la biblioteca
+        pagina: Número de página (desde 1); se ajusta al rango válido
+        tam_pagina: Libros por página
+
+    Returns:
+        Tupla (libros de la página, total de páginas)
+    """
+    total_paginas = max(1, -(-len(libros) // tam_pagina))
+    pagina = min(max(pagina, 1), total_paginas)
+    inicio = (pagina - 1) * tam_pagina
+    return list(libros[inicio : inicio + tam_pagina]), total_paginas
+
+
+def navegar_paginas(
+    libros: list[dict] | Catalogo, tam_pagina: int = TAM_PAGINA
+) -> None:
+    """
+    Muestra el catálogo página a página con navegación interactiva.
+
+    Permite avanzar (``s``), retroceder (``a``), saltar a una página
+    escribiendo su número y salir (``x`` o Enter por defecto).
+
+    Args:
+        libros: Lista de libros o catálogo de la biblioteca
+        tam_pagina: Libros por página
+    """
+    pagina = 1
+    while True:
+        libros_pagina, total_paginas = paginar_libros(libros, pagina, tam_pagina)
+        pagina = min(pagina, total_paginas)
+        titulo = (
+            f"Catálogo Completo de la Biblioteca (página {pagina} de {total_paginas})"
+        )
+        _mostrar_vista(
+            libros,
+            None,
+            ("pagina", pagina, tam_pagina),
+            lambda: mostrar_libros(libros_pagina, titulo, mostrar_prestamo=True),
+        )
+
+        opcion = Prompt.ask(
+            "[dim]s: siguiente · a: anterior · número: ir a página · x: salir[/dim]",
+            default="x",
+        )
+        opcion = opcion.strip().lower()
+        if opcion in ("x", ""):
+            return
+        if opcion == "s":
+            pagina = min(pagina + 1, total_paginas)
+        elif opcion == "a":
+            pagina = max(pagina - 1, 1)
+        elif opcion.isdigit():
+            pagina = min(max(int(opcion), 1), total_paginas)
+        else:
+            console.print(f"[yellow]⚠[/yellow] Opción no válida: '{opcion}'")
+
+
+def ver_todos_los_libros(
+    libros: list[dict] | Catalogo, tam_pagina: int | None = None
+) -> None:
     """
     Muestra todos los libros de la biblioteca.
 
     Args:
-        libros: Lista de libros en la biblioteca
+        libros: Lista de libros o catálogo de la biblioteca
+        tam_pagina: Si se indica, el catálogo se muestra paginado y solo
+            se renderizan los libros de la página visible
     """
     if not libros:
         console.print("[yellow]⚠[/yellow] La biblioteca está vacía.")
         return
 
-    mostrar_libros(libros, "Catálogo Completo de la Biblioteca", mostrar_prestamo=True)
+    if tam_pagina is not None:
+        navegar_paginas(libros, tam_pagina)
+        return
+
+    _mostrar_vista(
+        libros,
+        None,
+        ("todos",),
+        lambda: mostrar_libros(
+            libros, "Catálogo Completo de la Biblioteca", mostrar_prestamo=True
+        ),
+    )
+
+
+class CacheVistas:
+    """
+    Caché LRU de las tablas de libros ya renderizadas de un catálogo.
+
+    Guarda el texto final (con los códigos de color de la terminal) de
+    cada vista, así que mostrarla de nuevo solo cuesta escribirlo. La
+    clave incluye la ``version`` del catálogo, que cambia con cada
+    préstamo, devolución o alta: al guardar una vista de una versión
+    nueva se descartan las de versiones anteriores, y si se superan
+    ``capacidad`` vistas se descarta la usada hace más tiempo.
+    """
+
+    def __init__(self, capacidad: int = MAX_VISTAS_EN_CACHE) -> None:
+        """
+        Crea la caché vacía.
+
+        Args:
+            capacidad: Número máximo de vistas guardadas
+        """
+        self.capacidad = capacidad
+        self._vistas: OrderedDict[tuple, str] = OrderedDict()
+        self._version: int | None = None
+
+    def __len__(self) -> int:
+        return len(self._vistas)
+
+    def obtener(self, version: int, clave: tuple) -> str | None:
+        """
+        Retorna una vista guardada y la marca como usada recientemente.
+
+        Args:
+            version: Versión actual del catálogo
+            clave: Vista, consulta y ancho de la terminal
+
+        Returns:
+            Texto renderizado, o None si no está o es de otra versión
+        """
+        if version != self._version:
+            return None
+        texto = self._vistas.get(clave)
+        if texto is not None:
+            self._vistas.move_to_end(clave)
+        return texto
+
+    def guardar(self, version: int, clave: tuple, texto: str) -> None:
+        """
+        Guarda el texto renderizado de una vista.
+
+        Args:
+            version: Versión del catálogo con la que se renderizó
+            clave: Vista, consulta y ancho de la terminal
+            texto: Salida completa de la vista
+        """
+        if version != self._version:
+            self._vistas.clear()
+            self._version = version
+        self._vistas[clave] = texto
+        self._vistas.move_to_end(clave)
+        if len(self._vistas) > self.capacidad:
+            self._vistas.popitem(last=False)
+
+
+# Una caché por catálogo; desaparece junto con el catálogo
+_vistas_por_catalogo: "weakref.WeakKeyDictionary[Catalogo, CacheVistas]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _mostrar_vista(
+    libros: list[dict] | Catalogo,
+    archivo: str | None,
+    vista: tuple,
+    mostrar: Callable[[], None],
+) -> None:
+    """
+    Muestra una vista reutilizando su render si el catálogo no cambió.
+
+    Solo un ``Catalogo`` lleva versión; una lista simple o una base
+    SQLite (que otros procesos pueden modificar) se renderizan siempre.
+    """
+    if not isinstance(libros, Catalogo) or (
+        archivo is not None and Biblioteca_sqlite.es_archivo_sqlite(archivo)
+    ):
+        mostrar()
+        return
+
+    cache = _vistas_por_catalogo.get(libros)
+    if cache is None:
+        cache = _vistas_por_catalogo[libros] = CacheVistas()
+    clave = (*vista, console.width)
+    texto = cache.obtener(libros.version, clave)
+    if texto is None:
+        with console.capture() as captura:
+            mostrar()
+        texto = captura.get()
+        cache.guardar(libros.version, clave, texto)
+    console.file.write(texto)
+    console.file.flush()
 
 
 def mostrar_libros(
-    libros: list[dict], titulo: str, mostrar_prestamo: bool = False
+    libros: list[dict],
+    titulo: str,
+    mostrar_prestamo: bool = False,
+    mostrar_vencimiento: bool = False,
 ) -> None:
     """
     Muestra una tabla de libros usando Rich.
@@ -289,6 +2150,7 @@ def mostrar_libros(
         libros: Lista de libros a mostrar
         titulo: Título de la tabla
         mostrar_prestamo: Si se debe mostrar información de préstamo
+        mostrar_vencimiento: Si se debe mostrar la fecha de vencimiento
     """
     table = Table(
         title=titulo,
@@ -304,6 +2166,8 @@ def mostrar_libros(
     if mostrar_prestamo:
         table.add_column("Estado", style="blue", width=15)
         table.add_column("Prestado a", style="magenta", width=20)
+    if mostrar_vencimiento:
+        table.add_column("Vence", style="red", width=10)
 
     for libro in libros:
         if mostrar_prestamo:
@@ -313,13 +2177,16 @@ def mostrar_libros(
                 else "[green]Disponible[/green]"
             )
             prestado = libro["prestado_a"] or "-"
-            table.add_row(
+            columnas = [
                 libro["libro_id"],
                 libro["titulo"],
                 libro.get("autor", "Desconocido"),
                 estado,
                 prestado,
-            )
+            ]
+            if mostrar_vencimiento:
+                columnas.append((calcular_vencimiento(libro) or "-")[:10])
+            table.add_row(*columnas)
         else:
             table.add_row(
                 libro["libro_id"],
@@ -340,16 +2207,25 @@ def mostrar_menu() -> None:
         "[bold cyan]2.[/bold cyan] Devolver libro\n"
         "[bold cyan]3.[/bold cyan] Buscar libro\n"
         "[bold cyan]4.[/bold cyan] Ver libros prestados\n"
-        "[bold cyan]5.[/bold cyan] Ver todos los libros\n"
-        "[bold cyan]6.[/bold cyan] Salir",
+        "[bold cyan]5.[/bold cyan] Ver libros vencidos\n"
+        "[bold cyan]6.[/bold cyan] Ver todos los libros\n"
+        "[bold cyan]7.[/bold cyan] Salir",
         title="[bold blue] MENÚ PRINCIPAL[/bold blue]",
         border_style="blue",
     )
     console.print(panel)
 
 
-def main() -> None:
-    """Función principal que ejecuta la aplicación."""
+def main(archivo: str = ARCHIVO_BIBLIOTECA, diario: bool = False) -> None:
+    """
+    Función principal que ejecuta la aplicación.
+
+    Args:
+        archivo: Archivo JSON o base SQLite (``.db``) de la biblioteca
+        diario: Si es True, los préstamos se registran en el diario en
+            lugar de reescribir el archivo completo en cada operación; es
+            el modo a usar cuando varios puestos comparten el archivo
+    """
     console.clear()
     console.print(
         Panel.fit(
@@ -360,45 +2236,56 @@ def main() -> None:
     console.print("\n")
 
     # Cargar datos al inicio
-    libros = cargar_datos()
+    libros = cargar_datos(archivo)
 
     while True:
         mostrar_menu()
         opcion = Prompt.ask(
             "[bold]Seleccione una opción[/bold]",
-            choices=["1", "2", "3", "4", "5", "6"],
+            choices=["1", "2", "3", "4", "5", "6", "7"],
         )
 
+        if diario and opcion in ("3", "4", "5", "6"):
+            # Mostrar también los préstamos hechos desde otros puestos
+            sincronizar_catalogo(libros, archivo)
+
         if opcion == "1":
             # Prestar libro
             console.print("\n[bold cyan]═══ Prestar Libro ═══[/bold cyan]")
             libro_id = Prompt.ask("Ingrese el ID del libro")
             nombre = Prompt.ask("Ingrese el nombre del aprendiz")
-            prestar_libro(libros, libro_id, nombre)
+            prestar_libro(libros, libro_id, nombre, archivo, diario=diario)
 
         elif opcion == "2":
             # Devolver libro
             console.print("\n[bold cyan]═══ Devolver Libro ═══[/bold cyan]")
             libro_id = Prompt.ask("Ingrese el ID del libro")
-            devolver_libro(libros, libro_id)
+            devolver_libro(libros, libro_id, archivo, diario=diario)
 
         elif opcion == "3":
             # Buscar libro
             console.print("\n[bold cyan]═══ Buscar Libro ═══[/bold cyan]")
             query = Prompt.ask("Ingrese el título o autor a buscar")
-            buscar_libro(libros, query)
+            if not buscar_libro(libros, query, archivo):
+                # Sin coincidencias exactas, se ofrecen los más parecidos
+                buscar_libro(libros, query, archivo, aproximado=True)
 
         elif opcion == "4":
             # Ver libros prestados
             console.print("\n")
-            ver_libros_prestados(libros)
+            ver_libros_prestados(libros, archivo)
 
         elif opcion == "5":
-            # Ver todos los libros
+            # Ver libros vencidos
             console.print("\n")
-            ver_todos_los_libros(libros)
+            ver_libros_vencidos(libros, archivo)
 
         elif opcion == "6":
+            # Ver todos los libros
+            console.print("\n")
+            ver_todos_los_libros(libros, TAM_PAGINA)
+
+        elif opcion == "7":
             if Confirm.ask("\n¿Está seguro que desea salir?"):
                 console.print(
                     "\n[bold green]¡Gracias por usar el sistema de biblioteca!"
@@ -406,7 +2293,7 @@ def main() -> None:
                 )
                 break
 
-        if opcion != "6":
+        if opcion != "7":
             Prompt.ask("\n[dim]Presione Enter para continuar[/dim]", default="")
 
 
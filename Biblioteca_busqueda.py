@@ -0,0 +1,380 @@
+"""
+Índices de búsqueda para el catálogo de la biblioteca.
+
+Este módulo implementa un índice invertido sobre título, autor e ISBN
+que permite búsquedas por prefijo y por varios términos (AND) sin
+recorrer todo el catálogo, y un índice de trigramas sobre su vocabulario
+para la búsqueda aproximada (tolerante a errores de escritura).
+"""
+
+import heapq
+import re
+import unicodedata
+from bisect import bisect_left, insort
+from collections import Counter
+
+_PATRON_TOKEN = re.compile(r"\w+")
+
+# Con más tokens nuevos pendientes que este valor, el vocabulario se reordena
+# completo en lugar de insertarlos uno a uno
+_MAX_INSERCIONES_VOCABULARIO = 256
+
+# Similitud mínima (índice de Jaccard de trigramas) para considerar que dos
+# palabras se parecen, y máximo de palabras parecidas por término
+UMBRAL_SIMILITUD = 0.3
+MAX_PALABRAS_SIMILARES = 10
+
+# Resultados que retorna por defecto la búsqueda aproximada
+TOP_K = 10
+
+# Los términos más cortos no aportan trigramas útiles y se ignoran
+_MIN_LARGO_APROXIMADO = 3
+
+
+def normalizar(texto: str) -> str:
+    """
+    Pasa un texto a minúsculas y le quita los acentos.
+
+    Args:
+        texto: Texto a normalizar
+
+    Returns:
+        Texto en minúsculas y sin marcas diacríticas
+
+    Example:
+        >>> normalizar("Márquez")
+        'marquez'
+    """
+    if texto.isascii():
+        return texto.lower()
+    descompuesto = unicodedata.normalize("NFKD", texto)
+    sin_acentos = "".join(c for c in descompuesto if not unicodedata.combining(c))
+    return sin_acentos.casefold()
+
+
+def tokenizar(texto: str) -> list[str]:
+    """
+    Divide un texto normalizado en palabras.
+
+    Args:
+        texto: Texto a dividir
+
+    Returns:
+        Lista de tokens normalizados
+    """
+    return _PATRON_TOKEN.findall(normalizar(texto))
+
+
+def tokens_libro(libro: dict) -> set[str]:
+    """
+    Obtiene los tokens indexables de un libro (título, autor e ISBN).
+
+    El ISBN se indexa por partes y también completo sin guiones, para
+    que se pueda buscar de las dos formas.
+
+    Args:
+        libro: Libro del que extraer los tokens
+
+    Returns:
+        Conjunto de tokens del libro
+    """
+    tokens = set(tokenizar(libro["titulo"]))
+    tokens.update(tokenizar(libro.get("autor") or ""))
+
+    isbn = libro.get("isbn") or ""
+    partes_isbn = tokenizar(isbn)
+    tokens.update(partes_isbn)
+    if len(partes_isbn) > 1:
+        tokens.add("".join(partes_isbn))
+    return tokens
+
+
+def trigramas(palabra: str) -> set[str]:
+    """
+    Obtiene los trigramas de una palabra ya normalizada.
+
+    La palabra se rellena con dos espacios al inicio y uno al final, de
+    modo que el comienzo de la palabra pesa más (como ``pg_trgm``).
+
+    Args:
+        palabra: Palabra normalizada
+
+    Returns:
+        Conjunto de trigramas
+
+    Example:
+        >>> sorted(trigramas("sol"))
+        ['  s', ' so', 'ol ', 'sol']
+    """
+    relleno = f"  {palabra} "
+    return {relleno[i : i + 3] for i in range(len(relleno) - 2)}
+
+
+def es_palabra_aproximable(palabra: str) -> bool:
+    """
+    Indica si una palabra participa en la búsqueda aproximada.
+
+    Se excluyen las palabras cortas y las numéricas (partes del ISBN,
+    años), donde un error de escritura no se corrige por parecido.
+
+    Args:
+        palabra: Palabra normalizada
+
+    Returns:
+        True si la palabra se indexa por trigramas
+    """
+    return len(palabra) >= _MIN_LARGO_APROXIMADO and not palabra.isdigit()
+
+
+class IndiceTrigramas:
+    """
+    Índice de trigrama a palabras, para encontrar palabras parecidas.
+
+    Se indexan palabras (el vocabulario), no libros: el vocabulario es
+    mucho más pequeño que el catálogo, y de cada palabra parecida se
+    llega a sus libros con el índice invertido.
+    """
+
+    def __init__(self) -> None:
+        """Crea un índice vacío."""
+        self._por_trigrama: dict[str, set[str]] = {}
+        self._cantidad: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._cantidad)
+
+    def agregar(self, palabra: str) -> None:
+        """
+        Agrega una palabra al índice (si no estaba ya).
+
+        Args:
+            palabra: Palabra normalizada
+        """
+        if palabra in self._cantidad:
+            return
+        propios = trigramas(palabra)
+        self._cantidad[palabra] = len(propios)
+        for trigrama in propios:
+            self._por_trigrama.setdefault(trigrama, set()).add(palabra)
+
+    def quitar(self, palabra: str) -> None:
+        """
+        Quita una palabra del índice (si estaba).
+
+        Args:
+            palabra: Palabra normalizada
+        """
+        if self._cantidad.pop(palabra, None) is None:
+            return
+        for trigrama in trigramas(palabra):
+            palabras = self._por_trigrama[trigrama]
+            palabras.discard(palabra)
+            if not palabras:
+                del self._por_trigrama[trigrama]
+
+    def similares(
+        self,
+        termino: str,
+        umbral: float = UMBRAL_SIMILITUD,
+        limite: int = MAX_PALABRAS_SIMILARES,
+    ) -> list[tuple[str, float]]:
+        """
+        Busca las palabras más parecidas a un término.
+
+        Args:
+            termino: Término normalizado
+            umbral: Similitud mínima (0 a 1)
+            limite: Máximo de palabras a retornar
+
+        Returns:
+            Pares (palabra, similitud), de la más a la menos parecida
+        """
+        propios = trigramas(termino)
+        comunes: Counter[str] = Counter()
+        for trigrama in propios:
+            comunes.update(self._por_trigrama.get(trigrama, ()))
+
+        parecidas = []
+        for palabra, compartidos in comunes.items():
+            similitud = compartidos / (
+                len(propios) + self._cantidad[palabra] - compartidos
+            )
+            if similitud >= umbral:
+                parecidas.append((palabra, similitud))
+        return heapq.nsmallest(limite, parecidas, key=lambda par: (-par[1], par[0]))
+
+
+class IndiceTexto:
+    """
+    Índice invertido de token a IDs de libro.
+
+    Mantiene además el vocabulario ordenado, de modo que una búsqueda
+    por prefijo localiza sus tokens con búsqueda binaria y solo visita
+    las entradas que coinciden. Los tokens nuevos se ordenan en la
+    siguiente búsqueda, así la carga inicial no paga una inserción
+    ordenada por cada token.
+    """
+
+    def __init__(self) -> None:
+        """Crea un índice vacío."""
+        self._postings: dict[str, set[str]] = {}
+        self._vocabulario: list[str] = []
+        self._pendientes: list[str] = []
+        self._tokens_por_libro: dict[str, set[str]] = {}
+        self._trigramas: IndiceTrigramas | None = None
+        self._sin_trigramas: list[str] = []
+
+    def __len__(self) -> int:
+        return len(self._tokens_por_libro)
+
+    def _agregar_token(self, token: str, libro_id: str) -> None:
+        ids = self._postings.get(token)
+        if ids is None:
+            self._postings[token] = {libro_id}
+            self._pendientes.append(token)
+            if self._trigramas is not None:
+                self._sin_trigramas.append(token)
+        else:
+            ids.add(libro_id)
+
+    def _quitar_token(self, token: str, libro_id: str) -> None:
+        ids = self._postings[token]
+        ids.discard(libro_id)
+        if not ids:
+            # El token queda en el vocabulario y se descarta al consultarlo
+            del self._postings[token]
+            if self._trigramas is not None:
+                self._trigramas.quitar(token)
+
+    def _ordenar_vocabulario(self) -> None:
+        """Incorpora al vocabulario ordenado los tokens pendientes."""
+        if not self._pendientes:
+            return
+        if len(self._pendientes) > _MAX_INSERCIONES_VOCABULARIO:
+            self._vocabulario = sorted(self._postings)
+        else:
+            for token in self._pendientes:
+                posicion = bisect_left(self._vocabulario, token)
+                if (
+                    posicion == len(self._vocabulario)
+                    or self._vocabulario[posicion] != token
+                ):
+                    insort(self._vocabulario, token, lo=posicion)
+        self._pendientes.clear()
+
+    def actualizar(self, libro: dict) -> None:
+        """
+        Agrega un libro al índice o actualiza sus tokens si ya estaba.
+
+        Solo se tocan los tokens que cambiaron, así que actualizar un
+        libro cuyo texto no varió (p. ej. al prestarlo) es barato.
+
+        Args:
+            libro: Libro a indexar
+        """
+        libro_id = libro["libro_id"]
+        nuevos = tokens_libro(libro)
+        anteriores = self._tokens_por_libro.get(libro_id, set())
+
+        for token in anteriores - nuevos:
+            self._quitar_token(token, libro_id)
+        for token in nuevos - anteriores:
+            self._agregar_token(token, libro_id)
+        self._tokens_por_libro[libro_id] = nuevos
+
+    def _ids_con_prefijo(self, prefijo: str) -> set[str]:
+        """Une los IDs de todos los tokens que empiezan por el prefijo."""
+        ids: set[str] = set()
+        posicion = bisect_left(self._vocabulario, prefijo)
+        while posicion < len(self._vocabulario):
+            token = self._vocabulario[posicion]
+            if not token.startswith(prefijo):
+                break
+            ids |= self._postings.get(token, set())
+            posicion += 1
+        return ids
+
+    def buscar(self, query: str) -> list[str] | None:
+        """
+        Busca libros que contengan todos los términos de la consulta.
+
+        Cada término se compara por prefijo, sin distinguir mayúsculas
+        ni acentos.
+
+        Args:
+            query: Términos de búsqueda separados por espacios
+
+        Returns:
+            IDs de los libros encontrados, ordenados; None si la consulta
+            no tiene ningún término
+        """
+        terminos = set(tokenizar(query))
+        if not terminos:
+            return None
+
+        self._ordenar_vocabulario()
+        conjuntos = sorted(
+            (self._ids_con_prefijo(termino) for termino in terminos), key=len
+        )
+        resultado = conjuntos[0]
+        for ids in conjuntos[1:]:
+            if not resultado:
+                break
+            resultado = resultado & ids
+        return sorted(resultado)
+
+    def _indice_trigramas(self) -> IndiceTrigramas:
+        """
+        Retorna el índice de trigramas del vocabulario, al día.
+
+        Se construye en la primera búsqueda aproximada (así la carga del
+        catálogo no lo paga) y después solo se le agregan las palabras
+        nuevas.
+        """
+        if self._trigramas is None:
+            self._trigramas = IndiceTrigramas()
+            self._sin_trigramas = list(self._postings)
+        for palabra in self._sin_trigramas:
+            if es_palabra_aproximable(palabra):
+                self._trigramas.agregar(palabra)
+        self._sin_trigramas.clear()
+        return self._trigramas
+
+    def buscar_aproximado(
+        self, query: str, cantidad: int = TOP_K
+    ) -> list[tuple[str, float]]:
+        """
+        Busca los libros más parecidos a la consulta, aunque tenga errores.
+
+        Cada término se compara por trigramas con el vocabulario; un
+        libro suma, por cada término, la similitud de su palabra más
+        parecida. Se ignoran los términos cortos y los numéricos.
+
+        Args:
+            query: Términos de búsqueda
+            cantidad: Número máximo de libros a retornar
+
+        Returns:
+            Pares (libro_id, puntaje), del más al menos parecido
+
+        Example:
+            >>> indice.buscar_aproximado("Quijte")
+            [('002', 0.5)]
+        """
+        terminos = {t for t in tokenizar(query) if es_palabra_aproximable(t)}
+        if not terminos:
+            return []
+
+        trigramas_vocabulario = self._indice_trigramas()
+        puntajes: dict[str, float] = {}
+        for termino in terminos:
+            mejores: dict[str, float] = {}
+            for palabra, similitud in trigramas_vocabulario.similares(termino):
+                for libro_id in self._postings.get(palabra, ()):
+                    if similitud > mejores.get(libro_id, 0.0):
+                        mejores[libro_id] = similitud
+            for libro_id, similitud in mejores.items():
+                puntajes[libro_id] = puntajes.get(libro_id, 0.0) + similitud
+        return heapq.nsmallest(
+            cantidad, puntajes.items(), key=lambda par: (-par[1], par[0])
+        )
@@ -0,0 +1,384 @@
+"""
+Línea de comandos no interactiva para el sistema de biblioteca.
+
+Pensada para tareas programadas y scripts: cada subcomando usa las mismas
+funciones que el menú de ``Biblioteca.py``, toma sus datos de los
+argumentos, de un archivo o de la entrada estándar (una línea JSON por
+solicitud) y escribe una línea JSON por resultado en la salida estándar.
+Los mensajes de la biblioteca van a la salida de errores, para no
+mezclarse con los resultados.
+
+Las solicitudes de préstamo y devolución se procesan por lotes (cada lote
+se valida y persiste una sola vez), así que miles de operaciones se
+resuelven en un único arranque del proceso.
+
+Subcomandos (con alias en inglés):
+    prestar (lend)          LIBRO_ID APRENDIZ, o líneas {"libro_id", "nombre_aprendiz"}
+    devolver (return)       LIBRO_ID, o líneas {"libro_id"}
+    buscar (search)         TEXTO [--aproximado]
+    prestados (list-lent)   libros prestados actualmente
+    importar (import)       libros nuevos desde CSV o JSONL (ver Biblioteca_importar)
+    exportar (export)       todos los libros, una línea JSON por libro
+    respaldar (backup)      respaldo completo o incremental (ver Biblioteca_respaldo)
+    restaurar (restore)     reconstruye la biblioteca desde los respaldos
+
+Códigos de salida:
+    0  todas las operaciones se hicieron
+    1  alguna operación fue rechazada (o la búsqueda no encontró nada)
+    2  argumentos o entrada inválidos
+    3  no se pudieron guardar los cambios
+
+Uso:
+    python Biblioteca_cli.py prestar 001 "Ana Gómez"
+    python Biblioteca_cli.py prestar --entrada prestamos.jsonl --diario
+    cat devoluciones.jsonl | python Biblioteca_cli.py devolver
+    python Biblioteca_cli.py importar --entrada catalogo.csv
+    python Biblioteca_cli.py exportar --salida catalogo.jsonl
+    python Biblioteca_cli.py respaldar --directorio respaldos
+"""
+
+import argparse
+import json
+import sys
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import redirect_stdout
+from itertools import batched
+from typing import TextIO
+
+from Biblioteca import (
+    ARCHIVO_BIBLIOTECA,
+    MOTIVO_ERROR_GUARDADO,
+    Catalogo,
+    a_dict,
+    cargar_datos,
+    devolver_libros_lote,
+    obtener_libros_prestados,
+    obtener_resultados_busqueda,
+    prestar_libros_lote,
+)
+from Biblioteca_importar import (
+    FORMATOS,
+    formato_de_archivo,
+    importar_catalogo,
+    leer_filas,
+)
+from Biblioteca_respaldo import (
+    DELTAS_POR_COMPLETO,
+    DIRECTORIO_RESPALDOS,
+    respaldar,
+    restaurar,
+)
+
+# Códigos de salida del proceso
+SALIDA_EXITO = 0
+SALIDA_RECHAZOS = 1
+SALIDA_ENTRADA_INVALIDA = 2
+SALIDA_ERROR_GUARDADO = 3
+
+# Solicitudes que se validan y persisten juntas
+TAM_LOTE = 1000
+
+
+class ErrorEntrada(Exception):
+    """Línea de entrada o argumentos inválidos."""
+
+
+def _leer_objetos(entrada: TextIO) -> Iterator[tuple[int, dict]]:
+    """Recorre las líneas JSON de la entrada (se saltan las vacías)."""
+    for numero, linea in enumerate(entrada, start=1):
+        if not linea.strip():
+            continue
+        try:
+            datos = json.loads(linea)
+        except json.JSONDecodeError as e:
+            raise ErrorEntrada(f"línea {numero}: JSON inválido ({e.msg})") from e
+        if not isinstance(datos, dict):
+            raise ErrorEntrada(f"línea {numero}: se esperaba un objeto JSON")
+        yield numero, datos
+
+
+def _leer_campos(entrada: TextIO, *campos: str) -> Iterator[tuple[str, ...]]:
+    """Extrae de cada línea JSON los campos de texto indicados."""
+    for numero, datos in _leer_objetos(entrada):
+        valores = tuple(datos.get(campo) for campo in campos)
+        if not all(isinstance(valor, str) and valor for valor in valores):
+            raise ErrorEntrada(f"línea {numero}: se requieren {', '.join(campos)}")
+        yield valores
+
+
+def _escribir(salida: TextIO, registros: Iterable[dict]) -> None:
+    """Escribe una línea JSON por registro."""
+    salida.writelines(
+        json.dumps(registro, ensure_ascii=False) + "\n" for registro in registros
+    )
+    salida.flush()
+
+
+def _codigo_resultados(resultados: list[dict]) -> int:
+    """Traduce los resultados de un lote a un código de salida."""
+    motivos = {resultado["motivo"] for resultado in resultados}
+    if MOTIVO_ERROR_GUARDADO in motivos:
+        return SALIDA_ERROR_GUARDADO
+    if motivos - {None}:
+        return SALIDA_RECHAZOS
+    return SALIDA_EXITO
+
+
+def _por_lotes(
+    solicitudes: Iterable,
+    procesar: Callable[[list], list[dict]],
+    tam_lote: int,
+    salida: TextIO,
+) -> int:
+    """Procesa las solicitudes por lotes y escribe cada resultado."""
+    codigo = SALIDA_EXITO
+    for lote in batched(solicitudes, tam_lote):
+        resultados = procesar(list(lote))
+        _escribir(salida, resultados)
+        codigo = max(codigo, _codigo_resultados(resultados))
+    return codigo
+
+
+def comando_prestar(args: argparse.Namespace, libros: Catalogo) -> int:
+    """Presta los libros indicados en los argumentos o en la entrada."""
+    if args.libro_id is not None:
+        if args.nombre_aprendiz is None:
+            raise ErrorEntrada("falta el nombre del aprendiz")
+        solicitudes = [(args.libro_id, args.nombre_aprendiz)]
+    else:
+        solicitudes = _leer_campos(args.entrada, "libro_id", "nombre_aprendiz")
+    return _por_lotes(
+        solicitudes,
+        lambda lote: prestar_libros_lote(libros, lote, args.archivo, args.diario),
+        args.lote,
+        args.salida,
+    )
+
+
+def comando_devolver(args: argparse.Namespace, libros: Catalogo) -> int:
+    """Devuelve los libros indicados en los argumentos o en la entrada."""
+    if args.libro_id is not None:
+        libro_ids = [args.libro_id]
+    else:
+        libro_ids = (campos[0] for campos in _leer_campos(args.entrada, "libro_id"))
+    return _por_lotes(
+        libro_ids,
+        lambda lote: devolver_libros_lote(libros, lote, args.archivo, args.diario),
+        args.lote,
+        args.salida,
+    )
+
+
+def comando_buscar(args: argparse.Namespace, libros: Catalogo) -> int:
+    """Escribe los libros que coinciden con la búsqueda."""
+    resultados = obtener_resultados_busqueda(
+        libros, args.texto, args.archivo, args.aproximado
+    )
+    _escribir(args.salida, (a_dict(libro) for libro in resultados))
+    return SALIDA_EXITO if resultados else SALIDA_RECHAZOS
+
+
+def comando_prestados(args: argparse.Namespace, libros: Catalogo) -> int:
+    """Escribe los libros prestados actualmente."""
+    prestados = obtener_libros_prestados(libros, args.archivo)
+    _escribir(args.salida, (a_dict(libro) for libro in prestados))
+    return SALIDA_EXITO
+
+
+def comando_importar(args: argparse.Namespace, libros: Catalogo) -> int:
+    """Importa los libros de la entrada y escribe el resumen."""
+    formato = args.formato
+    if formato is None:
+        try:
+            formato = formato_de_archivo(getattr(args.entrada, "name", ""))
+        except ValueError:
+            formato = "jsonl"
+    resumen = importar_catalogo(
+        libros, leer_filas(args.entrada, formato), args.archivo, args.diario
+    )
+    _escribir(args.salida, [resumen.a_dict()])
+    if not resumen.guardado:
+        return SALIDA_ERROR_GUARDADO
+    return SALIDA_RECHAZOS if resumen.descartadas else SALIDA_EXITO
+
+
+def comando_exportar(args: argparse.Namespace, libros: Catalogo) -> int:
+    """Escribe todos los libros del catálogo."""
+    _escribir(args.salida, (a_dict(libro) for libro in libros))
+    return SALIDA_EXITO
+
+
+def comando_respaldar(args: argparse.Namespace, libros: Catalogo | None) -> int:
+    """Hace un respaldo y escribe su descripción."""
+    try:
+        respaldo = respaldar(
+            args.archivo, args.directorio, args.completo, args.deltas_por_completo
+        )
+    except FileNotFoundError as e:
+        raise ErrorEntrada(str(e)) from e
+    except (OSError, ValueError) as e:
+        print(f"No se pudo respaldar: {e}", file=sys.stderr)
+        return SALIDA_ERROR_GUARDADO
+    _escribir(args.salida, [respaldo.a_dict()])
+    return SALIDA_EXITO
+
+
+def comando_restaurar(args: argparse.Namespace, libros: Catalogo | None) -> int:
+    """Restaura la biblioteca y escribe el último respaldo aplicado."""
+    try:
+        respaldo = restaurar(args.archivo, args.directorio, args.hasta)
+    except FileNotFoundError as e:
+        raise ErrorEntrada(str(e)) from e
+    except OSError as e:
+        print(f"No se pudo restaurar: {e}", file=sys.stderr)
+        return SALIDA_ERROR_GUARDADO
+    _escribir(args.salida, [respaldo.a_dict()])
+    return SALIDA_EXITO
+
+
+def crear_parser() -> argparse.ArgumentParser:
+    """
+    Construye el parser de argumentos con todos los subcomandos.
+
+    Returns:
+        Parser listo para ``parse_args``
+    """
+    comun = argparse.ArgumentParser(add_help=False)
+    comun.add_argument("--archivo", default=ARCHIVO_BIBLIOTECA)
+    comun.set_defaults(cargar_catalogo=True)
+    comun.add_argument(
+        "--salida",
+        type=argparse.FileType("w", encoding="utf-8"),
+        default="-",
+        help="archivo de resultados JSONL (por defecto, la salida estándar)",
+    )
+    entrada = argparse.ArgumentParser(add_help=False)
+    entrada.add_argument(
+        "--entrada",
+        type=argparse.FileType("r", encoding="utf-8"),
+        default="-",
+        help="archivo JSONL de solicitudes (por defecto, la entrada estándar)",
+    )
+    entrada.add_argument(
+        "--diario",
+        action="store_true",
+        help="registrar los cambios en el diario (varios puestos)",
+    )
+    entrada.add_argument("--lote", type=int, default=TAM_LOTE)
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    subparsers = parser.add_subparsers(dest="comando", required=True)
+
+    prestar = subparsers.add_parser(
+        "prestar", aliases=["lend"], parents=[comun, entrada], help="prestar libros"
+    )
+    prestar.add_argument("libro_id", nargs="?")
+    prestar.add_argument("nombre_aprendiz", nargs="?")
+    prestar.set_defaults(funcion=comando_prestar)
+
+    devolver = subparsers.add_parser(
+        "devolver",
+        aliases=["return"],
+        parents=[comun, entrada],
+        help="devolver libros",
+    )
+    devolver.add_argument("libro_id", nargs="?")
+    devolver.set_defaults(funcion=comando_devolver)
+
+    buscar = subparsers.add_parser(
+        "buscar", aliases=["search"], parents=[comun], help="buscar libros"
+    )
+    buscar.add_argument("texto")
+    buscar.add_argument(
+        "--aproximado", action="store_true", help="tolerar errores de escritura"
+    )
+    buscar.set_defaults(funcion=comando_buscar)
+
+    prestados = subparsers.add_parser(
+        "prestados", aliases=["list-lent"], parents=[comun], help="libros prestados"
+    )
+    prestados.set_defaults(funcion=comando_prestados)
+
+    importar = subparsers.add_parser(
+        "importar",
+        aliases=["import"],
+        parents=[comun, entrada],
+        help="agregar libros desde CSV o JSONL",
+    )
+    importar.add_argument(
+        "--formato",
+        choices=FORMATOS,
+        help="formato de la entrada (por defecto, según su extensión o jsonl)",
+    )
+    importar.set_defaults(funcion=comando_importar)
+
+    exportar = subparsers.add_parser(
+        "exportar", aliases=["export"], parents=[comun], help="exportar el catálogo"
+    )
+    exportar.set_defaults(funcion=comando_exportar)
+
+    respaldos = argparse.ArgumentParser(add_help=False)
+    respaldos.add_argument("--directorio", default=DIRECTORIO_RESPALDOS)
+    respaldos.set_defaults(cargar_catalogo=False)
+
+    respaldo = subparsers.add_parser(
+        "respaldar",
+        aliases=["backup"],
+        parents=[comun, respaldos],
+        help="respaldar los cambios desde el último respaldo",
+    )
+    respaldo.add_argument(
+        "--completo", action="store_true", help="forzar un respaldo completo"
+    )
+    respaldo.add_argument(
+        "--deltas-por-completo", type=int, default=DELTAS_POR_COMPLETO
+    )
+    respaldo.set_defaults(funcion=comando_respaldar)
+
+    restauracion = subparsers.add_parser(
+        "restaurar",
+        aliases=["restore"],
+        parents=[comun, respaldos],
+        help="restaurar la biblioteca desde los respaldos",
+    )
+    restauracion.add_argument(
+        "--hasta", type=int, help="último respaldo a aplicar (por defecto, todos)"
+    )
+    restauracion.set_defaults(funcion=comando_restaurar)
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Ejecuta el subcomando indicado en la línea de comandos.
+
+    Args:
+        argv: Argumentos (por defecto, los del proceso)
+
+    Returns:
+        Código de salida del proceso
+    """
+    args = crear_parser().parse_args(argv)
+    cerrar_salida = args.salida is not sys.stdout
+    # La carga es silenciosa (sin Rich) y los demás mensajes de la
+    # biblioteca van a la salida de errores; los resultados se escriben en
+    # ``args.salida``
+    with redirect_stdout(sys.stderr):
+        try:
+            libros = (
+                cargar_datos(args.archivo, silencioso=True)
+                if args.cargar_catalogo
+                else None
+            )
+            return args.funcion(args, libros)
+        except ErrorEntrada as e:
+            print(f"Entrada inválida: {e}", file=sys.stderr)
+            return SALIDA_ENTRADA_INVALIDA
+        finally:
+            if cerrar_salida:
+                args.salida.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
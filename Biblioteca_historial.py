@@ -0,0 +1,326 @@
+"""
+Historial de préstamos de la biblioteca.
+
+``devolver_libro`` limpia ``prestado_a`` y ``fecha_prestamo``, así que el
+libro no recuerda sus préstamos anteriores. Este módulo los conserva:
+
+- En disco, cada préstamo terminado se añade como una línea JSON al
+  archivo ``<archivo>.historial``.
+- En memoria, ``HistorialPrestamos`` guarda los préstamos por columnas
+  (libro, aprendiz, inicio y fin) en arreglos de NumPy, con los IDs
+  codificados como enteros. Las consultas de estadísticas se resuelven
+  con operaciones vectorizadas sobre esos arreglos, sin recorrer los
+  préstamos uno a uno en Python.
+"""
+
+import json
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from Biblioteca import Catalogo
+from Columnas_numpy import CAPACIDAD_INICIAL, Codificador, Columnas
+
+# Valor de la columna ``fin`` para los préstamos que siguen abiertos
+SIN_DEVOLVER = -1
+
+_SEGUNDOS_POR_DIA = 86_400
+
+
+def ruta_historial(archivo: str) -> str:
+    """
+    Retorna la ruta del historial asociado a un archivo de biblioteca.
+
+    Args:
+        archivo: Nombre del archivo de la biblioteca
+
+    Returns:
+        Ruta del archivo ``.historial``
+    """
+    return f"{archivo}.historial"
+
+
+def a_segundos(fecha: str | None, defecto: int) -> int:
+    """
+    Convierte una fecha ISO en segundos desde la época Unix.
+
+    Args:
+        fecha: Fecha en formato ISO (o None)
+        defecto: Valor a usar si no hay fecha
+
+    Returns:
+        Segundos enteros desde 1970-01-01
+    """
+    if fecha is None:
+        return defecto
+    return int(datetime.fromisoformat(fecha).timestamp())
+
+
+class HistorialPrestamos(Columnas):
+    """
+    Historial de préstamos en columnas, con consultas vectorizadas.
+
+    Cada fila es un préstamo: código del libro, código del aprendiz,
+    inicio y fin (segundos Unix; ``SIN_DEVOLVER`` si sigue abierto).
+
+    Example:
+        >>> historial = HistorialPrestamos()
+        >>> historial.registrar_prestamo("001", "Ana", "2025-01-01T10:00:00")
+        >>> historial.registrar_devolucion("001", "Ana", None, "2025-01-08T10:00:00")
+        >>> historial.duracion_promedio()
+        7.0
+    """
+
+    COLUMNAS = {
+        "libro": np.int32,
+        "aprendiz": np.int32,
+        "inicio": np.int64,
+        "fin": np.int64,
+    }
+
+    def __init__(self, capacidad: int = CAPACIDAD_INICIAL) -> None:
+        """
+        Crea un historial vacío.
+
+        Args:
+            capacidad: Filas reservadas inicialmente
+        """
+        super().__init__(capacidad)
+        self._libros = Codificador()
+        self._aprendices = Codificador()
+        self._abiertos: dict[str, int] = {}
+
+    @classmethod
+    def desde_codigos(
+        cls,
+        libro_ids: list[str],
+        aprendices: list[str],
+        columnas: dict[str, np.ndarray],
+    ) -> "HistorialPrestamos":
+        """
+        Crea un historial a partir de columnas ya codificadas.
+
+        Es la forma rápida de cargar millones de préstamos: las columnas
+        se copian tal cual, sin pasar fila por fila por Python.
+
+        Args:
+            libro_ids: ID de libro de cada código (el código es la posición)
+            aprendices: Aprendiz de cada código
+            columnas: Arreglos ``libro`` y ``aprendiz`` (códigos) e
+                ``inicio`` y ``fin`` (segundos Unix; ``SIN_DEVOLVER`` si
+                el préstamo sigue abierto)
+
+        Returns:
+            Historial con esas filas
+        """
+        filas = len(columnas["libro"])
+        historial = cls(max(CAPACIDAD_INICIAL, filas))
+        for libro_id in libro_ids:
+            historial._libros.codificar(libro_id)
+        for nombre in aprendices:
+            historial._aprendices.codificar(nombre)
+        historial._anexar(**{nombre: columnas[nombre] for nombre in cls.COLUMNAS})
+        for fila in np.flatnonzero(historial._fin[:filas] == SIN_DEVOLVER):
+            historial._abiertos[libro_ids[historial._libro[fila]]] = int(fila)
+        return historial
+
+    def _agregar_fila(self, libro_id: str, aprendiz: str, inicio: int, fin: int) -> int:
+        self._reservar(1)
+        fila = self._filas
+        self._libro[fila] = self._libros.codificar(libro_id)
+        self._aprendiz[fila] = self._aprendices.codificar(aprendiz)
+        self._inicio[fila] = inicio
+        self._fin[fila] = fin
+        self._filas += 1
+        return fila
+
+    def agregar_columnas(
+        self,
+        libro_ids: list[str],
+        aprendices: list[str],
+        inicios: np.ndarray,
+        fines: np.ndarray,
+    ) -> None:
+        """
+        Agrega muchos préstamos terminados de una vez.
+
+        Args:
+            libro_ids: ID del libro de cada préstamo
+            aprendices: Aprendiz de cada préstamo
+            inicios: Inicio de cada préstamo (segundos Unix)
+            fines: Fin de cada préstamo (segundos Unix)
+        """
+        self._anexar(
+            libro=[self._libros.codificar(i) for i in libro_ids],
+            aprendiz=[self._aprendices.codificar(a) for a in aprendices],
+            inicio=inicios,
+            fin=fines,
+        )
+
+    def registrar_prestamo(
+        self, libro_id: str, aprendiz: str, fecha_prestamo: str | None
+    ) -> None:
+        """
+        Abre un préstamo en el historial.
+
+        Args:
+            libro_id: ID del libro prestado
+            aprendiz: Persona que lo tomó prestado
+            fecha_prestamo: Fecha ISO del préstamo
+        """
+        inicio = a_segundos(fecha_prestamo, int(datetime.now().timestamp()))
+        self._abiertos[libro_id] = self._agregar_fila(
+            libro_id, aprendiz, inicio, SIN_DEVOLVER
+        )
+
+    def registrar_devolucion(
+        self,
+        libro_id: str,
+        aprendiz: str,
+        fecha_prestamo: str | None,
+        fecha_devolucion: str | None = None,
+    ) -> None:
+        """
+        Cierra el préstamo abierto de un libro.
+
+        Si el préstamo no estaba en el historial (se abrió antes de
+        cargarlo), se agrega completo.
+
+        Args:
+            libro_id: ID del libro devuelto
+            aprendiz: Persona que lo tenía prestado
+            fecha_prestamo: Fecha ISO en que se prestó
+            fecha_devolucion: Fecha ISO de la devolución (por defecto, ahora)
+        """
+        fin = a_segundos(fecha_devolucion, int(datetime.now().timestamp()))
+        fila = self._abiertos.pop(libro_id, None)
+        if fila is None:
+            self._agregar_fila(libro_id, aprendiz, a_segundos(fecha_prestamo, fin), fin)
+        else:
+            self._fin[fila] = fin
+
+    def _mas_frecuentes(
+        self, codigos: np.ndarray, valores: list[str], cantidad: int
+    ) -> list[tuple[str, int]]:
+        """Cuenta los códigos y retorna los ``cantidad`` más frecuentes."""
+        if self._filas == 0 or cantidad <= 0:
+            return []
+        conteos = np.bincount(codigos[: self._filas], minlength=len(valores))
+        cantidad = min(cantidad, len(conteos))
+        mejores = np.argpartition(conteos, -cantidad)[-cantidad:]
+        # Orden: más préstamos primero y, a igualdad, por código
+        mejores = mejores[np.lexsort((mejores, -conteos[mejores]))]
+        return [(valores[codigo], int(conteos[codigo])) for codigo in mejores]
+
+    def mas_prestados(self, cantidad: int = 10) -> list[tuple[str, int]]:
+        """
+        Obtiene los libros prestados más veces.
+
+        Args:
+            cantidad: Número de libros a retornar
+
+        Returns:
+            Pares (libro_id, número de préstamos), de mayor a menor
+        """
+        return self._mas_frecuentes(self._libro, self._libros.valores, cantidad)
+
+    def aprendices_mas_activos(self, cantidad: int = 10) -> list[tuple[str, int]]:
+        """
+        Obtiene los aprendices con más préstamos.
+
+        Args:
+            cantidad: Número de aprendices a retornar
+
+        Returns:
+            Pares (aprendiz, número de préstamos), de mayor a menor
+        """
+        return self._mas_frecuentes(self._aprendiz, self._aprendices.valores, cantidad)
+
+    def duracion_promedio(self) -> float | None:
+        """
+        Calcula la duración promedio de los préstamos ya devueltos.
+
+        Returns:
+            Días promedio por préstamo, o None si no hay devoluciones
+        """
+        fin = self._fin[: self._filas]
+        cerrados = fin != SIN_DEVOLVER
+        if not cerrados.any():
+            return None
+        duraciones = fin[cerrados] - self._inicio[: self._filas][cerrados]
+        return float(duraciones.mean()) / _SEGUNDOS_POR_DIA
+
+
+def anotar_devoluciones(archivo: str, prestamos: list[dict]) -> None:
+    """
+    Añade préstamos terminados al archivo de historial.
+
+    Todas las líneas se escriben con una sola llamada de escritura. Si el
+    historial termina en una línea incompleta (un corte a mitad de
+    escritura), se cierra antes para no mezclarla con las nuevas.
+
+    Args:
+        archivo: Nombre del archivo de la biblioteca
+        prestamos: Diccionarios con ``libro_id``, ``aprendiz``, ``inicio``
+            y ``fin`` (fechas ISO)
+    """
+    datos = "".join(
+        json.dumps(prestamo, ensure_ascii=False) + "\n" for prestamo in prestamos
+    ).encode("utf-8")
+    with open(ruta_historial(archivo), "a+b") as f:
+        tamano = f.seek(0, 2)
+        if tamano:
+            f.seek(tamano - 1)
+            if f.read(1) != b"\n":
+                datos = b"\n" + datos
+        f.write(datos)
+
+
+def cargar_historial(archivo: str, libros=None) -> HistorialPrestamos:
+    """
+    Construye el historial en memoria desde el archivo de historial.
+
+    Los préstamos todavía abiertos no están en ese archivo; se toman de
+    los libros prestados actualmente, si se indican (con un ``Catalogo``,
+    de su índice de prestados, sin recorrer todo el catálogo).
+
+    Args:
+        archivo: Nombre del archivo de la biblioteca
+        libros: Libros de la biblioteca (lista o catálogo), opcional
+
+    Returns:
+        Historial con todos los préstamos conocidos
+    """
+    libro_ids, aprendices, inicios, fines = [], [], [], []
+    ruta = Path(ruta_historial(archivo))
+    if ruta.exists():
+        with open(ruta, encoding="utf-8") as f:
+            for linea in f:
+                try:
+                    prestamo = json.loads(linea)
+                    fin = a_segundos(prestamo["fin"], 0)
+                    inicio = a_segundos(prestamo["inicio"], fin)
+                except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+                    continue
+                libro_ids.append(prestamo["libro_id"])
+                aprendices.append(prestamo["aprendiz"])
+                inicios.append(inicio)
+                fines.append(fin)
+
+    historial = HistorialPrestamos(max(CAPACIDAD_INICIAL, len(libro_ids)))
+    historial.agregar_columnas(
+        libro_ids,
+        aprendices,
+        np.array(inicios, dtype=np.int64),
+        np.array(fines, dtype=np.int64),
+    )
+    if isinstance(libros, Catalogo):
+        prestados = libros.prestados()
+    else:
+        prestados = [libro for libro in libros or [] if libro["prestado_a"] is not None]
+    for libro in prestados:
+        historial.registrar_prestamo(
+            libro["libro_id"], libro["prestado_a"], libro["fecha_prestamo"]
+        )
+    return historial
@@ -0,0 +1,291 @@
+"""
+Importación masiva del catálogo de la biblioteca desde CSV o JSONL.
+
+Los archivos se leen fila por fila (sin cargarlos completos en memoria),
+cada fila se valida con un conjunto de reglas reutilizable construido con
+``Validar_datos_genericos`` y se descartan los libros repetidos por ISBN
+o por ID, tanto frente al catálogo como dentro del mismo archivo. Los
+libros válidos se agregan al catálogo (y a sus índices) a medida que se
+leen, y la biblioteca se guarda una sola vez al final.
+
+Columnas reconocidas: ``libro_id``, ``titulo``, ``autor`` e ``isbn``; las
+demás se ignoran y los libros importados quedan disponibles.
+"""
+
+import csv
+import json
+import re
+import time
+from collections import Counter
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TextIO
+
+from Biblioteca import ARCHIVO_BIBLIOTECA, Catalogo, incorporar_libros
+from Validar_datos_genericos import (
+    es_texto_no_vacio,
+    valor_de_clave,
+)
+
+FORMATOS = ("csv", "jsonl")
+
+CAMPOS_IMPORTADOS = ("libro_id", "titulo", "autor", "isbn")
+
+# Motivos de descarte de una fila
+MOTIVO_ILEGIBLE = "fila ilegible"
+MOTIVO_ISBN_REPETIDO = "isbn repetido"
+MOTIVO_ID_REPETIDO = "ID repetido"
+
+# ISBN-13, o ISBN-10 (cuyo dígito de control puede ser X)
+_PATRON_ISBN = re.compile(r"\d{13}|\d{9}[\dX]")
+
+
+def normalizar_isbn(isbn: str) -> str:
+    """
+    Quita guiones y espacios de un ISBN para compararlo.
+
+    Args:
+        isbn: ISBN tal como viene en el archivo
+
+    Returns:
+        ISBN solo con dígitos (y la ``X`` final de un ISBN-10)
+
+    Example:
+        >>> normalizar_isbn("978-0307 474728")
+        '9780307474728'
+    """
+    return re.sub(r"[\s-]", "", isbn).upper()
+
+
+def es_isbn_valido(isbn: str) -> bool:
+    """
+    Valida la forma de un ISBN-10 o ISBN-13 (sin dígito de control).
+
+    Args:
+        isbn: ISBN a validar (puede tener guiones o espacios)
+
+    Returns:
+        True si tiene 10 o 13 dígitos (un ISBN-10 puede terminar en X)
+    """
+    if not isinstance(isbn, str):
+        return False
+    return _PATRON_ISBN.fullmatch(normalizar_isbn(isbn)) is not None
+
+
+def _opcional(clave: str, validador: Callable) -> Callable[[dict], bool]:
+    """Valida el valor de ``clave`` solo si la fila lo trae."""
+
+    def validador_opcional(fila: dict) -> bool:
+        return clave not in fila or validador(fila[clave])
+
+    return validador_opcional
+
+
+# Reglas de una fila de libro: (motivo de descarte, validador)
+REGLAS_LIBRO: list[tuple[str, Callable[[dict], bool]]] = [
+    ("falta libro_id", valor_de_clave("libro_id", es_texto_no_vacio)),
+    ("falta titulo", valor_de_clave("titulo", es_texto_no_vacio)),
+    ("autor vacío", _opcional("autor", es_texto_no_vacio)),
+    ("isbn inválido", _opcional("isbn", es_isbn_valido)),
+]
+
+
+def validar_libro(
+    fila: dict, reglas: list[tuple[str, Callable[[dict], bool]]] = REGLAS_LIBRO
+) -> str | None:
+    """
+    Valida una fila de libro contra un conjunto de reglas.
+
+    Args:
+        fila: Fila ya normalizada
+        reglas: Pares (motivo, validador); por defecto ``REGLAS_LIBRO``
+
+    Returns:
+        Motivo de la primera regla que no se cumple, o None si es válida
+    """
+    for motivo, validador in reglas:
+        if not validador(fila):
+            return motivo
+    return None
+
+
+def _normalizar_fila(fila: dict) -> dict:
+    """Conserva los campos del catálogo, sin espacios y sin valores vacíos."""
+    libro = {}
+    for clave in CAMPOS_IMPORTADOS:
+        valor = fila.get(clave)
+        if isinstance(valor, str):
+            valor = valor.strip()
+        if valor not in (None, ""):
+            libro[clave] = valor
+    return libro
+
+
+def formato_de_archivo(ruta: str) -> str:
+    """
+    Deduce el formato de importación por la extensión del archivo.
+
+    Args:
+        ruta: Ruta del archivo a importar
+
+    Returns:
+        ``"csv"`` o ``"jsonl"``
+
+    Raises:
+        ValueError: Si la extensión no corresponde a un formato conocido
+    """
+    extension = Path(ruta).suffix.lower()
+    if extension == ".csv":
+        return "csv"
+    if extension in (".jsonl", ".ndjson"):
+        return "jsonl"
+    raise ValueError(f"Formato no reconocido para '{ruta}' (use .csv o .jsonl)")
+
+
+def leer_filas(entrada: TextIO, formato: str) -> Iterator[dict | None]:
+    """
+    Recorre las filas de un archivo CSV (con encabezado) o JSONL.
+
+    Args:
+        entrada: Archivo de texto abierto
+        formato: ``"csv"`` o ``"jsonl"``
+
+    Yields:
+        Cada fila como diccionario normalizado, o None si no se pudo leer
+
+    Raises:
+        ValueError: Si el formato no es uno de ``FORMATOS``
+    """
+    if formato == "csv":
+        for fila in csv.DictReader(entrada):
+            yield _normalizar_fila(fila)
+    elif formato == "jsonl":
+        for linea in entrada:
+            if not linea.strip():
+                continue
+            try:
+                fila = json.loads(linea)
+            except json.JSONDecodeError:
+                yield None
+                continue
+            yield _normalizar_fila(fila) if isinstance(fila, dict) else None
+    else:
+        raise ValueError(f"Formato desconocido: '{formato}' (use {FORMATOS})")
+
+
+@dataclass
+class ResumenImportacion:
+    """Resultado de una importación: filas leídas, importadas y descartadas."""
+
+    leidas: int = 0
+    importadas: int = 0
+    descartadas: Counter = field(default_factory=Counter)
+    segundos: float = 0.0
+    guardado: bool = True
+
+    @property
+    def filas_por_segundo(self) -> float:
+        """Filas leídas por segundo durante toda la importación."""
+        return self.leidas / self.segundos if self.segundos else 0.0
+
+    def a_dict(self) -> dict:
+        """
+        Convierte el resumen a un diccionario serializable en JSON.
+
+        Returns:
+            Diccionario con los contadores y el rendimiento
+        """
+        return {
+            "leidas": self.leidas,
+            "importadas": self.importadas,
+            "descartadas": dict(self.descartadas),
+            "guardado": self.guardado,
+            "segundos": round(self.segundos, 3),
+            "filas_por_segundo": round(self.filas_por_segundo, 1),
+        }
+
+
+def importar_catalogo(
+    libros: list[dict] | Catalogo,
+    filas: Iterable[dict | None],
+    archivo: str = ARCHIVO_BIBLIOTECA,
+    diario: bool = False,
+) -> ResumenImportacion:
+    """
+    Valida, deduplica y agrega filas al catálogo, guardando una sola vez.
+
+    Args:
+        libros: Lista de libros o catálogo de la biblioteca
+        filas: Filas a importar (por ejemplo, de ``leer_filas``)
+        archivo: Nombre del archivo para persistir los cambios
+        diario: Si es True, se coordina con los demás puestos
+
+    Returns:
+        Resumen con los contadores y el rendimiento de la importación
+    """
+    resumen = ResumenImportacion()
+    inicio = time.perf_counter()
+
+    def aceptadas() -> Iterator[dict]:
+        # Se ejecuta ya dentro de la sesión de ``incorporar_libros``, con
+        # el catálogo sincronizado
+        ids = {libro["libro_id"] for libro in libros}
+        isbns = {
+            normalizar_isbn(libro["isbn"]) for libro in libros if libro.get("isbn")
+        }
+        for fila in filas:
+            resumen.leidas += 1
+            motivo = MOTIVO_ILEGIBLE if fila is None else validar_libro(fila)
+            if motivo is None and fila["libro_id"] in ids:
+                motivo = MOTIVO_ID_REPETIDO
+            isbn = (
+                normalizar_isbn(fila["isbn"])
+                if motivo is None and "isbn" in fila
+                else None
+            )
+            if isbn in isbns:
+                motivo = MOTIVO_ISBN_REPETIDO
+            if motivo is not None:
+                resumen.descartadas[motivo] += 1
+                continue
+            ids.add(fila["libro_id"])
+            if isbn is not None:
+                isbns.add(isbn)
+            yield fila
+
+    agregados = incorporar_libros(libros, aceptadas(), archivo, diario)
+    resumen.guardado = agregados is not None
+    resumen.importadas = agregados or 0
+    resumen.segundos = time.perf_counter() - inicio
+    return resumen
+
+
+def importar_archivo(
+    libros: list[dict] | Catalogo,
+    ruta: str,
+    archivo: str = ARCHIVO_BIBLIOTECA,
+    formato: str | None = None,
+    diario: bool = False,
+) -> ResumenImportacion:
+    """
+    Importa al catálogo un archivo CSV o JSONL.
+
+    Args:
+        libros: Lista de libros o catálogo de la biblioteca
+        ruta: Archivo a importar
+        archivo: Nombre del archivo de la biblioteca
+        formato: ``"csv"`` o ``"jsonl"`` (por defecto, según la extensión)
+        diario: Si es True, se coordina con los demás puestos
+
+    Returns:
+        Resumen de la importación
+
+    Example:
+        >>> resumen = importar_archivo(catalogo, "catalogo.csv")
+        >>> resumen.importadas, resumen.filas_por_segundo
+        (1000000, 58000.0)
+    """
+    formato = formato or formato_de_archivo(ruta)
+    with open(ruta, encoding="utf-8", newline="") as entrada:
+        return importar_catalogo(libros, leer_filas(entrada, formato), archivo, diario)
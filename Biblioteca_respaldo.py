@@ -0,0 +1,308 @@
+"""
+Respaldos incrementales del catálogo de la biblioteca.
+
+Copiar ``biblioteca.json`` completo cada hora es un desperdicio cuando
+solo cambiaron unos pocos préstamos. Este módulo guarda en un directorio
+dos tipos de respaldo, numerados y comprimidos con gzip:
+
+- completo: todos los libros, una línea JSON por libro;
+- delta: solo los libros agregados o modificados desde el respaldo
+  anterior, según el registro de cambios ``<archivo>.cambios`` que
+  mantiene ``Biblioteca.anotar_cambios``.
+
+Cada línea guarda el estado completo del libro (no la operación), así que
+restaurar es leer el último respaldo completo y reaplicar en orden los
+deltas siguientes, reemplazando cada libro por su ID. El catálogo no
+permite borrar libros, por eso los deltas no registran bajas.
+
+Uso (por ejemplo, cada hora desde cron):
+    python Biblioteca_cli.py respaldar --directorio respaldos
+    python Biblioteca_cli.py restaurar --directorio respaldos
+"""
+
+import gzip
+import json
+import os
+import re
+import shutil
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import batched
+from pathlib import Path
+
+import Bloqueo_archivo
+from Biblioteca import (
+    ARCHIVO_BIBLIOTECA,
+    Libro,
+    a_dict,
+    guardar_datos,
+    iterar_libros_vigentes,
+    ruta_cambios,
+)
+
+DIRECTORIO_RESPALDOS = "respaldos"
+
+# Deltas seguidos tras los cuales el siguiente respaldo es completo
+# (con respaldos cada hora, uno completo por día)
+DELTAS_POR_COMPLETO = 24
+
+TIPO_COMPLETO = "completo"
+TIPO_DELTA = "delta"
+
+# Nivel de gzip: el 9 apenas reduce más y es bastante más lento
+NIVEL_COMPRESION = 6
+
+# Libros que se comprimen juntos en cada escritura
+TAM_LOTE_ESCRITURA = 1000
+
+_PATRON_RESPALDO = re.compile(r"(\d{6})-(completo|delta)-\d{8}T\d{6}\.jsonl\.gz")
+
+
+@dataclass(frozen=True)
+class Respaldo:
+    """Un archivo del directorio de respaldos."""
+
+    numero: int
+    tipo: str
+    ruta: Path
+    libros: int | None = None
+
+    def a_dict(self) -> dict:
+        """
+        Convierte el respaldo a un diccionario serializable en JSON.
+
+        Returns:
+            Diccionario con el número, el tipo, la ruta y los libros
+        """
+        return {
+            "numero": self.numero,
+            "tipo": self.tipo,
+            "ruta": str(self.ruta),
+            "libros": self.libros,
+        }
+
+
+def listar_respaldos(directorio: str | Path = DIRECTORIO_RESPALDOS) -> list[Respaldo]:
+    """
+    Lista los respaldos de un directorio en orden.
+
+    Args:
+        directorio: Directorio de respaldos
+
+    Returns:
+        Respaldos ordenados por número (vacío si el directorio no existe)
+    """
+    carpeta = Path(directorio)
+    if not carpeta.is_dir():
+        return []
+    respaldos = []
+    for ruta in carpeta.iterdir():
+        coincidencia = _PATRON_RESPALDO.fullmatch(ruta.name)
+        if coincidencia:
+            numero, tipo = coincidencia.groups()
+            respaldos.append(Respaldo(int(numero), tipo, ruta))
+    return sorted(respaldos, key=lambda respaldo: respaldo.numero)
+
+
+def _ruta_pendientes(archivo: str) -> Path:
+    """Cambios ya retirados del registro pero aún no respaldados."""
+    return Path(f"{ruta_cambios(archivo)}.pendientes")
+
+
+def _tomar_cambios(archivo: str) -> set[str] | None:
+    """
+    Retira los cambios anotados y deja el registro vacío y activo.
+
+    Los cambios retirados se acumulan en un archivo de pendientes que
+    solo se borra cuando el respaldo quedó escrito, así un respaldo
+    fallido no los pierde. El bloqueo exclusivo evita que otro puesto
+    anote justo mientras se retira el registro.
+
+    Returns:
+        IDs de los libros modificados, o None si no había registro (no
+        hay un respaldo anterior con el que comparar)
+    """
+    cambios = Path(ruta_cambios(archivo))
+    pendientes = _ruta_pendientes(archivo)
+    with Bloqueo_archivo.bloquear(archivo):
+        activo = cambios.exists()
+        if activo:
+            with open(cambios, "rb") as origen, open(pendientes, "ab") as destino:
+                shutil.copyfileobj(origen, destino)
+        cambios.write_bytes(b"")
+    if not activo:
+        return None
+
+    libro_ids = set()
+    with open(pendientes, "rb") as f:
+        for linea in f:
+            try:
+                libro_ids.add(json.loads(linea))
+            except json.JSONDecodeError:
+                # Línea incompleta por un corte: ese libro también habrá
+                # quedado en el respaldo completo siguiente
+                continue
+    return libro_ids
+
+
+def _deltas_desde_completo(respaldos: list[Respaldo]) -> int | None:
+    """Deltas posteriores al último completo (None si no hay completo)."""
+    for deltas, respaldo in enumerate(reversed(respaldos)):
+        if respaldo.tipo == TIPO_COMPLETO:
+            return deltas
+    return None
+
+
+def _escribir_respaldo(ruta: Path, libros: Iterable[dict | Libro]) -> int:
+    """Escribe los libros comprimidos de forma atómica; retorna cuántos."""
+    temporal = ruta.with_name(f".{ruta.name}.tmp")
+    cantidad = 0
+    try:
+        with gzip.open(
+            temporal, "wt", encoding="utf-8", compresslevel=NIVEL_COMPRESION
+        ) as f:
+            for lote in batched(libros, TAM_LOTE_ESCRITURA):
+                f.write(
+                    "".join(
+                        json.dumps(a_dict(libro), ensure_ascii=False) + "\n"
+                        for libro in lote
+                    )
+                )
+                cantidad += len(lote)
+        with open(temporal, "rb") as f:
+            os.fsync(f.fileno())
+        os.replace(temporal, ruta)
+    except BaseException:
+        temporal.unlink(missing_ok=True)
+        raise
+    return cantidad
+
+
+def leer_respaldo(ruta: str | Path) -> Iterator[dict]:
+    """
+    Recorre los libros guardados en un archivo de respaldo.
+
+    Args:
+        ruta: Archivo ``.jsonl.gz`` de respaldo
+
+    Yields:
+        Diccionario de cada libro, en el orden en que se guardó
+    """
+    with gzip.open(ruta, "rt", encoding="utf-8") as f:
+        for linea in f:
+            yield json.loads(linea)
+
+
+def respaldar(
+    archivo: str = ARCHIVO_BIBLIOTECA,
+    directorio: str | Path = DIRECTORIO_RESPALDOS,
+    completo: bool = False,
+    deltas_por_completo: int = DELTAS_POR_COMPLETO,
+) -> Respaldo:
+    """
+    Hace un respaldo del catálogo, completo o incremental.
+
+    Es incremental (delta) salvo que se pida ``completo``, que no haya
+    un respaldo completo previo o registro de cambios activo, o que ya
+    haya ``deltas_por_completo`` deltas desde el último completo.
+
+    Args:
+        archivo: Nombre del archivo de la biblioteca
+        directorio: Directorio de respaldos (se crea si no existe)
+        completo: Si es True, fuerza un respaldo completo
+        deltas_por_completo: Deltas seguidos antes de forzar uno completo
+
+    Returns:
+        El respaldo escrito, con la cantidad de libros que contiene
+
+    Raises:
+        FileNotFoundError: Si el archivo de la biblioteca no existe
+        ValueError: Si el archivo de la biblioteca no es JSON válido
+        OSError: Si no se pudo escribir el respaldo
+    """
+    if not Path(archivo).exists():
+        raise FileNotFoundError(f"No existe el archivo '{archivo}'")
+    carpeta = Path(directorio)
+    carpeta.mkdir(parents=True, exist_ok=True)
+    anteriores = listar_respaldos(carpeta)
+    modificados = _tomar_cambios(archivo)
+
+    deltas_seguidos = _deltas_desde_completo(anteriores)
+    if (
+        completo
+        or modificados is None
+        or deltas_seguidos is None
+        or deltas_seguidos >= deltas_por_completo
+    ):
+        tipo = TIPO_COMPLETO
+    else:
+        tipo = TIPO_DELTA
+
+    # Se lee después de retirar los cambios, así el estado leído incluye
+    # al menos todos los que se van a respaldar. No hace falta construir
+    # el catálogo con sus índices: basta recorrer el archivo
+    libros = iterar_libros_vigentes(archivo)
+    if tipo == TIPO_DELTA:
+        libros = (libro for libro in libros if libro["libro_id"] in modificados)
+
+    numero = anteriores[-1].numero + 1 if anteriores else 1
+    fecha = datetime.now().strftime("%Y%m%dT%H%M%S")
+    ruta = carpeta / f"{numero:06d}-{tipo}-{fecha}.jsonl.gz"
+    cantidad = _escribir_respaldo(ruta, libros)
+    _ruta_pendientes(archivo).unlink(missing_ok=True)
+    return Respaldo(numero, tipo, ruta, cantidad)
+
+
+def restaurar(
+    archivo: str = ARCHIVO_BIBLIOTECA,
+    directorio: str | Path = DIRECTORIO_RESPALDOS,
+    hasta: int | None = None,
+) -> Respaldo:
+    """
+    Restaura la biblioteca desde sus respaldos.
+
+    Lee el último respaldo completo (hasta el número ``hasta``) y le
+    aplica en orden los deltas posteriores. El resultado reemplaza al
+    archivo de la biblioteca y a su diario; el registro de cambios se
+    borra, así el siguiente respaldo es completo.
+
+    Args:
+        archivo: Nombre del archivo de la biblioteca a reemplazar
+        directorio: Directorio de respaldos
+        hasta: Último respaldo a aplicar (por defecto, el más reciente)
+
+    Returns:
+        El último respaldo aplicado, con la cantidad de libros restaurados
+
+    Raises:
+        FileNotFoundError: Si no hay un respaldo completo que restaurar
+        OSError: Si no se pudo guardar la biblioteca restaurada
+    """
+    respaldos = [
+        respaldo
+        for respaldo in listar_respaldos(directorio)
+        if hasta is None or respaldo.numero <= hasta
+    ]
+    completos = [
+        posicion
+        for posicion, respaldo in enumerate(respaldos)
+        if respaldo.tipo == TIPO_COMPLETO
+    ]
+    if not completos:
+        raise FileNotFoundError(f"No hay un respaldo completo en '{directorio}'")
+
+    # Reemplazar por ID conserva el orden del respaldo completo y deja
+    # los libros nuevos de cada delta al final
+    libros: dict[str, dict] = {}
+    for respaldo in respaldos[completos[-1] :]:
+        for libro in leer_respaldo(respaldo.ruta):
+            libros[libro["libro_id"]] = libro
+
+    with Bloqueo_archivo.bloquear(archivo):
+        if not guardar_datos(list(libros.values()), archivo):
+            raise OSError(f"No se pudo guardar '{archivo}'")
+        Path(ruta_cambios(archivo)).unlink(missing_ok=True)
+        _ruta_pendientes(archivo).unlink(missing_ok=True)
+    ultimo = respaldos[-1]
+    return Respaldo(ultimo.numero, ultimo.tipo, ultimo.ruta, len(libros))
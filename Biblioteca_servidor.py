@@ -0,0 +1,500 @@
+"""
+Servicio HTTP/JSON asíncrono para el sistema de biblioteca.
+
+Permite que varios quioscos usen un único proceso compartido en lugar de
+ejecutar cada uno la consola de Rich. Está hecho solo con ``asyncio`` de
+la biblioteca estándar (HTTP/1.1 con conexiones persistentes).
+
+Rutas:
+    POST /prestar     {"libro_id": "001", "nombre_aprendiz": "Ana"}
+    POST /devolver    {"libro_id": "001"}
+    GET  /buscar?q=texto
+    GET  /prestados
+
+Las consultas se responden desde el catálogo en memoria (o la base).
+Los préstamos y devoluciones se encolan y una única tarea escritora los
+agrupa en lotes (``prestar_libros_lote`` / ``devolver_libros_lote``), de
+modo que cada lote se valida y persiste una sola vez y nunca hay dos
+escrituras a la vez. Todo acceso al catálogo, lotes y consultas, pasa
+por un único hilo dedicado: escribir y sincronizar el archivo bloquea, así
+el bucle de eventos sigue atendiendo las demás conexiones mientras tanto,
+y una consulta nunca ve el catálogo a mitad de un lote (ni un lote que
+luego se deshace por no poder guardarse). Como la conexión SQLite solo
+sirve en el hilo que la abrió, ese hilo abre la suya.
+
+Uso:
+    python Biblioteca_servidor.py [--archivo biblioteca.json] [--puerto 8080]
+"""
+
+import argparse
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from itertools import groupby
+from operator import itemgetter
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+import Biblioteca_sqlite
+from Biblioteca import (
+    ARCHIVO_BIBLIOTECA,
+    MOTIVO_ERROR_GUARDADO,
+    MOTIVO_NO_ENCONTRADO,
+    Catalogo,
+    a_dict,
+    cargar_datos,
+    console,
+    devolver_libros_lote,
+    obtener_libros_prestados,
+    obtener_resultados_busqueda,
+    prestar_libros_lote,
+)
+
+# Máximo de operaciones que la tarea escritora agrupa en un lote
+MAX_LOTE = 256
+
+# Tamaño máximo aceptado para el cuerpo de una petición
+MAX_CUERPO = 64 * 1024
+
+
+class ErrorPeticion(Exception):
+    """Petición HTTP inválida; se responde con ``estado``."""
+
+    def __init__(self, estado: int, mensaje: str) -> None:
+        super().__init__(mensaje)
+        self.estado = estado
+
+
+def _estado_resultado(resultado: dict) -> HTTPStatus:
+    """Traduce el resultado de una operación de lote a un código HTTP."""
+    if resultado["exito"]:
+        return HTTPStatus.OK
+    if resultado["motivo"] == MOTIVO_NO_ENCONTRADO:
+        return HTTPStatus.NOT_FOUND
+    if resultado["motivo"] == MOTIVO_ERROR_GUARDADO:
+        return HTTPStatus.INTERNAL_SERVER_ERROR
+    return HTTPStatus.CONFLICT
+
+
+def _codificar_respuesta(estado: int, cuerpo: dict, mantener: bool) -> bytes:
+    """Arma una respuesta HTTP/1.1 con cuerpo JSON."""
+    datos = json.dumps(cuerpo, ensure_ascii=False).encode("utf-8")
+    cabeceras = (
+        f"HTTP/1.1 {estado} {HTTPStatus(estado).phrase}\r\n"
+        "Content-Type: application/json; charset=utf-8\r\n"
+        f"Content-Length: {len(datos)}\r\n"
+        f"Connection: {'keep-alive' if mantener else 'close'}\r\n"
+        "\r\n"
+    )
+    return cabeceras.encode("ascii") + datos
+
+
+async def _leer_peticion(
+    lector: asyncio.StreamReader,
+) -> tuple[str, str, dict[str, str], bytes] | None:
+    """
+    Lee una petición HTTP del flujo.
+
+    Returns:
+        Tupla (método, destino, cabeceras, cuerpo), o None si el cliente
+        cerró la conexión
+    """
+    try:
+        encabezado = await lector.readuntil(b"\r\n\r\n")
+    except asyncio.IncompleteReadError:
+        return None
+    except asyncio.LimitOverrunError as e:
+        raise ErrorPeticion(
+            HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "cabeceras demasiado grandes"
+        ) from e
+
+    linea, *lineas = encabezado.decode("latin-1").split("\r\n")
+    try:
+        metodo, destino, _ = linea.split(" ", 2)
+    except ValueError as e:
+        raise ErrorPeticion(HTTPStatus.BAD_REQUEST, "línea de petición inválida") from e
+
+    cabeceras = {}
+    for cabecera in lineas:
+        if cabecera:
+            nombre, _, valor = cabecera.partition(":")
+            cabeceras[nombre.strip().lower()] = valor.strip()
+
+    try:
+        longitud = int(cabeceras.get("content-length", "0"))
+    except ValueError as e:
+        raise ErrorPeticion(HTTPStatus.BAD_REQUEST, "Content-Length inválido") from e
+    if longitud > MAX_CUERPO:
+        raise ErrorPeticion(
+            HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "cuerpo demasiado grande"
+        )
+    cuerpo = await lector.readexactly(longitud) if longitud else b""
+    return metodo.upper(), destino, cabeceras, cuerpo
+
+
+def _leer_json(cuerpo: bytes, *campos: str) -> dict:
+    """Decodifica el cuerpo JSON y comprueba que tenga los campos indicados."""
+    try:
+        datos = json.loads(cuerpo or b"{}")
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        raise ErrorPeticion(
+            HTTPStatus.BAD_REQUEST, "el cuerpo no es JSON válido"
+        ) from e
+    if not isinstance(datos, dict):
+        raise ErrorPeticion(HTTPStatus.BAD_REQUEST, "se esperaba un objeto JSON")
+    for campo in campos:
+        if not isinstance(datos.get(campo), str) or not datos[campo].strip():
+            raise ErrorPeticion(HTTPStatus.BAD_REQUEST, f"falta el campo '{campo}'")
+    return datos
+
+
+class ServidorBiblioteca:
+    """
+    Servidor HTTP asíncrono sobre un catálogo compartido.
+
+    Example:
+        >>> servidor = ServidorBiblioteca(cargar_datos("biblioteca.json"))
+        >>> puerto = await servidor.iniciar(puerto=0)
+        >>> ...
+        >>> await servidor.cerrar()
+    """
+
+    def __init__(
+        self,
+        libros: list[dict] | Catalogo,
+        archivo: str = ARCHIVO_BIBLIOTECA,
+        diario: bool = True,
+        max_lote: int = MAX_LOTE,
+    ) -> None:
+        """
+        Prepara el servidor (no abre el puerto hasta ``iniciar``).
+
+        Args:
+            libros: Lista de libros o catálogo de la biblioteca
+            archivo: Archivo donde persistir los cambios
+            diario: Si es True, cada lote se añade al diario en lugar de
+                reescribir el archivo completo
+            max_lote: Máximo de operaciones por lote de escritura
+        """
+        self.libros = libros
+        self.archivo = archivo
+        self.diario = diario
+        self.max_lote = max_lote
+        self.lotes = 0
+        self.operaciones = 0
+        self._cola: asyncio.Queue | None = None
+        self._escritor: asyncio.Task | None = None
+        self._servidor: asyncio.Server | None = None
+        self._hilo: ThreadPoolExecutor | None = None
+
+    async def iniciar(self, host: str = "127.0.0.1", puerto: int = 8080) -> int:
+        """
+        Abre el puerto y arranca la tarea escritora.
+
+        Args:
+            host: Dirección donde escuchar
+            puerto: Puerto donde escuchar (0 elige uno libre)
+
+        Returns:
+            Puerto en el que quedó escuchando
+        """
+        self._hilo = ThreadPoolExecutor(max_workers=1, thread_name_prefix="biblioteca")
+        if Biblioteca_sqlite.es_archivo_sqlite(self.archivo):
+            # La abrió otro hilo (al cargar): el hilo del catálogo abre la suya
+            Biblioteca_sqlite.cerrar(self.archivo)
+        self._cola = asyncio.Queue()
+        self._escritor = asyncio.create_task(self._escribir_lotes())
+        self._servidor = await asyncio.start_server(self._atender, host, puerto)
+        return self._servidor.sockets[0].getsockname()[1]
+
+    async def cerrar(self) -> None:
+        """Deja de aceptar conexiones y termina los lotes pendientes."""
+        if self._servidor is not None:
+            self._servidor.close()
+            self._servidor.close_clients()
+            await self._servidor.wait_closed()
+        if self._escritor is not None:
+            await self._cola.join()
+            self._escritor.cancel()
+            try:
+                await self._escritor
+            except asyncio.CancelledError:
+                pass
+        if self._hilo is not None:
+            if Biblioteca_sqlite.es_archivo_sqlite(self.archivo):
+                await self._en_hilo(Biblioteca_sqlite.cerrar, self.archivo)
+            self._hilo.shutdown()
+            self._hilo = None
+
+    async def _en_hilo(self, funcion, *args):
+        """Ejecuta ``funcion(*args)`` en el hilo del catálogo y espera el resultado."""
+        return await asyncio.get_running_loop().run_in_executor(
+            self._hilo, funcion, *args
+        )
+
+    async def _encolar(self, prestar: bool, libro_id: str, nombre: str | None) -> dict:
+        """Encola una operación de escritura y espera su resultado."""
+        futuro = asyncio.get_running_loop().create_future()
+        await self._cola.put((prestar, libro_id, nombre, futuro))
+        return await futuro
+
+    def _aplicar_tramo(self, tramo: list[tuple]) -> list[dict]:
+        """
+        Aplica como un solo lote operaciones consecutivas del mismo tipo.
+
+        Se ejecuta en el hilo del catálogo; solo lo llama la tarea
+        escritora, de a un tramo por vez, así las modificaciones del
+        catálogo nunca se superponen.
+        """
+        if tramo[0][0]:
+            prestamos = [(libro_id, nombre) for _, libro_id, nombre, _ in tramo]
+            return prestar_libros_lote(
+                self.libros, prestamos, self.archivo, self.diario
+            )
+        libro_ids = [libro_id for _, libro_id, _, _ in tramo]
+        return devolver_libros_lote(self.libros, libro_ids, self.archivo, self.diario)
+
+    def _consultar(self, ruta: str, query: str) -> list[dict]:
+        """Resuelve una consulta en el hilo del catálogo, ya como diccionarios."""
+        if ruta == "/buscar":
+            libros = obtener_resultados_busqueda(self.libros, query, self.archivo)
+        else:
+            libros = obtener_libros_prestados(self.libros, self.archivo)
+        return [a_dict(libro) for libro in libros]
+
+    async def _escribir_lotes(self) -> None:
+        """
+        Tarea escritora única: agrupa las operaciones encoladas en lotes.
+
+        Se toma todo lo que haya en la cola (hasta ``max_lote``) y se
+        divide en tramos consecutivos de préstamos o devoluciones, para
+        respetar el orden de llegada.
+        """
+        while True:
+            pendientes = [await self._cola.get()]
+            while len(pendientes) < self.max_lote and not self._cola.empty():
+                pendientes.append(self._cola.get_nowait())
+
+            try:
+                for _, grupo in groupby(pendientes, key=itemgetter(0)):
+                    tramo = list(grupo)
+                    resultados = await self._en_hilo(self._aplicar_tramo, tramo)
+                    self.lotes += 1
+                    self.operaciones += len(tramo)
+                    for (*_, futuro), resultado in zip(tramo, resultados):
+                        if not futuro.done():
+                            futuro.set_result(resultado)
+            except Exception as e:
+                for *_, futuro in pendientes:
+                    if not futuro.done():
+                        futuro.set_exception(e)
+            finally:
+                for _ in pendientes:
+                    self._cola.task_done()
+
+    async def _despachar(self, metodo: str, destino: str, cuerpo: bytes):
+        """Ejecuta la ruta pedida y retorna (estado, cuerpo de respuesta)."""
+        partes = urlsplit(destino)
+        rutas = {
+            "/prestar": "POST",
+            "/devolver": "POST",
+            "/buscar": "GET",
+            "/prestados": "GET",
+        }
+        if partes.path not in rutas:
+            raise ErrorPeticion(
+                HTTPStatus.NOT_FOUND, f"ruta desconocida: {partes.path}"
+            )
+        if metodo != rutas[partes.path]:
+            raise ErrorPeticion(
+                HTTPStatus.METHOD_NOT_ALLOWED,
+                f"use {rutas[partes.path]} en {partes.path}",
+            )
+
+        if partes.path == "/prestar":
+            datos = _leer_json(cuerpo, "libro_id", "nombre_aprendiz")
+            resultado = await self._encolar(
+                True, datos["libro_id"], datos["nombre_aprendiz"]
+            )
+            return _estado_resultado(resultado), resultado
+        if partes.path == "/devolver":
+            datos = _leer_json(cuerpo, "libro_id")
+            resultado = await self._encolar(False, datos["libro_id"], None)
+            return _estado_resultado(resultado), resultado
+        query = parse_qs(partes.query).get("q", [""])[0]
+        libros = await self._en_hilo(self._consultar, partes.path, query)
+        return HTTPStatus.OK, {"libros": libros}
+
+    async def _atender(
+        self, lector: asyncio.StreamReader, escritor: asyncio.StreamWriter
+    ) -> None:
+        """Atiende todas las peticiones de una conexión."""
+        try:
+            while True:
+                mantener = False
+                try:
+                    peticion = await _leer_peticion(lector)
+                    if peticion is None:
+                        break
+                    metodo, destino, cabeceras, cuerpo = peticion
+                    mantener = cabeceras.get("connection", "").lower() != "close"
+                    estado, respuesta = await self._despachar(metodo, destino, cuerpo)
+                except ErrorPeticion as e:
+                    estado, respuesta = e.estado, {"error": str(e)}
+                except Exception as e:
+                    estado, respuesta = (
+                        HTTPStatus.INTERNAL_SERVER_ERROR,
+                        {"error": str(e)},
+                    )
+
+                escritor.write(_codificar_respuesta(estado, respuesta, mantener))
+                await escritor.drain()
+                if not mantener:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            escritor.close()
+            try:
+                await escritor.wait_closed()
+            except ConnectionError:
+                pass
+
+
+class ClienteBiblioteca:
+    """
+    Cliente HTTP mínimo para el servidor, con conexión persistente.
+
+    Pensado para pruebas y benchmarks locales.
+
+    Example:
+        >>> async with ClienteBiblioteca(puerto) as cliente:
+        ...     estado, datos = await cliente.prestar("001", "Ana")
+    """
+
+    def __init__(self, puerto: int, host: str = "127.0.0.1") -> None:
+        """
+        Prepara el cliente (la conexión se abre al primer uso).
+
+        Args:
+            puerto: Puerto del servidor
+            host: Dirección del servidor
+        """
+        self.host = host
+        self.puerto = puerto
+        self._lector: asyncio.StreamReader | None = None
+        self._escritor: asyncio.StreamWriter | None = None
+
+    async def __aenter__(self) -> "ClienteBiblioteca":
+        return self
+
+    async def __aexit__(self, *excepcion) -> None:
+        await self.cerrar()
+
+    async def cerrar(self) -> None:
+        """Cierra la conexión con el servidor."""
+        if self._escritor is not None:
+            self._escritor.close()
+            await self._escritor.wait_closed()
+            self._escritor = None
+
+    async def solicitar(
+        self, metodo: str, destino: str, cuerpo: dict | None = None
+    ) -> tuple[int, dict]:
+        """
+        Envía una petición y espera su respuesta.
+
+        Args:
+            metodo: Método HTTP (``GET`` o ``POST``)
+            destino: Ruta con su query string
+            cuerpo: Objeto a enviar como JSON
+
+        Returns:
+            Tupla (código de estado, cuerpo JSON decodificado)
+        """
+        if self._escritor is None:
+            self._lector, self._escritor = await asyncio.open_connection(
+                self.host, self.puerto
+            )
+        datos = json.dumps(cuerpo).encode("utf-8") if cuerpo is not None else b""
+        self._escritor.write(
+            f"{metodo} {destino} HTTP/1.1\r\n"
+            f"Host: {self.host}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(datos)}\r\n"
+            "\r\n".encode("ascii")
+            + datos
+        )
+        await self._escritor.drain()
+
+        encabezado = await self._lector.readuntil(b"\r\n\r\n")
+        linea, *lineas = encabezado.decode("latin-1").split("\r\n")
+        estado = int(linea.split(" ", 2)[1])
+        longitud = 0
+        for cabecera in lineas:
+            nombre, _, valor = cabecera.partition(":")
+            if nombre.strip().lower() == "content-length":
+                longitud = int(valor)
+        respuesta = await self._lector.readexactly(longitud)
+        return estado, json.loads(respuesta)
+
+    async def prestar(self, libro_id: str, nombre_aprendiz: str) -> tuple[int, dict]:
+        """Presta un libro (``POST /prestar``)."""
+        return await self.solicitar(
+            "POST",
+            "/prestar",
+            {"libro_id": libro_id, "nombre_aprendiz": nombre_aprendiz},
+        )
+
+    async def devolver(self, libro_id: str) -> tuple[int, dict]:
+        """Devuelve un libro (``POST /devolver``)."""
+        return await self.solicitar("POST", "/devolver", {"libro_id": libro_id})
+
+    async def buscar(self, query: str) -> tuple[int, dict]:
+        """Busca libros por título, autor o ISBN (``GET /buscar``)."""
+        return await self.solicitar("GET", f"/buscar?{urlencode({'q': query})}")
+
+    async def prestados(self) -> tuple[int, dict]:
+        """Lista los libros prestados (``GET /prestados``)."""
+        return await self.solicitar("GET", "/prestados")
+
+
+async def servir(archivo: str, host: str, puerto: int, diario: bool) -> None:
+    """
+    Carga la biblioteca y atiende peticiones hasta que se interrumpa.
+
+    Args:
+        archivo: Archivo JSON o base SQLite de la biblioteca
+        host: Dirección donde escuchar
+        puerto: Puerto donde escuchar
+        diario: Si es True, los cambios se registran en el diario
+    """
+    servidor = ServidorBiblioteca(cargar_datos(archivo), archivo, diario)
+    puerto = await servidor.iniciar(host, puerto)
+    console.print(f"[green]✓[/green] Biblioteca escuchando en http://{host}:{puerto}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await servidor.cerrar()
+
+
+def main() -> None:
+    """Ejecuta el servidor con las opciones de la línea de comandos."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--archivo", default=ARCHIVO_BIBLIOTECA)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=8080)
+    parser.add_argument(
+        "--sin-diario",
+        action="store_true",
+        help="reescribir el archivo completo en cada lote",
+    )
+    args = parser.parse_args()
+    try:
+        asyncio.run(servir(args.archivo, args.host, args.puerto, not args.sin_diario))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,311 @@
+"""
+Almacenamiento SQLite para el sistema de biblioteca.
+
+Alternativa opcional al archivo JSON: cuando la ruta de la biblioteca
+termina en ``.db``, ``.sqlite`` o ``.sqlite3``, las funciones de
+``Biblioteca`` delegan aquí. Cada préstamo o devolución es un único
+UPDATE dentro de una transacción, los libros prestados se consultan con
+un índice parcial y la búsqueda por título/autor usa una tabla FTS5.
+"""
+
+import json
+import sqlite3
+from pathlib import Path
+
+from Biblioteca_busqueda import tokenizar
+
+EXTENSIONES_SQLITE = (".db", ".sqlite", ".sqlite3")
+
+_COLUMNAS = (
+    "libro_id",
+    "titulo",
+    "autor",
+    "isbn",
+    "prestado_a",
+    "fecha_prestamo",
+    "fecha_vencimiento",
+)
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS libros (
+    libro_id TEXT PRIMARY KEY,
+    titulo TEXT NOT NULL,
+    autor TEXT,
+    isbn TEXT,
+    prestado_a TEXT,
+    fecha_prestamo TEXT,
+    fecha_vencimiento TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_libros_isbn ON libros (isbn);
+CREATE INDEX IF NOT EXISTS idx_libros_prestado_a
+    ON libros (prestado_a) WHERE prestado_a IS NOT NULL;
+"""
+
+_ESQUEMA_FTS = """
+CREATE VIRTUAL TABLE IF NOT EXISTS libros_fts USING fts5 (
+    titulo, autor,
+    content = 'libros', content_rowid = 'rowid',
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS libros_fts_insertar AFTER INSERT ON libros BEGIN
+    INSERT INTO libros_fts (rowid, titulo, autor)
+    VALUES (new.rowid, new.titulo, new.autor);
+END;
+CREATE TRIGGER IF NOT EXISTS libros_fts_borrar AFTER DELETE ON libros BEGIN
+    INSERT INTO libros_fts (libros_fts, rowid, titulo, autor)
+    VALUES ('delete', old.rowid, old.titulo, old.autor);
+END;
+CREATE TRIGGER IF NOT EXISTS libros_fts_actualizar
+AFTER UPDATE OF titulo, autor ON libros BEGIN
+    INSERT INTO libros_fts (libros_fts, rowid, titulo, autor)
+    VALUES ('delete', old.rowid, old.titulo, old.autor);
+    INSERT INTO libros_fts (rowid, titulo, autor)
+    VALUES (new.rowid, new.titulo, new.autor);
+END;
+"""
+
+_conexiones: dict[str, sqlite3.Connection] = {}
+
+
+def es_archivo_sqlite(archivo: str) -> bool:
+    """
+    Indica si la ruta de la biblioteca corresponde a una base SQLite.
+
+    Args:
+        archivo: Ruta del archivo de la biblioteca
+
+    Returns:
+        True si la extensión es de SQLite, False en caso contrario
+    """
+    return Path(archivo).suffix.lower() in EXTENSIONES_SQLITE
+
+
+def _tiene_fts(conexion: sqlite3.Connection) -> bool:
+    fila = conexion.execute(
+        "SELECT 1 FROM sqlite_master WHERE name = 'libros_fts'"
+    ).fetchone()
+    return fila is not None
+
+
+def _migrar(conexion: sqlite3.Connection) -> None:
+    """Agrega a bases antiguas las columnas que se sumaron al esquema."""
+    existentes = {
+        fila["name"] for fila in conexion.execute("PRAGMA table_info(libros)")
+    }
+    with conexion:
+        for columna in _COLUMNAS:
+            if columna not in existentes:
+                conexion.execute(f"ALTER TABLE libros ADD COLUMN {columna} TEXT")
+
+
+def conectar(archivo: str) -> sqlite3.Connection:
+    """
+    Retorna la conexión (reutilizada) a la base, creando el esquema.
+
+    Si la versión de SQLite no incluye FTS5, la base funciona igual y la
+    búsqueda de texto recurre a ``LIKE``.
+
+    Args:
+        archivo: Ruta de la base de datos
+
+    Returns:
+        Conexión abierta a la base
+    """
+    clave = str(Path(archivo).resolve())
+    conexion = _conexiones.get(clave)
+    if conexion is not None:
+        return conexion
+
+    conexion = sqlite3.connect(archivo)
+    conexion.row_factory = sqlite3.Row
+    conexion.execute("PRAGMA journal_mode = WAL")
+    conexion.executescript(_ESQUEMA)
+    _migrar(conexion)
+    try:
+        conexion.executescript(_ESQUEMA_FTS)
+    except sqlite3.OperationalError:
+        pass
+    _conexiones[clave] = conexion
+    return conexion
+
+
+def cerrar(archivo: str) -> None:
+    """
+    Cierra la conexión abierta a una base, si la hay.
+
+    Args:
+        archivo: Ruta de la base de datos
+    """
+    conexion = _conexiones.pop(str(Path(archivo).resolve()), None)
+    if conexion is not None:
+        conexion.close()
+
+
+def existe_biblioteca(archivo: str) -> bool:
+    """
+    Indica si la base existe y ya contiene libros.
+
+    Args:
+        archivo: Ruta de la base de datos
+
+    Returns:
+        True si hay al menos un libro guardado
+    """
+    if not Path(archivo).exists():
+        return False
+    return (
+        conectar(archivo).execute("SELECT 1 FROM libros LIMIT 1").fetchone() is not None
+    )
+
+
+def cargar_libros(archivo: str) -> list[dict]:
+    """
+    Lee todos los libros de la base.
+
+    Args:
+        archivo: Ruta de la base de datos
+
+    Returns:
+        Lista de diccionarios con los libros, ordenados por ID
+    """
+    cursor = conectar(archivo).execute(
+        f"SELECT {', '.join(_COLUMNAS)} FROM libros ORDER BY libro_id"
+    )
+    return [dict(fila) for fila in cursor]
+
+
+def guardar_libros(libros, archivo: str) -> None:
+    """
+    Guarda el catálogo completo en una transacción.
+
+    Inserta o actualiza cada libro y borra las filas de los libros que ya
+    no están en ``libros``, así la base queda igual al catálogo.
+
+    Args:
+        libros: Todos los libros del catálogo (diccionarios o registros
+            ``Libro``)
+        archivo: Ruta de la base de datos
+    """
+    libro_ids = []
+
+    def filas():
+        for libro in libros:
+            libro_ids.append(libro["libro_id"])
+            yield [libro.get(c) for c in _COLUMNAS]
+
+    conexion = conectar(archivo)
+    with conexion:
+        conexion.executemany(
+            f"INSERT INTO libros ({', '.join(_COLUMNAS)}) "
+            f"VALUES ({', '.join('?' for _ in _COLUMNAS)}) "
+            "ON CONFLICT (libro_id) DO UPDATE SET "
+            + ", ".join(f"{c} = excluded.{c}" for c in _COLUMNAS[1:]),
+            filas(),
+        )
+        conexion.execute(
+            "DELETE FROM libros WHERE libro_id NOT IN (SELECT value FROM json_each(?))",
+            (json.dumps(libro_ids),),
+        )
+
+
+def actualizar_prestamos(libros, archivo: str) -> None:
+    """
+    Persiste el estado de préstamo de uno o varios libros.
+
+    Cada libro es un UPDATE de sus columnas de préstamo y todos se
+    aplican en una sola transacción.
+
+    Args:
+        libros: Libros modificados (diccionarios o registros ``Libro``)
+        archivo: Ruta de la base de datos
+    """
+    conexion = conectar(archivo)
+    with conexion:
+        conexion.executemany(
+            "UPDATE libros SET prestado_a = ?, fecha_prestamo = ?, "
+            "fecha_vencimiento = ? WHERE libro_id = ?",
+            (
+                (
+                    libro["prestado_a"],
+                    libro["fecha_prestamo"],
+                    libro.get("fecha_vencimiento"),
+                    libro["libro_id"],
+                )
+                for libro in libros
+            ),
+        )
+
+
+def libros_prestados(archivo: str) -> list[dict]:
+    """
+    Consulta los libros prestados usando el índice de ``prestado_a``.
+
+    Args:
+        archivo: Ruta de la base de datos
+
+    Returns:
+        Lista de diccionarios con los libros prestados, ordenados por ID
+    """
+    cursor = conectar(archivo).execute(
+        f"SELECT {', '.join(_COLUMNAS)} FROM libros "
+        "WHERE prestado_a IS NOT NULL ORDER BY libro_id"
+    )
+    return [dict(fila) for fila in cursor]
+
+
+def libros_de_aprendiz(archivo: str, nombre_aprendiz: str) -> list[dict]:
+    """
+    Consulta los libros prestados a un aprendiz usando el índice parcial.
+
+    Args:
+        archivo: Ruta de la base de datos
+        nombre_aprendiz: Nombre del aprendiz
+
+    Returns:
+        Lista de diccionarios con sus libros prestados, ordenados por ID
+    """
+    cursor = conectar(archivo).execute(
+        f"SELECT {', '.join(_COLUMNAS)} FROM libros "
+        "WHERE prestado_a = ? ORDER BY libro_id",
+        (nombre_aprendiz,),
+    )
+    return [dict(fila) for fila in cursor]
+
+
+def buscar_texto(archivo: str, query: str) -> list[dict]:
+    """
+    Busca libros por título o autor con la tabla FTS5.
+
+    Cada término se busca por prefijo y sin acentos, y un libro debe
+    contener todos los términos.
+
+    Args:
+        archivo: Ruta de la base de datos
+        query: Términos de búsqueda
+
+    Returns:
+        Lista de diccionarios con los libros encontrados, ordenados por ID
+    """
+    conexion = conectar(archivo)
+    terminos = tokenizar(query)
+    columnas = ", ".join(f"libros.{c}" for c in _COLUMNAS)
+
+    if not terminos:
+        return cargar_libros(archivo)
+
+    if _tiene_fts(conexion):
+        consulta = " AND ".join(f'"{termino}"*' for termino in terminos)
+        cursor = conexion.execute(
+            f"SELECT {columnas} FROM libros_fts "
+            "JOIN libros ON libros.rowid = libros_fts.rowid "
+            "WHERE libros_fts MATCH ? ORDER BY libros.libro_id",
+            (consulta,),
+        )
+    else:
+        condicion = " AND ".join("(titulo LIKE ? OR autor LIKE ?)" for _ in terminos)
+        parametros = [f"%{t}%" for termino in terminos for t in (termino, termino)]
+        cursor = conexion.execute(
+            f"SELECT {columnas} FROM libros WHERE {condicion} ORDER BY libro_id",
+            parametros,
+        )
+    return [dict(fila) for fila in cursor]
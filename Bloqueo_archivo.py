@@ -0,0 +1,60 @@
+"""
+Bloqueos consultivos entre procesos sobre archivos de datos.
+
+Permite que varios procesos (por ejemplo, varios puestos de préstamo)
+trabajen sobre el mismo archivo sin pisarse: el bloqueo se toma sobre un
+archivo ``<archivo>.lock`` auxiliar con ``fcntl.flock``, de modo que el
+archivo de datos puede reemplazarse atómicamente mientras está bloqueado.
+
+En sistemas sin ``fcntl`` (Windows) el bloqueo no tiene efecto.
+"""
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - solo en Windows
+    fcntl = None
+
+
+def ruta_bloqueo(archivo: str) -> str:
+    """
+    Retorna la ruta del archivo de bloqueo asociado a un archivo de datos.
+
+    Args:
+        archivo: Ruta del archivo de datos
+
+    Returns:
+        Ruta del archivo ``.lock``
+    """
+    return f"{archivo}.lock"
+
+
+@contextmanager
+def bloquear(archivo: str, compartido: bool = False) -> Iterator[None]:
+    """
+    Toma un bloqueo consultivo sobre un archivo mientras dura el bloque.
+
+    Args:
+        archivo: Ruta del archivo de datos a proteger
+        compartido: Si es True, toma un bloqueo de lectura (varios
+            lectores a la vez); si es False, uno exclusivo de escritura
+
+    Yields:
+        None mientras se mantiene el bloqueo
+
+    Example:
+        >>> with bloquear("biblioteca.json"):
+        ...     pass  # leer, validar y escribir sin interferencias
+    """
+    if fcntl is None:
+        yield
+        return
+
+    with open(ruta_bloqueo(archivo), "a") as f:
+        fcntl.flock(f.fileno(), fcntl.LOCK_SH if compartido else fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
@@ -0,0 +1,114 @@
+"""
+Columnas de NumPy a las que solo se añaden filas.
+
+Lo comparten ``Biblioteca_historial`` (préstamos) e ``Inventario_ventas``
+(ventas): ambos guardan sus filas por columnas en arreglos de NumPy que
+se duplican al llenarse, y codifican los textos (IDs, nombres,
+categorías) como enteros para poder contarlos con ``np.bincount``.
+"""
+
+import numpy as np
+
+# Capacidad inicial de las columnas (se duplica al llenarse)
+CAPACIDAD_INICIAL = 1024
+
+
+class Codificador:
+    """
+    Asigna un código entero estable a cada valor distinto.
+
+    El código es la posición del valor en ``valores``, así que
+    ``valores[codigo]`` lo decodifica.
+
+    Example:
+        >>> categorias = Codificador()
+        >>> categorias.codificar("Flores"), categorias.codificar("Macetas")
+        (0, 1)
+        >>> categorias.codificar("Flores")
+        0
+    """
+
+    def __init__(self) -> None:
+        """Crea un codificador vacío."""
+        self.codigos: dict = {}
+        self.valores: list = []
+
+    def __len__(self) -> int:
+        return len(self.valores)
+
+    def codificar(self, valor) -> int:
+        """
+        Retorna el código de un valor, asignándole uno nuevo si no lo tiene.
+
+        Args:
+            valor: Valor a codificar (debe poder usarse como clave)
+
+        Returns:
+            Código entero del valor
+        """
+        codigo = self.codigos.get(valor)
+        if codigo is None:
+            codigo = self.codigos[valor] = len(self.valores)
+            self.valores.append(valor)
+        return codigo
+
+
+class Columnas:
+    """
+    Arreglos de NumPy del mismo largo a los que solo se añaden filas.
+
+    Las subclases declaran sus columnas en ``COLUMNAS``; cada una queda en
+    el atributo ``_<nombre>`` con espacio reservado de sobra, y
+    ``columna`` da la vista de las filas ocupadas.
+    """
+
+    # Nombre de cada columna → tipo de NumPy
+    COLUMNAS: dict[str, type] = {}
+
+    def __init__(self, capacidad: int = CAPACIDAD_INICIAL) -> None:
+        """
+        Crea las columnas vacías.
+
+        Args:
+            capacidad: Filas reservadas inicialmente
+        """
+        for nombre, tipo in self.COLUMNAS.items():
+            setattr(self, f"_{nombre}", np.empty(capacidad, dtype=tipo))
+        self._filas = 0
+
+    def __len__(self) -> int:
+        return self._filas
+
+    def _reservar(self, filas: int) -> None:
+        """Agranda las columnas para que quepan ``filas`` filas más."""
+        necesarias = self._filas + filas
+        capacidad = len(getattr(self, f"_{next(iter(self.COLUMNAS))}"))
+        if necesarias <= capacidad:
+            return
+        capacidad = max(necesarias, 2 * capacidad)
+        for nombre in self.COLUMNAS:
+            anterior = getattr(self, f"_{nombre}")
+            nueva = np.empty(capacidad, dtype=anterior.dtype)
+            nueva[: self._filas] = anterior[: self._filas]
+            setattr(self, f"_{nombre}", nueva)
+
+    def _anexar(self, **columnas: np.ndarray) -> None:
+        """Añade al final las filas dadas por columnas."""
+        cantidad = len(next(iter(columnas.values())))
+        self._reservar(cantidad)
+        desde, hasta = self._filas, self._filas + cantidad
+        for nombre, valores in columnas.items():
+            getattr(self, f"_{nombre}")[desde:hasta] = valores
+        self._filas = hasta
+
+    def columna(self, nombre: str) -> np.ndarray:
+        """
+        Retorna la vista de las filas ocupadas de una columna.
+
+        Args:
+            nombre: Nombre de la columna (una clave de ``COLUMNAS``)
+
+        Returns:
+            Vista (sin copia) de la columna
+        """
+        return getattr(self, f"_{nombre}")[: self._filas]
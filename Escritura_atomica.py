@@ -0,0 +1,136 @@
+"""
+Escritura atómica de archivos.
+
+Utilidad compartida por la biblioteca y el inventario para guardar sus
+archivos JSON sin dejarlos truncados si el proceso se interrumpe a mitad
+de la escritura: el contenido se escribe en un archivo temporal del mismo
+directorio, se sincroniza con el disco y luego reemplaza al original con
+un renombrado atómico.
+"""
+
+import os
+import stat
+import tempfile
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import BinaryIO
+
+# Permisos del archivo cuando se crea por primera vez (mkstemp usa 0o600)
+PERMISOS_NUEVO = 0o644
+
+
+def _sincronizar_directorio(directorio: Path) -> None:
+    """Sincroniza la entrada del directorio tras el renombrado (POSIX)."""
+    try:
+        descriptor = os.open(directorio, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(descriptor)
+    except OSError:
+        pass
+    finally:
+        os.close(descriptor)
+
+
+def contenido_igual(archivo: str | Path, datos: bytes) -> bool:
+    """
+    Indica si el archivo ya contiene exactamente esos bytes.
+
+    Primero compara el tamaño, así que solo lee el archivo cuando podría
+    coincidir.
+
+    Args:
+        archivo: Ruta del archivo
+        datos: Contenido a comparar
+
+    Returns:
+        True si el archivo existe y su contenido es idéntico
+    """
+    ruta = Path(archivo)
+    try:
+        if ruta.stat().st_size != len(datos):
+            return False
+        return ruta.read_bytes() == datos
+    except OSError:
+        return False
+
+
+def escribir_atomico(
+    archivo: str | Path,
+    contenido: str | bytes,
+    sincronizar: bool = True,
+    omitir_sin_cambios: bool = True,
+) -> bool:
+    """
+    Escribe un archivo de forma atómica.
+
+    Args:
+        archivo: Ruta del archivo destino
+        contenido: Texto a escribir (se codifica en UTF-8) o bytes
+        sincronizar: Si es True, hace ``fsync`` del archivo y del
+            directorio; en False es más rápido pero un corte de luz puede
+            perder la última escritura (nunca deja el archivo truncado)
+        omitir_sin_cambios: Si es True y el archivo ya tiene ese
+            contenido, no se reescribe
+
+    Returns:
+        True si se escribió el archivo, False si se omitió por no cambiar
+
+    Raises:
+        OSError: Si no se pudo escribir o reemplazar el archivo
+    """
+    ruta = Path(archivo)
+    datos = contenido.encode("utf-8") if isinstance(contenido, str) else contenido
+
+    if omitir_sin_cambios and contenido_igual(ruta, datos):
+        return False
+
+    with abrir_atomico(ruta, sincronizar) as f:
+        f.write(datos)
+    return True
+
+
+@contextmanager
+def abrir_atomico(archivo: str | Path, sincronizar: bool = True) -> Iterator[BinaryIO]:
+    """
+    Abre un archivo temporal que reemplaza a ``archivo`` al cerrarse.
+
+    Sirve para escribir por partes (por ejemplo con ``pickle.dump``) sin
+    armar antes todo el contenido en memoria. Si el bloque termina con
+    una excepción, el temporal se borra y el archivo queda como estaba.
+
+    Args:
+        archivo: Ruta del archivo destino
+        sincronizar: Si es True, hace ``fsync`` del archivo y del directorio
+
+    Yields:
+        Archivo binario abierto para escribir
+
+    Raises:
+        OSError: Si no se pudo escribir o reemplazar el archivo
+    """
+    ruta = Path(archivo)
+    directorio = ruta.parent
+    descriptor, temporal = tempfile.mkstemp(
+        dir=directorio, prefix=f".{ruta.name}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(descriptor, "wb") as f:
+            yield f
+            f.flush()
+            if sincronizar:
+                os.fsync(f.fileno())
+        try:
+            permisos = stat.S_IMODE(ruta.stat().st_mode)
+        except OSError:
+            permisos = PERMISOS_NUEVO
+        os.chmod(temporal, permisos)
+        os.replace(temporal, ruta)
+    except BaseException:
+        Path(temporal).unlink(missing_ok=True)
+        raise
+
+    if sincronizar:
+        _sincronizar_directorio(directorio)
@@ -1,5 +1,9 @@
+import bisect
+import csv
 import json
+import math
 import os
+from datetime import datetime
 
 from rich import box
 from rich.console import Console
@@ -7,18 +11,397 @@ from rich.panel import Panel
 from rich.prompt import FloatPrompt, IntPrompt, Prompt
 from rich.table import Table
 
+from Escritura_atomica import escribir_atomico
+
 console = Console()
 
+# Stock por debajo del cual un producto se marca para reponer, salvo que
+# el producto ("umbral") o su categoría tengan uno propio
+UMBRAL_REPOSICION = 10
+
+COLUMNAS_REPOSICION = ["id", "nombre", "categoria", "cantidad", "umbral", "faltante"]
+
+# Motivos de rechazo de registrar_ventas
+MOTIVO_NO_ENCONTRADO = "producto no encontrado"
+MOTIVO_CANTIDAD_INVALIDA = "cantidad inválida"
+MOTIVO_STOCK_INSUFICIENTE = "stock insuficiente"
+MOTIVO_ERROR_GUARDADO = "error al guardar"
+
+
+class Inventario:
+    """
+    Inventario de productos con un índice por ID.
+
+    Envuelve la lista de productos y mantiene un diccionario id → producto,
+    así que buscar un producto es O(1), y un contador de IDs que solo
+    avanza: un ID asignado no se reutiliza aunque el producto desaparezca.
+    Se comporta como la lista (se recorre, se indexa y se compara igual),
+    por lo que las funciones escritas para listas siguen funcionando.
+
+    Además lleva los totales al día (unidades, valor del stock y valor por
+    categoría): cada alta o cambio hecho con agregar o actualizar ajusta
+    solo la diferencia, así el resumen no recorre los productos.
+
+    Para la reposición guarda una lista ordenada por margen (stock menos
+    umbral de reposición): los productos bajo el umbral son el prefijo con
+    margen negativo, que se encuentra con una búsqueda binaria.
+
+    Si se le asigna un registro de ventas (ver Inventario_ventas.cargar_ventas),
+    registrar_ventas le añade cada lote ya guardado.
+    """
+
+    def __init__(self, productos=None, siguiente_id=1, umbrales_categoria=None):
+        """
+        Crea el inventario e indexa los productos recibidos.
+        El contador nunca queda por debajo del mayor ID + 1.
+        """
+        self._productos = productos if productos is not None else []
+        self._por_id = {p["id"]: p for p in self._productos if "id" in p}
+        self.siguiente_id = max(siguiente_id, max(self._por_id, default=0) + 1)
+        self.id_guardado = None
+        self.umbrales_categoria = dict(umbrales_categoria or {})
+        self.umbrales_guardados = {}
+        self.ventas = None
+        self._reiniciar_totales()
+        for producto in self._productos:
+            self._sumar(producto, 1)
+        self._reindexar_margenes()
+
+    def _reindexar_margenes(self):
+        # (margen, id) ordenados, y el margen actual de cada ID
+        self._margen_de = {
+            producto_id: self._margen(producto)
+            for producto_id, producto in self._por_id.items()
+        }
+        self._por_margen = sorted(
+            (margen, producto_id) for producto_id, margen in self._margen_de.items()
+        )
+
+    def _margen(self, producto):
+        return producto["cantidad"] - self.umbral(producto)
+
+    def _indexar_margen(self, producto):
+        """
+        Mueve el producto a su posición por margen (O(log n) + memmove).
+        """
+        producto_id = producto["id"]
+        anterior = self._margen_de.get(producto_id)
+        margen = self._margen(producto)
+        if margen == anterior:
+            return
+        if anterior is not None:
+            posicion = bisect.bisect_left(self._por_margen, (anterior, producto_id))
+            del self._por_margen[posicion]
+        self._margen_de[producto_id] = margen
+        bisect.insort(self._por_margen, (margen, producto_id))
+
+    def _reiniciar_totales(self):
+        self.unidades = 0
+        self.valor_total = 0.0
+        # categoría -> [productos, unidades, valor]
+        self._por_categoria = {}
+
+    def _sumar(self, producto, signo):
+        """
+        Suma (signo 1) o resta (signo -1) un producto de los totales.
+        """
+        cantidad = producto["cantidad"]
+        valor = cantidad * producto["precio"]
+        self.unidades += signo * cantidad
+        self.valor_total += signo * valor
+        categoria = producto["categoria"]
+        acumulado = self._por_categoria.setdefault(categoria, [0, 0, 0.0])
+        acumulado[0] += signo
+        acumulado[1] += signo * cantidad
+        acumulado[2] += signo * valor
+        if acumulado[0] == 0:
+            del self._por_categoria[categoria]
+
+    def __len__(self):
+        return len(self._productos)
+
+    def __iter__(self):
+        return iter(self._productos)
+
+    def __getitem__(self, posicion):
+        return self._productos[posicion]
+
+    def __eq__(self, otro):
+        if isinstance(otro, Inventario):
+            otro = otro.a_lista()
+        return self._productos == otro
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Inventario({self._productos!r})"
+
+    def buscar_por_id(self, producto_id):
+        """
+        Retorna el producto con ese ID en O(1), o None si no existe.
+        """
+        return self._por_id.get(producto_id)
+
+    def nuevo_id(self):
+        """
+        Reserva y retorna el siguiente ID libre.
+        """
+        nuevo_id = self.siguiente_id
+        self.siguiente_id += 1
+        return nuevo_id
+
+    def agregar(self, producto):
+        """
+        Agrega un producto a la lista y al índice.
+        """
+        self._productos.append(producto)
+        self._por_id[producto["id"]] = producto
+        self.siguiente_id = max(self.siguiente_id, producto["id"] + 1)
+        self._sumar(producto, 1)
+        self._indexar_margen(producto)
+
+    def actualizar(self, producto, **cambios):
+        """
+        Modifica campos de un producto y ajusta los totales.
+        Ejemplo: inventario.actualizar(producto, cantidad=3)
+        """
+        self._sumar(producto, -1)
+        producto.update(cambios)
+        self._sumar(producto, 1)
+        self._indexar_margen(producto)
+
+    def umbral(self, producto):
+        """
+        Retorna el umbral de reposición del producto: el suyo, el de su
+        categoría o UMBRAL_REPOSICION.
+        """
+        umbral = producto.get("umbral")
+        if umbral is None:
+            umbral = self.umbrales_categoria.get(
+                producto["categoria"], UMBRAL_REPOSICION
+            )
+        return umbral
+
+    def definir_umbral_categoria(self, categoria, umbral):
+        """
+        Fija (o quita, con None) el umbral de reposición de una categoría.
+        Reubica los productos de la categoría, así que recorre el inventario.
+        """
+        if umbral is None:
+            self.umbrales_categoria.pop(categoria, None)
+        else:
+            self.umbrales_categoria[categoria] = umbral
+        for producto in self._productos:
+            if producto["categoria"] == categoria:
+                self._indexar_margen(producto)
+
+    def bajo_umbral(self):
+        """
+        Retorna los productos con stock menor que su umbral, del más
+        urgente (mayor faltante) al menos, sin recorrer el inventario.
+        """
+        fin = bisect.bisect_left(self._por_margen, (0,))
+        return [self._por_id[producto_id] for _, producto_id in self._por_margen[:fin]]
+
+    def totales(self):
+        """
+        Retorna productos, unidades, valor y valor por categoría sin
+        recorrer los productos (solo se copia el dict de categorías).
+        """
+        return {
+            "productos": len(self._productos),
+            "unidades": self.unidades,
+            "valor": self.valor_total,
+            "valor_por_categoria": {
+                categoria: acumulado[2]
+                for categoria, acumulado in self._por_categoria.items()
+            },
+        }
+
+    def verificar_totales(self, corregir=True):
+        """
+        Recalcula los totales desde cero y los compara con los acumulados.
+        Retorna True si coincidían; si no y corregir es True, los reemplaza.
+        """
+        esperados = calcular_totales(self._productos)
+        coinciden = _totales_iguales(self.totales(), esperados)
+        if not coinciden and corregir:
+            self._reiniciar_totales()
+            for producto in self._productos:
+                self._sumar(producto, 1)
+        return coinciden
+
+    def a_lista(self):
+        """
+        Retorna la lista de productos envuelta por el inventario.
+        """
+        return self._productos
+
+
+def calcular_totales(productos):
+    """
+    Calcula el resumen recorriendo todos los productos (mismo formato
+    que Inventario.totales).
+    """
+    valor_por_categoria = {}
+    for p in productos:
+        valor_por_categoria.setdefault(p["categoria"], []).append(
+            p["cantidad"] * p["precio"]
+        )
+    return {
+        "productos": len(productos),
+        "unidades": sum(p["cantidad"] for p in productos),
+        "valor": math.fsum(p["cantidad"] * p["precio"] for p in productos),
+        "valor_por_categoria": {
+            categoria: math.fsum(valores)
+            for categoria, valores in valor_por_categoria.items()
+        },
+    }
+
+
+def _totales_iguales(a, b):
+    """
+    Compara dos resúmenes tolerando el redondeo de las sumas de precios.
+    """
+    if (a["productos"], a["unidades"]) != (b["productos"], b["unidades"]):
+        return False
+    if a["valor_por_categoria"].keys() != b["valor_por_categoria"].keys():
+        return False
+    valores = [(a["valor"], b["valor"])] + [
+        (valor, b["valor_por_categoria"][categoria])
+        for categoria, valor in a["valor_por_categoria"].items()
+    ]
+    return all(math.isclose(x, y, rel_tol=1e-9, abs_tol=1e-6) for x, y in valores)
+
+
+def resumen_inventario(inventario):
+    """
+    Retorna productos, unidades, valor y valor por categoría.
+    Con un Inventario no recorre los productos (útil para tableros).
+    """
+    if isinstance(inventario, Inventario):
+        return inventario.totales()
+    return calcular_totales(inventario)
+
+
+def verificar_totales(inventario, corregir=True):
+    """
+    Comprueba los totales acumulados de un Inventario contra un recálculo
+    completo. Una lista simple no acumula totales, así que siempre cuadra.
+    """
+    if isinstance(inventario, Inventario):
+        return inventario.verificar_totales(corregir)
+    return True
+
+
+def umbral_reposicion(inventario, producto):
+    """
+    Retorna el umbral de reposición de un producto (el del Inventario, o
+    el propio del producto o UMBRAL_REPOSICION en una lista simple).
+    """
+    if isinstance(inventario, Inventario):
+        return inventario.umbral(producto)
+    umbral = producto.get("umbral")
+    return UMBRAL_REPOSICION if umbral is None else umbral
+
+
+def productos_bajo_umbral(inventario):
+    """
+    Retorna los productos por reponer, del más urgente al menos.
+    Con un Inventario usa su índice por margen; una lista se recorre.
+    """
+    if isinstance(inventario, Inventario):
+        return inventario.bajo_umbral()
+    return sorted(
+        (p for p in inventario if p["cantidad"] < umbral_reposicion(inventario, p)),
+        key=lambda p: (p["cantidad"] - umbral_reposicion(inventario, p), p["id"]),
+    )
+
+
+def exportar_reposicion(inventario, archivo="reposicion.csv"):
+    """
+    Escribe en CSV los productos por reponer (id, nombre, categoría,
+    cantidad, umbral y unidades que faltan). Retorna cuántos escribió.
+    """
+    productos = productos_bajo_umbral(inventario)
+    with open(archivo, "w", encoding="utf-8", newline="") as f:
+        escritor = csv.writer(f)
+        escritor.writerow(COLUMNAS_REPOSICION)
+        for p in productos:
+            umbral = umbral_reposicion(inventario, p)
+            escritor.writerow(
+                [
+                    p["id"],
+                    p["nombre"],
+                    p["categoria"],
+                    p["cantidad"],
+                    umbral,
+                    umbral - p["cantidad"],
+                ]
+            )
+    return len(productos)
+
+
+def _actualizar_producto(inventario, producto, **cambios):
+    """
+    Modifica un producto manteniendo los totales de un Inventario.
+    """
+    if isinstance(inventario, Inventario):
+        inventario.actualizar(producto, **cambios)
+    else:
+        producto.update(cambios)
+
+
+def ruta_contador(archivo="inventario.json"):
+    """
+    Retorna la ruta del archivo con el contador de IDs del inventario.
+    """
+    return f"{archivo}.contador"
+
+
+def _leer_contador(archivo):
+    """
+    Lee el siguiente ID guardado; 1 si no hay contador o está dañado.
+    """
+    try:
+        with open(ruta_contador(archivo), "r", encoding="utf-8") as f:
+            return int(json.load(f)["siguiente_id"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return 1
+
+
+def ruta_umbrales(archivo="inventario.json"):
+    """
+    Retorna la ruta del archivo con los umbrales de reposición por categoría.
+    """
+    return f"{archivo}.umbrales"
+
+
+def _leer_umbrales(archivo):
+    """
+    Lee los umbrales por categoría; vacío si no hay archivo o está dañado.
+    """
+    try:
+        with open(ruta_umbrales(archivo), "r", encoding="utf-8") as f:
+            umbrales = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return umbrales if isinstance(umbrales, dict) else {}
+
 
 def cargar_inventario(archivo="inventario.json"):
     """
     Carga el inventario desde un archivo JSON.
-    Si no existe, retorna una lista vacía.
+    Si no existe, retorna un inventario vacío.
     """
     if os.path.exists(archivo):
         try:
             with open(archivo, "r", encoding="utf-8") as f:
-                inventario = json.load(f)
+                inventario = Inventario(
+                    json.load(f), _leer_contador(archivo), _leer_umbrales(archivo)
+                )
+            inventario.id_guardado = inventario.siguiente_id
+            inventario.umbrales_guardados = dict(inventario.umbrales_categoria)
             console.print(
                 f"[green]✓[/green] Inventario cargado: {len(inventario)} productos",
                 style="dim",
@@ -29,22 +412,46 @@ def cargar_inventario(archivo="inventario.json"):
                 "[yellow]⚠[/yellow] Archivo corrupto. Creando nuevo inventario.",
                 style="dim",
             )
-            return []
+            return Inventario()
     else:
         console.print(
             "[yellow]⚠[/yellow] Archivo no encontrado. Creando nuevo inventario.",
             style="dim",
         )
-        return []
+        return Inventario()
 
 
-def guardar_inventario(inventario, archivo="inventario.json"):
+def guardar_inventario(inventario, archivo="inventario.json", sincronizar=True):
     """
     Guarda el inventario en un archivo JSON con formato legible.
+    La escritura es atómica y se omite si el contenido no cambió;
+    con sincronizar=False se salta el fsync (más rápido, menos seguro).
+    El contador de IDs y los umbrales por categoría de un Inventario se
+    guardan aparte, antes que los datos, y solo cuando cambiaron.
     """
     try:
-        with open(archivo, "w", encoding="utf-8") as f:
-            json.dump(inventario, f, indent=4, ensure_ascii=False)
+        if isinstance(inventario, Inventario):
+            if inventario.siguiente_id != inventario.id_guardado:
+                escribir_atomico(
+                    ruta_contador(archivo),
+                    json.dumps({"siguiente_id": inventario.siguiente_id}),
+                    sincronizar=sincronizar,
+                )
+                inventario.id_guardado = inventario.siguiente_id
+            if inventario.umbrales_categoria != inventario.umbrales_guardados:
+                escribir_atomico(
+                    ruta_umbrales(archivo),
+                    json.dumps(
+                        inventario.umbrales_categoria, indent=4, ensure_ascii=False
+                    ),
+                    sincronizar=sincronizar,
+                )
+                inventario.umbrales_guardados = dict(inventario.umbrales_categoria)
+            productos = inventario.a_lista()
+        else:
+            productos = inventario
+        contenido = json.dumps(productos, indent=4, ensure_ascii=False)
+        escribir_atomico(archivo, contenido, sincronizar=sincronizar)
         console.print("[green]✓[/green] Inventario guardado exitosamente", style="dim")
         return True
     except Exception as e:
@@ -52,6 +459,30 @@ def guardar_inventario(inventario, archivo="inventario.json"):
         return False
 
 
+def buscar_producto_por_id(inventario, producto_id):
+    """
+    Busca un producto por su ID (O(1) con un Inventario).
+    Retorna None si no existe.
+    """
+    if isinstance(inventario, Inventario):
+        return inventario.buscar_por_id(producto_id)
+    for p in inventario:
+        if p["id"] == producto_id:
+            return p
+    return None
+
+
+def _nuevo_id(inventario):
+    """
+    Asigna el ID de un producto nuevo (con un Inventario, sin recorrerlo).
+    """
+    if isinstance(inventario, Inventario):
+        return inventario.nuevo_id()
+    if inventario:
+        return max(p.get("id", 0) for p in inventario) + 1
+    return 1
+
+
 def agregar_producto(inventario):
     """
     Agrega un nuevo producto al inventario.
@@ -63,10 +494,7 @@ def agregar_producto(inventario):
     precio = FloatPrompt.ask("Precio unitario", default=0.0)
     categoria = Prompt.ask("Categoría", default="General")
 
-    if inventario:
-        nuevo_id = max(p.get("id", 0) for p in inventario) + 1
-    else:
-        nuevo_id = 1
+    nuevo_id = _nuevo_id(inventario)
 
     producto = {
         "id": nuevo_id,
@@ -76,7 +504,10 @@ def agregar_producto(inventario):
         "categoria": categoria,
     }
 
-    inventario.append(producto)
+    if isinstance(inventario, Inventario):
+        inventario.agregar(producto)
+    else:
+        inventario.append(producto)
     guardar_inventario(inventario)
 
     console.print(
@@ -101,11 +532,7 @@ def vender_producto(inventario):
 
     producto_id = IntPrompt.ask("\nID del producto a vender")
 
-    producto = None
-    for p in inventario:
-        if p["id"] == producto_id:
-            producto = p
-            break
+    producto = buscar_producto_por_id(inventario, producto_id)
 
     if not producto:
         console.print("[red]✗[/red] Producto no encontrado", style="bold red")
@@ -120,11 +547,12 @@ def vender_producto(inventario):
         console.print("[red]✗[/red] Stock insuficiente", style="bold red")
         return inventario
 
-    producto["cantidad"] -= cantidad_venta
+    [resultado] = registrar_ventas(inventario, [(producto_id, cantidad_venta)])
+    if not resultado["exito"]:
+        console.print(f"[red]✗[/red] Venta rechazada: {resultado['motivo']}")
+        return inventario
     total = cantidad_venta * producto["precio"]
 
-    guardar_inventario(inventario)
-
     console.print("\n[green]✓[/green] Venta registrada:", style="bold green")
     console.print(f"  • Cantidad: {cantidad_venta} unidades")
     console.print(f"  • Total: ${total:,.2f}")
@@ -133,10 +561,133 @@ def vender_producto(inventario):
     return inventario
 
 
-def mostrar_inventario(inventario, resumido=False):
+def ruta_ventas(archivo="inventario.json"):
+    """
+    Retorna la ruta del registro de ventas (una línea JSON por venta).
+    """
+    return f"{archivo}.ventas"
+
+
+def _anotar_ventas(ventas, archivo, sincronizar):
+    """
+    Añade las ventas al registro con una sola escritura.
+    Retorna el tamaño que tenía antes, para poder deshacerlas.
+    Si un corte dejó la última línea a medias, se empieza en una nueva
+    para no arrastrar la primera venta del lote.
+    """
+    datos = "".join(
+        json.dumps(venta, ensure_ascii=False) + "\n" for venta in ventas
+    ).encode("utf-8")
+    with open(ruta_ventas(archivo), "a+b") as f:
+        tamano_previo = f.seek(0, os.SEEK_END)
+        if tamano_previo:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                datos = b"\n" + datos
+        f.write(datos)
+        f.flush()
+        if sincronizar:
+            os.fsync(f.fileno())
+    return tamano_previo
+
+
+def _motivo_rechazo_venta(producto, cantidad):
+    """
+    Retorna por qué no se puede vender esa cantidad, o None si se puede.
+    """
+    if producto is None:
+        return MOTIVO_NO_ENCONTRADO
+    if not isinstance(cantidad, int) or cantidad <= 0:
+        return MOTIVO_CANTIDAD_INVALIDA
+    if cantidad > producto["cantidad"]:
+        return MOTIVO_STOCK_INSUFICIENTE
+    return None
+
+
+def _persistir_ventas(inventario, ventas, archivo, sincronizar):
+    """
+    Anota las ventas y guarda el inventario; si el guardado falla, quita
+    las ventas del registro. Retorna True si ambas cosas se hicieron.
+    """
+    try:
+        tamano_previo = _anotar_ventas(ventas, archivo, sincronizar)
+    except OSError as e:
+        console.print(f"[red]✗[/red] Error al anotar las ventas: {e}", style="bold red")
+        return False
+    if guardar_inventario(inventario, archivo, sincronizar):
+        return True
+    with open(ruta_ventas(archivo), "r+b") as f:
+        f.truncate(tamano_previo)
+    return False
+
+
+def registrar_ventas(
+    inventario, ventas, archivo="inventario.json", sincronizar=True, fecha=None
+):
+    """
+    Registra un lote de ventas, pares (id, cantidad), guardando una vez.
+
+    Cada venta se valida contra el stock que dejan las anteriores del
+    lote; una rechazada (producto inexistente, cantidad no positiva o
+    stock insuficiente) no afecta a las demás. Las aceptadas se añaden al
+    registro de ventas con la fecha y el precio unitario, y el inventario
+    se guarda una sola vez. Si no se puede guardar, se deshacen todas.
+
+    Retorna un dict por venta con id, cantidad, exito y motivo (None si
+    se registró).
+    """
+    fecha = (fecha or datetime.now()).isoformat(timespec="seconds")
+    resultados = []
+    aceptadas = []
+    stock_previo = []
+    for producto_id, cantidad in ventas:
+        producto = buscar_producto_por_id(inventario, producto_id)
+        motivo = _motivo_rechazo_venta(producto, cantidad)
+        if motivo is None:
+            stock_previo.append((producto, producto["cantidad"]))
+            _actualizar_producto(
+                inventario, producto, cantidad=producto["cantidad"] - cantidad
+            )
+            aceptadas.append(
+                {
+                    "fecha": fecha,
+                    "id": producto_id,
+                    "cantidad": cantidad,
+                    "precio": producto["precio"],
+                    "categoria": producto.get("categoria"),
+                }
+            )
+        resultados.append(
+            {
+                "id": producto_id,
+                "cantidad": cantidad,
+                "exito": motivo is None,
+                "motivo": motivo,
+            }
+        )
+
+    if not aceptadas:
+        return resultados
+    if _persistir_ventas(inventario, aceptadas, archivo, sincronizar):
+        if isinstance(inventario, Inventario) and inventario.ventas is not None:
+            inventario.ventas.agregar(aceptadas)
+    else:
+        for producto, cantidad in reversed(stock_previo):
+            _actualizar_producto(inventario, producto, cantidad=cantidad)
+        for resultado in resultados:
+            if resultado["exito"]:
+                resultado["exito"] = False
+                resultado["motivo"] = MOTIVO_ERROR_GUARDADO
+    return resultados
+
+
+def mostrar_inventario(inventario, resumido=False, origen=None):
     """
     Muestra el inventario en una tabla formateada con Rich.
+    Si se muestra una parte, origen es el inventario completo del que se
+    toman los umbrales de reposición.
     """
+    origen = inventario if origen is None else origen
     if not inventario:
         console.print("\n[yellow] El inventario está vacío[/yellow]", style="bold")
         return
@@ -158,16 +709,9 @@ def mostrar_inventario(inventario, resumido=False):
     if not resumido:
         tabla.add_column("Valor Total", justify="right", style="bold green")
 
-    total_productos = 0
-    valor_total = 0
-
     for p in inventario:
-        valor_producto = p["cantidad"] * p["precio"]
-        total_productos += p["cantidad"]
-        valor_total += valor_producto
-        cantidades=10
-
-        stock_style = "bold red" if p["cantidad"] < cantidades else "yellow"
+        bajo_umbral = p["cantidad"] < umbral_reposicion(origen, p)
+        stock_style = "bold red" if bajo_umbral else "yellow"
 
         if resumido:
             tabla.add_row(
@@ -183,16 +727,17 @@ def mostrar_inventario(inventario, resumido=False):
                 p["categoria"],
                 f"[{stock_style}]{p['cantidad']}[/{stock_style}]",
                 f"${p['precio']:,.2f}",
-                f"${valor_producto:,.2f}",
+                f"${p['cantidad'] * p['precio']:,.2f}",
             )
 
     console.print()
     console.print(tabla)
 
     if not resumido:
-        resumen = f"[bold]Total productos:[/bold] {len(inventario)} | "
-        resumen += f"[bold]Unidades totales:[/bold] {total_productos} | "
-        resumen += f"[bold]Valor inventario:[/bold] ${valor_total:,.2f}"
+        totales = resumen_inventario(inventario)
+        resumen = f"[bold]Total productos:[/bold] {totales['productos']} | "
+        resumen += f"[bold]Unidades totales:[/bold] {totales['unidades']} | "
+        resumen += f"[bold]Valor inventario:[/bold] ${totales['valor']:,.2f}"
 
         console.print(Panel(resumen, style="cyan", box=box.ROUNDED))
 
@@ -212,7 +757,7 @@ def buscar_producto(inventario):
 
     if resultados:
         console.print(f"\n[green]Se encontraron {len(resultados)} resultado(s)[/green]")
-        mostrar_inventario(resultados)
+        mostrar_inventario(resultados, origen=inventario)
     else:
         console.print("[yellow]No se encontraron resultados[/yellow]")
 
@@ -232,11 +777,7 @@ def editar_producto(inventario):
 
     producto_id = IntPrompt.ask("\nID del producto a editar")
 
-    producto = None
-    for p in inventario:
-        if p["id"] == producto_id:
-            producto = p
-            break
+    producto = buscar_producto_por_id(inventario, producto_id)
 
     if not producto:
         console.print("[red]✗[/red] Producto no encontrado", style="bold red")
@@ -250,10 +791,14 @@ def editar_producto(inventario):
     nuevo_precio = FloatPrompt.ask("Precio", default=producto["precio"])
     nueva_categoria = Prompt.ask("Categoría", default=producto["categoria"])
 
-    producto["nombre"] = nuevo_nombre
-    producto["cantidad"] = nueva_cantidad
-    producto["precio"] = nuevo_precio
-    producto["categoria"] = nueva_categoria
+    _actualizar_producto(
+        inventario,
+        producto,
+        nombre=nuevo_nombre,
+        cantidad=nueva_cantidad,
+        precio=nuevo_precio,
+        categoria=nueva_categoria,
+    )
 
     guardar_inventario(inventario)
     console.print(
@@ -263,6 +808,23 @@ def editar_producto(inventario):
     return inventario
 
 
+def ver_reposicion(inventario):
+    """
+    Muestra los productos bajo su umbral y ofrece exportarlos a CSV.
+    """
+    productos = productos_bajo_umbral(inventario)
+    if not productos:
+        console.print("\n[green]✓[/green] Ningún producto está bajo su umbral")
+        return
+
+    console.print(f"\n[bold red]{len(productos)} producto(s) por reponer[/bold red]")
+    mostrar_inventario(productos, resumido=True, origen=inventario)
+    archivo = Prompt.ask("Exportar a CSV (vacío para omitir)", default="")
+    if archivo:
+        exportar_reposicion(inventario, archivo)
+        console.print(f"[green]✓[/green] Reporte guardado en {archivo}")
+
+
 def mostrar_menu():
     """
     Muestra el menú principal con Rich.
@@ -273,7 +835,8 @@ def mostrar_menu():
 [bold yellow]3.[/bold yellow] Mostrar inventario
 [bold blue]4.[/bold blue] Buscar producto
 [bold green]5.[/bold green] Editar producto
-[bold red]6.[/bold red] Salir
+[bold white]6.[/bold white] Productos por reponer
+[bold red]7.[/bold red] Salir
     """
     console.print(
         Panel(
@@ -305,7 +868,7 @@ def main():
         mostrar_menu()
         opcion = Prompt.ask(
             "\n[bold]Selecciona una opción[/bold]",
-            choices=["1", "2", "3", "4", "5", "6"],
+            choices=["1", "2", "3", "4", "5", "6", "7"],
         )
 
         if opcion == "1":
@@ -319,10 +882,12 @@ def main():
         elif opcion == "5":
             inventario = editar_producto(inventario)
         elif opcion == "6":
+            ver_reposicion(inventario)
+        elif opcion == "7":
             console.print("\n[bold green] by [/bold green]\n")
             break
 
-        if opcion != "6":
+        if opcion != "7":
             Prompt.ask("\n[dim]Presiona Enter para continuar[/dim]", default="")
             console.clear()
 
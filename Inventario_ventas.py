@@ -0,0 +1,495 @@
+"""
+Registro de ventas del inventario con acumulados por hora y por día.
+
+``Inventario_json.registrar_ventas`` añade cada venta como una línea JSON
+al archivo ``<archivo>.ventas``. Este módulo la lleva a memoria:
+
+- ``RegistroVentas`` guarda las ventas por columnas (fecha, producto,
+  categoría, cantidad y precio unitario) en arreglos de NumPy; solo se
+  añaden filas, nunca se modifican.
+- A la vez mantiene dos acumulados, por hora y por día, con las unidades
+  y los ingresos de cada producto y categoría en cada período. Las
+  consultas de ingresos por período y de más vendidos leen esos
+  acumulados (unas pocas filas por período) en lugar de recorrer todas
+  las ventas.
+
+Las fechas se guardan como segundos de la fecha local tomada como UTC,
+así las horas y los días de los acumulados coinciden con el calendario
+local.
+"""
+
+import json
+from datetime import UTC, datetime
+from pathlib import Path
+
+import numpy as np
+
+from Columnas_numpy import CAPACIDAD_INICIAL, Codificador, Columnas
+from Inventario_json import ruta_ventas
+
+SEGUNDOS_POR_HORA = 3_600
+SEGUNDOS_POR_DIA = 86_400
+
+# Períodos de los acumulados: nombre → segundos
+PERIODOS = {"hora": SEGUNDOS_POR_HORA, "dia": SEGUNDOS_POR_DIA}
+
+# Categoría de las ventas anotadas sin ella
+SIN_CATEGORIA = "Sin categoría"
+
+CRITERIOS = ("unidades", "ingresos")
+
+_HORAS_POR_DIA = SEGUNDOS_POR_DIA // SEGUNDOS_POR_HORA
+
+# Período (en horas o días) que hace de límite si no se indica desde o hasta
+_SIN_LIMITE = 10**12
+
+
+def a_segundos_locales(fecha: datetime | str) -> int:
+    """
+    Convierte una fecha local en segundos, tomándola como UTC.
+
+    Args:
+        fecha: Fecha sin zona horaria (o en formato ISO)
+
+    Returns:
+        Segundos enteros desde 1970-01-01 en la hora local
+    """
+    if isinstance(fecha, str):
+        fecha = datetime.fromisoformat(fecha)
+    return int(fecha.replace(tzinfo=UTC).timestamp())
+
+
+def a_fecha(segundos: int) -> datetime:
+    """
+    Convierte segundos de ``a_segundos_locales`` de vuelta en una fecha local.
+
+    Args:
+        segundos: Segundos desde 1970-01-01 en la hora local
+
+    Returns:
+        Fecha sin zona horaria
+    """
+    return datetime.fromtimestamp(segundos, UTC).replace(tzinfo=None)
+
+
+def _periodo(fecha: datetime | None, segundos: int, defecto: int) -> int:
+    """Período de ``segundos`` que contiene la fecha (o ``defecto``)."""
+    return defecto if fecha is None else a_segundos_locales(fecha) // segundos
+
+
+class _Acumulado(Columnas):
+    """
+    Unidades e ingresos por período, producto y categoría.
+
+    Cada fila suma las ventas de un producto (y su categoría) en un
+    período. Un mismo trío puede repartirse en varias filas, lo que no
+    cambia las sumas. Las filas del período más reciente se acumulan en
+    un diccionario, así las ventas de todo el día siguen siendo una fila
+    por producto; al llegar un período posterior pasan a las columnas.
+    """
+
+    COLUMNAS = {
+        "periodo": np.int64,
+        "producto": np.int32,
+        "categoria": np.int32,
+        "unidades": np.int64,
+        "ingresos": np.float64,
+    }
+
+    def __init__(self, segundos: int) -> None:
+        super().__init__()
+        self.segundos = segundos
+        self._abierto = np.iinfo(np.int64).min
+        self._del_abierto: dict[tuple[int, int], list] = {}
+        self._ordenado = True
+
+    def _anexar_ordenando(self, **columnas: np.ndarray) -> None:
+        """Añade filas ordenadas por período, anotando si rompen el orden."""
+        periodos = columnas["periodo"]
+        if len(periodos) == 0:
+            return
+        if self._filas and periodos[0] < self._periodo[self._filas - 1]:
+            self._ordenado = False
+        self._anexar(**columnas)
+
+    def _cerrar_abierto(self) -> None:
+        """Pasa a las columnas las filas del período abierto."""
+        if not self._del_abierto:
+            return
+        claves = np.array(list(self._del_abierto), dtype=np.int64).reshape(-1, 2)
+        sumas = list(self._del_abierto.values())
+        self._anexar_ordenando(
+            periodo=np.full(len(sumas), self._abierto),
+            producto=claves[:, 0],
+            categoria=claves[:, 1],
+            unidades=[unidades for unidades, _ in sumas],
+            ingresos=[ingresos for _, ingresos in sumas],
+        )
+        self._del_abierto = {}
+
+    def sumar(
+        self,
+        fechas: np.ndarray,
+        productos: np.ndarray,
+        categorias: np.ndarray,
+        cantidades: np.ndarray,
+        ingresos: np.ndarray,
+    ) -> None:
+        """
+        Suma un lote de ventas a sus períodos.
+
+        Args:
+            fechas: Segundos de cada venta (ver ``a_segundos_locales``)
+            productos: Código del producto de cada venta
+            categorias: Código de la categoría de cada venta
+            cantidades: Unidades de cada venta
+            ingresos: Ingreso (cantidad × precio) de cada venta
+        """
+        if len(fechas) == 0:
+            return
+        # Una sola clave entera por (período, producto, categoría): np.unique
+        # la agrupa y deja los grupos ordenados por período
+        n_productos = int(productos.max()) + 1
+        n_categorias = int(categorias.max()) + 1
+        periodos = fechas // self.segundos
+        claves, grupo = np.unique(
+            (periodos * n_productos + productos) * n_categorias + categorias,
+            return_inverse=True,
+        )
+        unidades = np.bincount(grupo, weights=cantidades).astype(np.int64)
+        sumas = np.bincount(grupo, weights=ingresos)
+        categoria = claves % n_categorias
+        producto = claves // n_categorias % n_productos
+        periodo = claves // n_categorias // n_productos
+
+        if periodo[-1] > self._abierto:
+            self._cerrar_abierto()
+            self._abierto = int(periodo[-1])
+        anteriores = np.searchsorted(periodo, self._abierto)
+        self._anexar_ordenando(
+            periodo=periodo[:anteriores],
+            producto=producto[:anteriores],
+            categoria=categoria[:anteriores],
+            unidades=unidades[:anteriores],
+            ingresos=sumas[:anteriores],
+        )
+        for fila in range(anteriores, len(claves)):
+            suma = self._del_abierto.setdefault(
+                (int(producto[fila]), int(categoria[fila])), [0, 0.0]
+            )
+            suma[0] += int(unidades[fila])
+            suma[1] += float(sumas[fila])
+
+    def filas(self, desde: int, hasta: int) -> slice:
+        """
+        Rango de filas de los períodos ``desde`` a ``hasta`` (excluido).
+
+        Args:
+            desde: Primer período (segundos // ``segundos``)
+            hasta: Período siguiente al último
+
+        Returns:
+            Rebanada de las columnas con esos períodos
+        """
+        self._cerrar_abierto()
+        if not self._ordenado:
+            orden = np.argsort(self.columna("periodo"), kind="stable")
+            for nombre in self.COLUMNAS:
+                columna = self.columna(nombre)
+                columna[:] = columna[orden]
+            self._ordenado = True
+        periodos = self.columna("periodo")
+        return slice(
+            int(np.searchsorted(periodos, desde)),
+            int(np.searchsorted(periodos, hasta)),
+        )
+
+
+class RegistroVentas(Columnas):
+    """
+    Ventas en columnas, con acumulados por hora y por día.
+
+    Cada fila es una venta: fecha (ver ``a_segundos_locales``), código del
+    producto, código de la categoría, cantidad y precio unitario.
+
+    Example:
+        >>> ventas = RegistroVentas()
+        >>> ventas.agregar(
+        ...     [{"fecha": "2026-03-01T10:30:00", "id": 1, "cantidad": 2,
+        ...       "precio": 1500, "categoria": "Flores"}]
+        ... )
+        >>> ventas.mas_vendidos(1)
+        [(1, 2)]
+    """
+
+    COLUMNAS = {
+        "fecha": np.int64,
+        "producto": np.int32,
+        "categoria": np.int32,
+        "cantidad": np.int32,
+        "precio": np.float64,
+    }
+
+    def __init__(self, capacidad: int = CAPACIDAD_INICIAL) -> None:
+        """
+        Crea un registro vacío.
+
+        Args:
+            capacidad: Ventas reservadas inicialmente
+        """
+        super().__init__(capacidad)
+        self._productos = Codificador()
+        self._categorias = Codificador()
+        self._acumulados = {
+            nombre: _Acumulado(segundos) for nombre, segundos in PERIODOS.items()
+        }
+
+    def agregar_columnas(
+        self,
+        fechas: np.ndarray,
+        producto_ids: list,
+        categorias: list[str],
+        cantidades: np.ndarray,
+        precios: np.ndarray,
+    ) -> None:
+        """
+        Agrega muchas ventas de una vez y las suma a los acumulados.
+
+        Args:
+            fechas: Segundos de cada venta (ver ``a_segundos_locales``)
+            producto_ids: ID del producto de cada venta
+            categorias: Categoría del producto de cada venta
+            cantidades: Unidades de cada venta
+            precios: Precio unitario de cada venta
+        """
+        columnas = {
+            "fecha": np.asarray(fechas, dtype=np.int64),
+            "producto": np.array(
+                [self._productos.codificar(i) for i in producto_ids], dtype=np.int32
+            ),
+            "categoria": np.array(
+                [self._categorias.codificar(c) for c in categorias], dtype=np.int32
+            ),
+            "cantidad": np.asarray(cantidades, dtype=np.int32),
+            "precio": np.asarray(precios, dtype=np.float64),
+        }
+        self._anexar(**columnas)
+        ingresos = columnas["cantidad"] * columnas["precio"]
+        for acumulado in self._acumulados.values():
+            acumulado.sumar(
+                columnas["fecha"],
+                columnas["producto"],
+                columnas["categoria"],
+                columnas["cantidad"],
+                ingresos,
+            )
+
+    def agregar(self, ventas: list[dict]) -> None:
+        """
+        Agrega ventas con el formato del archivo de ventas.
+
+        Args:
+            ventas: Diccionarios con ``fecha`` (ISO), ``id``, ``cantidad``,
+                ``precio`` y, opcionalmente, ``categoria``
+        """
+        self.agregar_columnas(
+            [a_segundos_locales(venta["fecha"]) for venta in ventas],
+            [venta["id"] for venta in ventas],
+            [venta.get("categoria") or SIN_CATEGORIA for venta in ventas],
+            [venta["cantidad"] for venta in ventas],
+            [venta["precio"] for venta in ventas],
+        )
+
+    def _tramos(
+        self, desde: datetime | None, hasta: datetime | None
+    ) -> list[tuple[_Acumulado, slice]]:
+        """
+        Filas de los acumulados que cubren las horas de desde a hasta.
+
+        Los días completos se leen del acumulado diario y las horas
+        sueltas de los extremos, del acumulado por hora.
+        """
+        primera = _periodo(desde, SEGUNDOS_POR_HORA, -_SIN_LIMITE)
+        ultima = _periodo(hasta, SEGUNDOS_POR_HORA, _SIN_LIMITE)
+        por_hora, por_dia = self._acumulados["hora"], self._acumulados["dia"]
+        primer_dia = -(-primera // _HORAS_POR_DIA)
+        ultimo_dia = ultima // _HORAS_POR_DIA
+        if primer_dia >= ultimo_dia:
+            return [(por_hora, por_hora.filas(primera, ultima))]
+        return [
+            (por_hora, por_hora.filas(primera, primer_dia * _HORAS_POR_DIA)),
+            (por_dia, por_dia.filas(primer_dia, ultimo_dia)),
+            (por_hora, por_hora.filas(ultimo_dia * _HORAS_POR_DIA, ultima)),
+        ]
+
+    def _sumar_por(
+        self,
+        clave: str,
+        criterio: str,
+        desde: datetime | None,
+        hasta: datetime | None,
+    ) -> np.ndarray:
+        """Suma ``criterio`` por código de ``clave`` (producto o categoría)."""
+        if criterio not in CRITERIOS:
+            raise ValueError(f"Criterio desconocido: '{criterio}' (use {CRITERIOS})")
+        codificador = self._productos if clave == "producto" else self._categorias
+        total = np.zeros(len(codificador))
+        for acumulado, filas in self._tramos(desde, hasta):
+            total += np.bincount(
+                acumulado.columna(clave)[filas],
+                weights=acumulado.columna(criterio)[filas],
+                minlength=len(codificador),
+            )
+        return total
+
+    @staticmethod
+    def _mejores(
+        sumas: np.ndarray, valores: list, cantidad: int, criterio: str
+    ) -> list[tuple]:
+        """Retorna los ``cantidad`` valores con mayor suma (sin los ceros)."""
+        cantidad = min(cantidad, int(np.count_nonzero(sumas)))
+        if cantidad <= 0:
+            return []
+        mejores = np.argpartition(sumas, -cantidad)[-cantidad:]
+        # Orden: mayor suma primero y, a igualdad, por código
+        mejores = mejores[np.lexsort((mejores, -sumas[mejores]))]
+        convertir = int if criterio == "unidades" else float
+        return [(valores[codigo], convertir(sumas[codigo])) for codigo in mejores]
+
+    def mas_vendidos(
+        self,
+        cantidad: int = 10,
+        desde: datetime | None = None,
+        hasta: datetime | None = None,
+        criterio: str = "unidades",
+    ) -> list[tuple]:
+        """
+        Obtiene los productos más vendidos en un período.
+
+        Los límites se toman en horas completas: cuenta la hora que
+        contiene ``desde`` y no la que contiene ``hasta``.
+
+        Args:
+            cantidad: Número de productos a retornar
+            desde: Inicio del período (por defecto, sin límite)
+            hasta: Fin del período, excluido (por defecto, sin límite)
+            criterio: ``"unidades"`` o ``"ingresos"``
+
+        Returns:
+            Pares (id del producto, unidades o ingresos), de mayor a menor
+
+        Raises:
+            ValueError: Si el criterio no es uno de ``CRITERIOS``
+        """
+        sumas = self._sumar_por("producto", criterio, desde, hasta)
+        return self._mejores(sumas, self._productos.valores, cantidad, criterio)
+
+    def categorias_mas_vendidas(
+        self,
+        cantidad: int = 10,
+        desde: datetime | None = None,
+        hasta: datetime | None = None,
+        criterio: str = "ingresos",
+    ) -> list[tuple]:
+        """
+        Obtiene las categorías que más vendieron en un período.
+
+        Args:
+            cantidad: Número de categorías a retornar
+            desde: Inicio del período (horas completas, como en
+                ``mas_vendidos``)
+            hasta: Fin del período, excluido
+            criterio: ``"unidades"`` o ``"ingresos"``
+
+        Returns:
+            Pares (categoría, unidades o ingresos), de mayor a menor
+
+        Raises:
+            ValueError: Si el criterio no es uno de ``CRITERIOS``
+        """
+        sumas = self._sumar_por("categoria", criterio, desde, hasta)
+        return self._mejores(sumas, self._categorias.valores, cantidad, criterio)
+
+    def ingresos_por_periodo(
+        self,
+        periodo: str = "dia",
+        desde: datetime | None = None,
+        hasta: datetime | None = None,
+        categoria: str | None = None,
+    ) -> list[tuple[datetime, float]]:
+        """
+        Calcula los ingresos de cada hora o de cada día con ventas.
+
+        Args:
+            periodo: ``"hora"`` o ``"dia"``
+            desde: Inicio (se toma el período que lo contiene)
+            hasta: Fin, excluido (se excluye el período que lo contiene)
+            categoria: Si se indica, solo las ventas de esa categoría
+
+        Returns:
+            Pares (inicio del período, ingresos), en orden cronológico
+
+        Raises:
+            ValueError: Si el período no es uno de ``PERIODOS``
+        """
+        if periodo not in PERIODOS:
+            raise ValueError(f"Período desconocido: '{periodo}' (use {list(PERIODOS)})")
+        if categoria is not None and categoria not in self._categorias.codigos:
+            return []
+        acumulado = self._acumulados[periodo]
+        segundos = PERIODOS[periodo]
+        filas = acumulado.filas(
+            _periodo(desde, segundos, -_SIN_LIMITE),
+            _periodo(hasta, segundos, _SIN_LIMITE),
+        )
+        periodos = acumulado.columna("periodo")[filas]
+        ingresos = acumulado.columna("ingresos")[filas]
+        if categoria is not None:
+            elegidas = (
+                acumulado.columna("categoria")[filas]
+                == self._categorias.codigos[categoria]
+            )
+            periodos, ingresos = periodos[elegidas], ingresos[elegidas]
+        inicios, grupo = np.unique(periodos, return_inverse=True)
+        sumas = np.bincount(grupo, weights=ingresos, minlength=len(inicios))
+        return [
+            (a_fecha(int(inicio) * segundos), float(suma))
+            for inicio, suma in zip(inicios, sumas, strict=True)
+        ]
+
+
+def cargar_ventas(archivo: str = "inventario.json") -> RegistroVentas:
+    """
+    Construye el registro en memoria desde el archivo de ventas.
+
+    Las líneas que no se pueden leer (por ejemplo, una incompleta tras
+    un corte) se ignoran.
+
+    Args:
+        archivo: Nombre del archivo del inventario
+
+    Returns:
+        Registro con todas las ventas anotadas
+    """
+    fechas, producto_ids, categorias, cantidades, precios = [], [], [], [], []
+    ruta = Path(ruta_ventas(archivo))
+    if ruta.exists():
+        with open(ruta, encoding="utf-8") as f:
+            for linea in f:
+                try:
+                    venta = json.loads(linea)
+                    fecha = a_segundos_locales(venta["fecha"])
+                    producto_id = venta["id"]
+                    cantidad = int(venta["cantidad"])
+                    precio = float(venta["precio"])
+                except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+                    continue
+                fechas.append(fecha)
+                producto_ids.append(producto_id)
+                categorias.append(venta.get("categoria") or SIN_CATEGORIA)
+                cantidades.append(cantidad)
+                precios.append(precio)
+
+    registro = RegistroVentas(max(CAPACIDAD_INICIAL, len(fechas)))
+    registro.agregar_columnas(fechas, producto_ids, categorias, cantidades, precios)
+    return registro
@@ -299,6 +299,38 @@ def tiene_clave(clave: str) -> Callable[[dict], bool]:
     return validador
 
 
+def valor_de_clave(
+    clave: str, validador: Callable[[Any], bool]
+) -> Callable[[dict], bool]:
+    """
+    Genera un validador que aplica otro validador al valor de una clave.
+
+    Args:
+        clave (str): Clave cuyo valor se valida.
+        validador (Callable[[Any], bool]): Validador del valor.
+
+    Returns:
+        Callable[[dict], bool]: Validador del diccionario (False si falta
+        la clave).
+
+    Example:
+         validador = valor_de_clave('nombre', es_texto_no_vacio)
+         validador({'nombre': 'Juan'})
+        True
+         validador({'nombre': '  '})
+        False
+    """
+
+    def validador_de_clave(diccionario: dict) -> bool:
+        return (
+            isinstance(diccionario, dict)
+            and clave in diccionario
+            and validador(diccionario[clave])
+        )
+
+    return validador_de_clave
+
+
 def combinar_validadores(*validadores: Callable[[Any], bool]) -> Callable[[Any], bool]:
     """
     Combina múltiples validadores en uno solo (operación AND).
@@ -6,19 +6,39 @@ del sistema de préstamos de biblioteca usando solo funciones.
 """
 
 import json
+import pickle
+import subprocess
+import sys
+from datetime import datetime, timedelta
 from pathlib import Path
 
 import pytest
 
+import Biblioteca
 from Biblioteca import (
+    MOTIVO_ERROR_GUARDADO,
+    Catalogo,
+    Libro,
+    agregar_libros,
+    aplicar_diario,
     buscar_libro,
     buscar_libro_por_id,
     cargar_datos,
     crear_biblioteca_inicial,
     devolver_libro,
+    devolver_libros_lote,
     guardar_datos,
+    iterar_libros_json,
+    navegar_paginas,
+    obtener_prestamos_aprendiz,
+    paginar_libros,
     prestar_libro,
+    prestar_libros_lote,
+    ruta_cache,
+    ruta_diario,
+    sincronizar_catalogo,
     ver_libros_prestados,
+    ver_libros_vencidos,
     ver_todos_los_libros,
 )
 
@@ -261,6 +281,20 @@ def test_buscar_por_palabra_clave(libros_con_datos):
     assert "Python" in resultados[0]["titulo"]
 
 
+def test_buscar_aproximado_con_errores(libros_con_datos):
+    """Verifica que el modo aproximado encuentre títulos mal escritos."""
+    assert buscar_libro(libros_con_datos, "Pyton Programing") == []
+
+    resultados = buscar_libro(
+        libros_con_datos, "Pyton Programing", aproximado=True
+    )
+    assert resultados[0]["libro_id"] == "003"
+    catalogo = Catalogo(libros_con_datos)
+    assert buscar_libro(catalogo, "Pyton", aproximado=True) == [
+        catalogo.buscar_por_id("003")
+    ]
+
+
 def test_ver_libros_prestados(libros_con_datos):
     """Verifica que se filtren solo los libros prestados."""
     prestados = ver_libros_prestados(libros_con_datos)
@@ -395,3 +429,664 @@ def test_operaciones_sobre_lista_vacia(archivo_temporal, libros_vacios):
     # Ver prestados en lista vacía
     prestados = ver_libros_prestados(libros_vacios)
     assert len(prestados) == 0
+
+
+def test_catalogo_indexa_por_id_e_isbn(libros_con_datos):
+    """Verifica que el catálogo encuentre libros por ID e ISBN."""
+    catalogo = Catalogo(libros_con_datos)
+
+    assert len(catalogo) == len(libros_con_datos)
+    assert catalogo.buscar_por_id("003")["titulo"] == "Python Programming"
+    assert catalogo.buscar_por_isbn("987654321")["libro_id"] == "002"
+    assert catalogo.buscar_por_id("999") is None
+    assert buscar_libro_por_id(catalogo, "001") is libros_con_datos[0]
+
+
+def test_catalogo_agregar_actualiza_indices():
+    """Verifica que agregar un libro lo deje indexado."""
+    catalogo = Catalogo()
+    catalogo.agregar(
+        {
+            "libro_id": "010",
+            "titulo": "Nuevo",
+            "autor": "Autor",
+            "isbn": "555",
+            "prestado_a": None,
+            "fecha_prestamo": None,
+        }
+    )
+
+    assert catalogo.buscar_por_isbn("555")["libro_id"] == "010"
+    assert catalogo.version == 1
+
+
+def test_catalogo_prestar_y_devolver(archivo_temporal, libros_con_datos):
+    """Verifica que las funciones existentes acepten un catálogo."""
+    catalogo = Catalogo(libros_con_datos)
+
+    assert prestar_libro(catalogo, "001", "Ana", archivo_temporal) is True
+    assert catalogo.buscar_por_id("001")["prestado_a"] == "Ana"
+    assert devolver_libro(catalogo, "001", archivo_temporal) is True
+    cambios = 2
+    assert catalogo.version == cambios
+
+    prestados = ver_libros_prestados(catalogo)
+    assert [libro["libro_id"] for libro in prestados] == ["002"]
+
+
+def test_cargar_datos_retorna_catalogo(archivo_temporal, libros_con_datos):
+    """Verifica que cargar_datos retorne un catálogo indexado."""
+    guardar_datos(Catalogo(libros_con_datos), archivo_temporal)
+
+    catalogo = cargar_datos(archivo_temporal)
+
+    assert isinstance(catalogo, Catalogo)
+    assert catalogo.buscar_por_id("002")["prestado_a"] == "Juan Pérez"
+
+
+def test_diario_no_reescribe_el_archivo(archivo_temporal, libros_con_datos):
+    """Verifica que en modo diario el préstamo se añada al diario."""
+    guardar_datos(libros_con_datos, archivo_temporal)
+    contenido_inicial = Path(archivo_temporal).read_text(encoding="utf-8")
+
+    prestar_libro(libros_con_datos, "001", "Ana", archivo_temporal, diario=True)
+    devolver_libro(libros_con_datos, "002", archivo_temporal, diario=True)
+
+    assert Path(archivo_temporal).read_text(encoding="utf-8") == contenido_inicial
+    lineas = Path(ruta_diario(archivo_temporal)).read_text(encoding="utf-8")
+    entradas = 2
+    assert len(lineas.splitlines()) == entradas
+
+
+def test_cargar_datos_reaplica_diario(archivo_temporal, libros_con_datos):
+    """Verifica que cargar_datos aplique el diario sobre la instantánea."""
+    guardar_datos(libros_con_datos, archivo_temporal)
+    prestar_libro(libros_con_datos, "001", "Ana", archivo_temporal, diario=True)
+    devolver_libro(libros_con_datos, "002", archivo_temporal, diario=True)
+
+    catalogo = cargar_datos(archivo_temporal)
+
+    assert catalogo.buscar_por_id("001")["prestado_a"] == "Ana"
+    assert catalogo.buscar_por_id("002")["prestado_a"] is None
+
+
+def test_diario_ignora_linea_incompleta(archivo_temporal, libros_con_datos):
+    """Verifica que una última línea truncada no invalide el diario."""
+    guardar_datos(libros_con_datos, archivo_temporal)
+    prestar_libro(libros_con_datos, "001", "Ana", archivo_temporal, diario=True)
+    with open(ruta_diario(archivo_temporal), "a", encoding="utf-8") as f:
+        f.write('{"libro_id": "003", "prest')
+
+    catalogo = cargar_datos(archivo_temporal)
+
+    assert catalogo.buscar_por_id("001")["prestado_a"] == "Ana"
+    assert catalogo.buscar_por_id("003")["prestado_a"] is None
+    assert aplicar_diario(catalogo, archivo_temporal) == 1
+
+
+def test_diario_se_compacta_al_superar_umbral(
+    monkeypatch, archivo_temporal, libros_con_datos
+):
+    """Verifica que el diario se integre al superar el umbral."""
+    monkeypatch.setattr("Biblioteca.UMBRAL_COMPACTACION", 0)
+    guardar_datos(libros_con_datos, archivo_temporal)
+
+    prestar_libro(libros_con_datos, "001", "Ana", archivo_temporal, diario=True)
+
+    assert not Path(ruta_diario(archivo_temporal)).exists()
+    with open(archivo_temporal, encoding="utf-8") as f:
+        datos = json.load(f)
+    assert datos[0]["prestado_a"] == "Ana"
+
+
+def test_dos_puestos_prestan_libros_distintos(archivo_temporal, libros_con_datos):
+    """Verifica que dos puestos presten sin pisarse ni recargar todo."""
+    guardar_datos(libros_con_datos, archivo_temporal)
+    puesto_a = cargar_datos(archivo_temporal)
+    puesto_b = cargar_datos(archivo_temporal)
+
+    assert prestar_libro(puesto_a, "001", "Ana", archivo_temporal, diario=True)
+    assert prestar_libro(puesto_b, "003", "Luis", archivo_temporal, diario=True)
+
+    # El puesto B incorporó el préstamo de A leyendo solo el diario
+    assert puesto_b.buscar_por_id("001")["prestado_a"] == "Ana"
+    assert sincronizar_catalogo(puesto_a, archivo_temporal) == 1
+    assert puesto_a.buscar_por_id("003")["prestado_a"] == "Luis"
+
+    catalogo = cargar_datos(archivo_temporal)
+    assert catalogo.buscar_por_id("001")["prestado_a"] == "Ana"
+    assert catalogo.buscar_por_id("003")["prestado_a"] == "Luis"
+
+
+def test_dos_puestos_mismo_libro(archivo_temporal, libros_con_datos):
+    """Verifica que el segundo puesto vea el préstamo del primero."""
+    guardar_datos(libros_con_datos, archivo_temporal)
+    puesto_a = cargar_datos(archivo_temporal)
+    puesto_b = cargar_datos(archivo_temporal)
+
+    assert prestar_libro(puesto_a, "001", "Ana", archivo_temporal, diario=True)
+    prestado = prestar_libro(puesto_b, "001", "Luis", archivo_temporal, diario=True)
+    assert prestado is False
+    resultados = prestar_libros_lote(
+        puesto_b, [("001", "Luis")], archivo_temporal, diario=True
+    )
+    assert resultados[0]["motivo"] == "ya prestado"
+
+    catalogo = cargar_datos(archivo_temporal)
+    assert catalogo.buscar_por_id("001")["prestado_a"] == "Ana"
+
+
+def test_puesto_recarga_tras_compactacion_ajena(
+    monkeypatch, archivo_temporal, libros_con_datos
+):
+    """Verifica la recarga completa cuando otro puesto compacta el diario."""
+    guardar_datos(libros_con_datos, archivo_temporal)
+    puesto_a = cargar_datos(archivo_temporal)
+    puesto_b = cargar_datos(archivo_temporal)
+
+    monkeypatch.setattr("Biblioteca.UMBRAL_COMPACTACION", 0)
+    prestar_libro(puesto_a, "001", "Ana", archivo_temporal, diario=True)
+    devolver_libro(puesto_a, "001", archivo_temporal, diario=True)
+    assert not Path(ruta_diario(archivo_temporal)).exists()
+    monkeypatch.setattr("Biblioteca.UMBRAL_COMPACTACION", 1024 * 1024)
+
+    assert devolver_libro(puesto_b, "002", archivo_temporal, diario=True)
+    assert prestar_libro(puesto_a, "002", "Eva", archivo_temporal, diario=True)
+
+    catalogo = cargar_datos(archivo_temporal)
+    assert catalogo.buscar_por_id("001")["prestado_a"] is None
+    assert catalogo.buscar_por_id("002")["prestado_a"] == "Eva"
+
+
+def test_diario_cierra_linea_incompleta_al_escribir(archivo_temporal, libros_con_datos):
+    """Verifica que una línea truncada no se mezcle con la siguiente."""
+    guardar_datos(libros_con_datos, archivo_temporal)
+    catalogo = cargar_datos(archivo_temporal)
+    with open(ruta_diario(archivo_temporal), "a", encoding="utf-8") as f:
+        f.write('{"libro_id": "003", "prest')
+
+    prestar_libro(catalogo, "001", "Ana", archivo_temporal, diario=True)
+
+    recargado = cargar_datos(archivo_temporal)
+    assert recargado.buscar_por_id("001")["prestado_a"] == "Ana"
+    tamano_diario = Path(ruta_diario(archivo_temporal)).stat().st_size
+    assert recargado.posicion_diario == tamano_diario
+
+
+def test_cache_evita_releer_el_json(archivo_temporal, libros_con_datos, monkeypatch):
+    """Verifica que la segunda carga use la caché y luego aplique el diario."""
+    guardar_datos(libros_con_datos, archivo_temporal)
+    catalogo = cargar_datos(archivo_temporal)
+    assert Path(ruta_cache(archivo_temporal)).exists()
+    prestar_libro(catalogo, "001", "Ana", archivo_temporal, diario=True)
+
+    def sin_json(*args, **kwargs):
+        raise AssertionError("no debería leerse el JSON")
+
+    monkeypatch.setattr("Biblioteca.iterar_libros_json", sin_json)
+    recargado = cargar_datos(archivo_temporal)
+    assert recargado.buscar_por_id("001")["prestado_a"] == "Ana"
+    assert [libro["libro_id"] for libro in recargado.buscar_texto("python")] == [
+        "003"
+    ]
+
+
+def test_cache_con_diario_aplicado(archivo_temporal, libros_con_datos):
+    """Verifica que una caché escrita con el diario aplicado cargue bien."""
+    guardar_datos(libros_con_datos, archivo_temporal)
+    prestar_libro(libros_con_datos, "001", "Ana", archivo_temporal, diario=True)
+    catalogo = cargar_datos(archivo_temporal)
+    devolver_libro(catalogo, "001", archivo_temporal, diario=True)
+
+    recargado = cargar_datos(archivo_temporal)
+
+    assert recargado.buscar_por_id("001")["prestado_a"] is None
+    assert recargado.cantidad_prestamos("Ana") == 0
+
+
+def test_cache_se_invalida_al_guardar(archivo_temporal, libros_con_datos):
+    """Verifica que una nueva instantánea no se cargue de la caché vieja."""
+    guardar_datos(libros_con_datos, archivo_temporal)
+    cargar_datos(archivo_temporal)
+    libros_con_datos[0]["titulo"] = "Título nuevo"
+    guardar_datos(libros_con_datos, archivo_temporal)
+
+    assert cargar_datos(archivo_temporal)[0]["titulo"] == "Título nuevo"
+
+
+def test_cache_danada_se_ignora(archivo_temporal, libros_con_datos):
+    """Verifica que una caché ilegible no impida cargar la biblioteca."""
+    guardar_datos(libros_con_datos, archivo_temporal)
+    Path(ruta_cache(archivo_temporal)).write_bytes(b"no es un pickle")
+
+    assert len(cargar_datos(archivo_temporal)) == len(libros_con_datos)
+
+
+def test_cache_que_no_se_escribe_no_pierde_la_carga(
+    archivo_temporal, libros_con_datos, monkeypatch
+):
+    """Verifica que un error al escribir la caché no descarte lo leído."""
+    guardar_datos(libros_con_datos, archivo_temporal)
+
+    def fallar(*args):
+        raise pickle.PicklingError("no se puede serializar")
+
+    monkeypatch.setattr("pickle.dump", fallar)
+
+    assert len(cargar_datos(archivo_temporal)) == len(libros_con_datos)
+    assert not Path(ruta_cache(archivo_temporal)).exists()
+
+
+def test_busqueda_en_script_no_importa_la_interfaz(tmp_path):
+    """Verifica que cargar y buscar en modo silencioso no cargue Rich ni NumPy."""
+    archivo = tmp_path / "biblioteca.json"
+    guardar_datos([{"libro_id": "1", "titulo": "Rayuela", "isbn": "1"}], str(archivo))
+    codigo = (
+        "import sys\n"
+        "from Biblioteca import buscar_libro, cargar_datos\n"
+        f"catalogo = cargar_datos({str(archivo)!r}, silencioso=True)\n"
+        "assert buscar_libro(catalogo, 'rayu', silencioso=True)\n"
+        "assert not buscar_libro(catalogo, 'quijote', silencioso=True)\n"
+        "print(sorted({'rich', 'numpy'} & {m.split('.')[0] for m in sys.modules}))"
+    )
+    salida = subprocess.run(
+        [sys.executable, "-c", codigo],
+        cwd=Path(__file__).resolve().parent.parent,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert salida.stdout.strip() == "[]"
+    assert salida.stderr == ""
+
+
+def test_agregar_libros_deshace_si_no_se_guarda(tmp_path, libros_con_datos):
+    """Verifica que los libros agregados se quiten si falla el guardado."""
+    catalogo = Catalogo(libros_con_datos)
+    archivo = str(tmp_path / "no_existe" / "biblioteca.json")
+
+    nuevo = {"libro_id": "100", "titulo": "Rayuela"}
+    resultados = agregar_libros(catalogo, [nuevo], archivo)
+
+    assert resultados[0]["motivo"] == MOTIVO_ERROR_GUARDADO
+    assert len(catalogo) == len(libros_con_datos)
+    assert catalogo.buscar_por_id("100") is None
+
+
+def test_buscar_libro_con_catalogo_usa_indice(libros_con_datos):
+    """Verifica la búsqueda por prefijo y varios términos en un catálogo."""
+    catalogo = Catalogo(libros_con_datos)
+
+    resultados = buscar_libro(catalogo, "test auth 1")
+    assert [libro["libro_id"] for libro in resultados] == ["001", "003"]
+
+    resultados = buscar_libro(catalogo, "pyth")
+    assert resultados[0]["titulo"] == "Python Programming"
+
+
+def test_iterar_libros_json_por_bloques(archivo_temporal, libros_con_datos):
+    """Verifica la lectura incremental con bloques muy pequeños."""
+    guardar_datos(libros_con_datos, archivo_temporal)
+    avances = []
+
+    libros = list(
+        iterar_libros_json(
+            archivo_temporal,
+            tam_bloque=7,
+            progreso=lambda leidos, total: avances.append((leidos, total)),
+        )
+    )
+
+    assert libros == libros_con_datos
+    tamano = Path(archivo_temporal).stat().st_size
+    assert avances[-1] == (tamano, tamano)
+
+
+def test_iterar_libros_json_arreglo_vacio(archivo_temporal):
+    """Verifica la lectura de un arreglo vacío."""
+    Path(archivo_temporal).write_text(" [ ] ", encoding="utf-8")
+    assert list(iterar_libros_json(archivo_temporal)) == []
+
+
+def test_iterar_libros_json_invalido(archivo_temporal):
+    """Verifica que un arreglo truncado lance JSONDecodeError."""
+    Path(archivo_temporal).write_text('[{"libro_id": "001"}, {"li', encoding="utf-8")
+
+    with pytest.raises(json.JSONDecodeError):
+        list(iterar_libros_json(archivo_temporal, tam_bloque=4))
+
+
+def test_cargar_datos_archivo_corrupto(archivo_temporal):
+    """Verifica que un archivo corrupto retorne un catálogo vacío."""
+    Path(archivo_temporal).write_text('{"no es": "un arreglo"}', encoding="utf-8")
+    assert len(cargar_datos(archivo_temporal)) == 0
+
+
+def test_libro_conversion_desde_y_hacia_dict(libros_con_datos):
+    """Verifica la conversión entre Libro y el esquema de diccionario."""
+    libro = Libro.desde_dict(libros_con_datos[1])
+
+    assert libro.prestado_a == "Juan Pérez"
+    assert libro.a_dict() == {**libros_con_datos[1], "fecha_vencimiento": None}
+
+
+def test_libro_admite_acceso_por_clave():
+    """Verifica que Libro se use igual que un diccionario."""
+    libro = Libro(libro_id="010", titulo="Rayuela", autor="Julio Cortázar")
+
+    libro["prestado_a"] = "Ana"
+
+    assert libro["prestado_a"] == "Ana"
+    assert libro.get("isbn", "sin isbn") is None
+    assert libro.get("editorial", "-") == "-"
+    assert "titulo" in libro
+    with pytest.raises(KeyError):
+        libro["editorial"]
+
+
+def test_libro_no_tiene_dict_por_instancia():
+    """Verifica que Libro use __slots__."""
+    libro = Libro(libro_id="010", titulo="Rayuela")
+    assert not hasattr(libro, "__dict__")
+
+
+def test_funciones_con_libros_compactos(archivo_temporal, libros_con_datos):
+    """Verifica que las funciones trabajen sobre registros Libro."""
+    guardar_datos(libros_con_datos, archivo_temporal)
+    catalogo = cargar_datos(archivo_temporal)
+    assert isinstance(catalogo[0], Libro)
+
+    assert prestar_libro(catalogo, "001", "Ana", archivo_temporal) is True
+    prestados = 2
+    assert len(ver_libros_prestados(catalogo)) == prestados
+    assert buscar_libro(catalogo, "python")[0].libro_id == "003"
+
+    with open(archivo_temporal, encoding="utf-8") as f:
+        datos = json.load(f)
+    assert datos[0]["prestado_a"] == "Ana"
+
+
+def test_catalogo_mantiene_indice_de_prestados(archivo_temporal, libros_con_datos):
+    """Verifica que el índice de prestados siga a préstamos y devoluciones."""
+    catalogo = Catalogo(libros_con_datos)
+    assert [libro["libro_id"] for libro in catalogo.prestados()] == ["002"]
+
+    prestar_libro(catalogo, "003", "Ana", archivo_temporal)
+    devolver_libro(catalogo, "002", archivo_temporal)
+
+    assert [libro["libro_id"] for libro in catalogo.prestados()] == ["003"]
+
+
+def test_prestar_libros_lote(archivo_temporal, libros_con_datos):
+    """Verifica el resultado por solicitud de un lote de préstamos."""
+    catalogo = Catalogo(libros_con_datos)
+
+    resultados = prestar_libros_lote(
+        catalogo,
+        [("001", "Ana"), ("002", "Luis"), ("999", "Eva"), ("001", "Leo")],
+        archivo_temporal,
+    )
+
+    assert [r["exito"] for r in resultados] == [True, False, False, False]
+    assert [r["motivo"] for r in resultados] == [
+        None,
+        "ya prestado",
+        "no encontrado",
+        "duplicado en el lote",
+    ]
+    assert catalogo.buscar_por_id("001")["prestado_a"] == "Ana"
+
+
+def test_lote_persiste_una_sola_vez(monkeypatch, archivo_temporal, libros_con_datos):
+    """Verifica que el lote escriba el archivo una única vez."""
+    escrituras = []
+    monkeypatch.setattr(
+        "Biblioteca.guardar_datos", lambda libros, archivo: escrituras.append(1) or True
+    )
+
+    prestar_libros_lote(
+        libros_con_datos, [("001", "Ana"), ("003", "Luis")], archivo_temporal
+    )
+
+    assert escrituras == [1]
+
+
+def test_devolver_libros_lote(archivo_temporal, libros_con_datos):
+    """Verifica la devolución por lote y su persistencia."""
+    prestar_libros_lote(libros_con_datos, [("001", "Ana")], archivo_temporal)
+
+    resultados = devolver_libros_lote(
+        libros_con_datos, ["001", "002", "003"], archivo_temporal
+    )
+
+    assert [r["exito"] for r in resultados] == [True, True, False]
+    libros = cargar_datos(archivo_temporal)
+    assert libros.prestados() == []
+
+
+def test_lote_se_deshace_si_falla_el_guardado(monkeypatch, libros_con_datos):
+    """Verifica que un error al guardar deshaga todo el lote."""
+    monkeypatch.setattr("Biblioteca.guardar_datos", lambda libros, archivo: False)
+
+    resultados = prestar_libros_lote(
+        libros_con_datos, [("001", "Ana"), ("003", "Luis")], "no_importa.json"
+    )
+
+    assert all(r["motivo"] == "error al guardar" for r in resultados)
+    assert libros_con_datos[0]["prestado_a"] is None
+    assert libros_con_datos[2]["prestado_a"] is None
+
+
+def test_prestamo_individual_se_deshace_si_falla_el_guardado(
+    monkeypatch, libros_con_datos
+):
+    """Verifica que prestar o devolver deshaga el cambio si falla el guardado."""
+    monkeypatch.setattr("Biblioteca.guardar_datos", lambda libros, archivo: False)
+    catalogo = Catalogo(libros_con_datos)
+    prestado = catalogo.buscar_por_id("002")
+    anterior = (prestado["prestado_a"], prestado["fecha_prestamo"])
+
+    assert not prestar_libro(catalogo, "001", "Ana", "no_importa.json")
+    assert catalogo.buscar_por_id("001")["prestado_a"] is None
+    assert catalogo.cantidad_prestamos("Ana") == 0
+
+    assert not devolver_libro(catalogo, "002", "no_importa.json")
+    assert (prestado["prestado_a"], prestado["fecha_prestamo"]) == anterior
+    assert [libro["libro_id"] for libro in catalogo.prestados()] == ["002"]
+
+
+def test_paginar_libros(libros_con_datos):
+    """Verifica la división del catálogo en páginas."""
+    pagina, total = paginar_libros(libros_con_datos, 2, tam_pagina=2)
+    paginas = 2
+
+    assert total == paginas
+    assert [libro["libro_id"] for libro in pagina] == ["003"]
+
+
+def test_paginar_libros_ajusta_pagina_fuera_de_rango(libros_con_datos):
+    """Verifica que una página fuera de rango se ajuste a la última."""
+    pagina, total = paginar_libros(Catalogo(libros_con_datos), 99, tam_pagina=2)
+    assert [libro["libro_id"] for libro in pagina] == ["003"]
+
+    pagina, total = paginar_libros([], 1, tam_pagina=2)
+    assert pagina == []
+    assert total == 1
+
+
+def test_navegar_paginas_solo_renderiza_la_pagina(monkeypatch, libros_con_datos):
+    """Verifica la navegación y que cada vista reciba solo su página."""
+    paginas_mostradas = []
+    monkeypatch.setattr(
+        "Biblioteca.mostrar_libros",
+        lambda libros, titulo, mostrar_prestamo=False: paginas_mostradas.append(
+            [libro["libro_id"] for libro in libros]
+        ),
+    )
+    opciones = iter(["s", "a", "2", "x"])
+    monkeypatch.setattr("rich.prompt.Prompt.ask", lambda *a, **kw: next(opciones))
+
+    navegar_paginas(libros_con_datos, tam_pagina=2)
+
+    assert paginas_mostradas == [
+        ["001", "002"],
+        ["003"],
+        ["001", "002"],
+        ["003"],
+    ]
+
+
+def test_vistas_se_reutilizan_hasta_un_cambio(
+    monkeypatch, capsys, archivo_temporal, libros_con_datos
+):
+    """Verifica que una vista repetida no se vuelva a renderizar."""
+    catalogo = Catalogo([Libro.desde_dict(libro) for libro in libros_con_datos])
+    titulos = []
+    mostrar_original = Biblioteca.mostrar_libros
+
+    def mostrar_contando(libros, titulo, **opciones):
+        titulos.append(titulo)
+        mostrar_original(libros, titulo, **opciones)
+
+    monkeypatch.setattr("Biblioteca.mostrar_libros", mostrar_contando)
+
+    ver_libros_prestados(catalogo)
+    primera = capsys.readouterr().out
+    ver_libros_prestados(catalogo)
+    segunda = capsys.readouterr().out
+    assert titulos == ["Libros Prestados"]
+    assert primera == segunda
+    assert "Juan Pérez" in segunda
+
+    prestar_libro(catalogo, "003", "Ana", archivo_temporal)
+    capsys.readouterr()
+    ver_libros_prestados(catalogo)
+    assert titulos == ["Libros Prestados", "Libros Prestados"]
+    assert "Ana" in capsys.readouterr().out
+
+
+def test_guardar_datos_fallido_no_trunca_archivo(
+    monkeypatch, archivo_temporal, libros_con_datos
+):
+    """Verifica que un fallo al guardar conserve el archivo anterior."""
+    guardar_datos(libros_con_datos, archivo_temporal)
+
+    def fallar(*args):
+        raise OSError("disco lleno")
+
+    monkeypatch.setattr("os.replace", fallar)
+    libros_con_datos[0]["prestado_a"] = "Ana"
+
+    assert guardar_datos(libros_con_datos, archivo_temporal) is False
+    monkeypatch.undo()
+
+    libros = cargar_datos(archivo_temporal)
+    assert len(libros) == len(libros_con_datos)
+    assert libros.buscar_por_id("001")["prestado_a"] is None
+
+
+def test_prestar_asigna_fecha_vencimiento(archivo_temporal, libros_con_datos):
+    """Verifica que el préstamo registre su fecha de vencimiento."""
+    prestar_libro(libros_con_datos, "001", "Ana", archivo_temporal)
+
+    libro = buscar_libro_por_id(libros_con_datos, "001")
+    prestamo = datetime.fromisoformat(libro["fecha_prestamo"])
+    vencimiento = datetime.fromisoformat(libro["fecha_vencimiento"])
+    dias = 14
+    assert vencimiento - prestamo == timedelta(days=dias)
+
+    devolver_libro(libros_con_datos, "001", archivo_temporal)
+    assert libro["fecha_vencimiento"] is None
+
+
+def test_catalogo_indice_por_aprendiz(archivo_temporal, libros_con_datos):
+    """Verifica que el índice por aprendiz siga préstamos y devoluciones."""
+    catalogo = Catalogo(libros_con_datos)
+    prestar_libro(catalogo, "001", "Juan Pérez", archivo_temporal)
+    prestar_libro(catalogo, "003", "Ana", archivo_temporal)
+
+    prestamos = 2
+    assert catalogo.cantidad_prestamos("Juan Pérez") == prestamos
+    assert [libro["libro_id"] for libro in catalogo.prestamos_de("Juan Pérez")] == [
+        "001",
+        "002",
+    ]
+
+    devolver_libro(catalogo, "002", archivo_temporal)
+    devolver_libro(catalogo, "003", archivo_temporal)
+
+    assert catalogo.cantidad_prestamos("Juan Pérez") == 1
+    assert catalogo.prestamos_de("Ana") == []
+    assert [
+        libro["libro_id"]
+        for libro in obtener_prestamos_aprendiz(libros_con_datos, "Juan Pérez")
+    ] == ["001"]
+
+
+def test_limite_de_prestamos_por_aprendiz(archivo_temporal, libros_con_datos):
+    """Verifica que no se supere el máximo de préstamos por aprendiz."""
+    catalogo = Catalogo(libros_con_datos)
+    catalogo.max_prestamos = 2
+
+    assert prestar_libro(catalogo, "001", "Juan Pérez", archivo_temporal) is True
+    assert prestar_libro(catalogo, "003", "Juan Pérez", archivo_temporal) is False
+
+    devolver_libro(catalogo, "001", archivo_temporal)
+    resultados = prestar_libros_lote(
+        catalogo, [("001", "Juan Pérez"), ("003", "Juan Pérez")], archivo_temporal
+    )
+    assert [resultado["motivo"] for resultado in resultados] == [
+        None,
+        "límite de préstamos del aprendiz",
+    ]
+    assert prestar_libro(catalogo, "003", "Ana", archivo_temporal) is True
+
+
+def test_sin_limite_de_prestamos_por_defecto(archivo_temporal, libros_con_datos):
+    """Verifica que sin configurarlo no haya límite, ni con una lista simple."""
+    catalogo = Catalogo([dict(libro) for libro in libros_con_datos])
+
+    assert catalogo.max_prestamos is None
+    assert prestar_libro(catalogo, "001", "Juan Pérez", archivo_temporal) is True
+    assert prestar_libro(catalogo, "003", "Juan Pérez", archivo_temporal) is True
+    assert prestar_libro(libros_con_datos, "001", "Juan Pérez", archivo_temporal)
+
+
+def test_catalogo_vencidos_y_proximos(archivo_temporal, libros_con_datos):
+    """Verifica el índice de vencimientos del catálogo."""
+    catalogo = Catalogo(libros_con_datos)
+    prestar_libro(catalogo, "001", "Ana", archivo_temporal)
+    prestar_libro(catalogo, "003", "Luis", archivo_temporal)
+
+    # "002" se prestó el 2025-01-01 sin fecha de vencimiento guardada
+    assert [libro["libro_id"] for libro in catalogo.vencidos()] == ["002"]
+    assert [libro["libro_id"] for libro in catalogo.proximos_vencimientos(2)] == [
+        "002",
+        "001",
+    ]
+
+    dentro_de_un_mes = datetime.now() + timedelta(days=30)
+    vencidos = catalogo.vencidos(dentro_de_un_mes)
+    assert [libro["libro_id"] for libro in vencidos] == ["002", "001", "003"]
+
+
+def test_catalogo_vencimientos_ignora_devueltos(archivo_temporal, libros_con_datos):
+    """Verifica que las devoluciones salgan del índice de vencimientos."""
+    catalogo = Catalogo(libros_con_datos)
+    for _ in range(3):
+        prestar_libro(catalogo, "001", "Ana", archivo_temporal)
+        devolver_libro(catalogo, "001", archivo_temporal)
+    devolver_libro(catalogo, "002", archivo_temporal)
+
+    assert catalogo.proximos_vencimientos(5) == []
+
+
+def test_ver_libros_vencidos(archivo_temporal, libros_con_datos):
+    """Verifica la vista de vencidos con lista y con catálogo."""
+    prestar_libro(libros_con_datos, "001", "Ana", archivo_temporal)
+
+    assert [libro["libro_id"] for libro in ver_libros_vencidos(libros_con_datos)] == [
+        "002"
+    ]
+    catalogo = Catalogo(libros_con_datos)
+    assert ver_libros_vencidos(catalogo, ahora=datetime(2024, 1, 1)) == []
@@ -0,0 +1,139 @@
+"""
+Tests para los índices de búsqueda del catálogo de la biblioteca.
+"""
+
+import pytest
+
+from Biblioteca_busqueda import (
+    IndiceTexto,
+    IndiceTrigramas,
+    normalizar,
+    tokenizar,
+    trigramas,
+)
+
+
+@pytest.fixture
+def indice():
+    """Crea un índice con algunos libros de prueba."""
+    indice = IndiceTexto()
+    for libro in [
+        {
+            "libro_id": "001",
+            "titulo": "Cien Años de Soledad",
+            "autor": "Gabriel García Márquez",
+            "isbn": "978-0307474728",
+        },
+        {
+            "libro_id": "002",
+            "titulo": "Don Quijote de la Mancha",
+            "autor": "Miguel de Cervantes",
+            "isbn": "978-8424936464",
+        },
+        {
+            "libro_id": "003",
+            "titulo": "El amor en los tiempos del cólera",
+            "autor": "Gabriel García Márquez",
+            "isbn": "978-0307387264",
+        },
+    ]:
+        indice.actualizar(libro)
+    return indice
+
+
+def test_normalizar_quita_acentos_y_mayusculas():
+    """Verifica que la normalización ignore acentos y mayúsculas."""
+    assert normalizar("MÁRQUEZ Cólera") == "marquez colera"
+
+
+def test_tokenizar_separa_palabras():
+    """Verifica la separación en tokens."""
+    assert tokenizar("Don Quijote, de la Mancha") == [
+        "don",
+        "quijote",
+        "de",
+        "la",
+        "mancha",
+    ]
+
+
+def test_buscar_por_prefijo(indice):
+    """Verifica la búsqueda por prefijo de un término."""
+    assert indice.buscar("quij") == ["002"]
+
+
+def test_buscar_varios_terminos_and(indice):
+    """Verifica que todos los términos deban coincidir."""
+    assert indice.buscar("garcia") == ["001", "003"]
+    assert indice.buscar("garcia colera") == ["003"]
+    assert indice.buscar("garcia quijote") == []
+
+
+def test_buscar_sin_acentos(indice):
+    """Verifica que la búsqueda ignore los acentos de la consulta."""
+    assert indice.buscar("AÑOS") == indice.buscar("anos") == ["001"]
+
+
+def test_buscar_por_isbn(indice):
+    """Verifica la búsqueda por ISBN con y sin guiones."""
+    assert indice.buscar("9780307474728") == ["001"]
+    assert indice.buscar("978-8424936464") == ["002"]
+
+
+def test_consulta_vacia_retorna_none(indice):
+    """Verifica que una consulta sin términos retorne None."""
+    assert indice.buscar("  ") is None
+
+
+def test_actualizar_reemplaza_tokens(indice):
+    """Verifica que actualizar un libro quite sus tokens anteriores."""
+    indice.actualizar(
+        {"libro_id": "002", "titulo": "Rayuela", "autor": "Julio Cortázar"}
+    )
+
+    assert indice.buscar("quijote") == []
+    assert indice.buscar("cortazar") == ["002"]
+    libros = 3
+    assert len(indice) == libros
+
+
+def test_trigramas_con_relleno():
+    """Verifica los trigramas de una palabra, con relleno al inicio y al final."""
+    assert trigramas("sol") == {"  s", " so", "sol", "ol "}
+
+
+def test_trigramas_similares_y_quitar():
+    """Verifica el orden por similitud y que las palabras quitadas no aparezcan."""
+    trigramas_vocabulario = IndiceTrigramas()
+    for palabra in ["quijote", "quijotes", "soledad"]:
+        trigramas_vocabulario.agregar(palabra)
+
+    assert [p for p, _ in trigramas_vocabulario.similares("quijte")] == [
+        "quijote",
+        "quijotes",
+    ]
+    trigramas_vocabulario.quitar("quijote")
+    assert [p for p, _ in trigramas_vocabulario.similares("quijte")] == ["quijotes"]
+
+
+def test_buscar_aproximado_tolera_errores(indice):
+    """Verifica que la búsqueda aproximada encuentre títulos mal escritos."""
+    assert [libro_id for libro_id, _ in indice.buscar_aproximado("Quijte")] == ["002"]
+    assert indice.buscar_aproximado("Garsia Marques colra")[0][0] == "003"
+
+
+def test_buscar_aproximado_limita_resultados(indice):
+    """Verifica el límite de resultados y que se ignoren términos cortos."""
+    assert len(indice.buscar_aproximado("garcia", cantidad=1)) == 1
+    assert indice.buscar_aproximado("de 978") == []
+
+
+def test_buscar_aproximado_se_actualiza(indice):
+    """Verifica que el índice de trigramas siga los cambios del catálogo."""
+    assert indice.buscar_aproximado("quijote")
+    indice.actualizar(
+        {"libro_id": "002", "titulo": "Rayuela", "autor": "Julio Cortázar"}
+    )
+
+    assert indice.buscar_aproximado("quijote") == []
+    assert [libro_id for libro_id, _ in indice.buscar_aproximado("Raiuela")] == ["002"]
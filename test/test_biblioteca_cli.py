@@ -0,0 +1,133 @@
+"""
+Tests para la línea de comandos no interactiva de la biblioteca.
+"""
+
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from Biblioteca import cargar_datos, crear_biblioteca_inicial, guardar_datos
+from Biblioteca_cli import (
+    SALIDA_ENTRADA_INVALIDA,
+    SALIDA_EXITO,
+    SALIDA_RECHAZOS,
+    main,
+)
+
+
+@pytest.fixture
+def archivo_temporal(tmp_path):
+    """Crea un archivo de biblioteca temporal con los libros iniciales."""
+    archivo = str(tmp_path / "biblioteca.json")
+    guardar_datos(crear_biblioteca_inicial(), archivo)
+    return archivo
+
+
+def _ejecutar(capsys, monkeypatch, argv: list[str], entrada: str = ""):
+    """Ejecuta la CLI y retorna (código, líneas JSON de la salida)."""
+    monkeypatch.setattr("sys.stdin", io.StringIO(entrada))
+    codigo = main(argv)
+    salida = capsys.readouterr().out
+    return codigo, [json.loads(linea) for linea in salida.splitlines()]
+
+
+def test_prestar_desde_argumentos(archivo_temporal, capsys, monkeypatch):
+    """Verifica un préstamo simple y que la salida sea solo JSON."""
+    codigo, resultados = _ejecutar(
+        capsys, monkeypatch, ["prestar", "001", "Ana", "--archivo", archivo_temporal]
+    )
+
+    assert codigo == SALIDA_EXITO
+    assert resultados == [{"libro_id": "001", "exito": True, "motivo": None}]
+    assert cargar_datos(archivo_temporal).buscar_por_id("001")["prestado_a"] == "Ana"
+
+
+def test_lote_desde_entrada_con_rechazos(archivo_temporal, capsys, monkeypatch):
+    """Verifica el lote por la entrada estándar y el código con rechazos."""
+    entrada = "".join(
+        json.dumps({"libro_id": libro_id, "nombre_aprendiz": "Luis"}) + "\n"
+        for libro_id in ["001", "002", "999"]
+    )
+    codigo, resultados = _ejecutar(
+        capsys,
+        monkeypatch,
+        ["lend", "--archivo", archivo_temporal, "--diario", "--lote", "2"],
+        entrada,
+    )
+
+    assert codigo == SALIDA_RECHAZOS
+    assert [r["exito"] for r in resultados] == [True, True, False]
+    codigo, prestados = _ejecutar(
+        capsys, monkeypatch, ["list-lent", "--archivo", archivo_temporal]
+    )
+    assert [libro["libro_id"] for libro in prestados] == ["001", "002"]
+
+    entrada = '{"libro_id": "001"}\n\n{"libro_id": "002"}\n'
+    codigo, resultados = _ejecutar(
+        capsys, monkeypatch, ["return", "--archivo", archivo_temporal], entrada
+    )
+    assert codigo == SALIDA_EXITO
+    assert all(r["exito"] for r in resultados)
+
+
+def test_entrada_invalida(archivo_temporal, capsys, monkeypatch):
+    """Verifica el código de salida ante una línea JSON inválida."""
+    monkeypatch.setattr("sys.stdin", io.StringIO("{roto\n"))
+
+    assert main(["devolver", "--archivo", archivo_temporal]) == SALIDA_ENTRADA_INVALIDA
+    salida = capsys.readouterr()
+    assert salida.out == ""
+    assert "línea 1" in salida.err
+
+
+def test_importar_buscar_y_exportar(archivo_temporal, capsys, monkeypatch, tmp_path):
+    """Verifica la importación, la búsqueda y la exportación a un archivo."""
+    entrada = (
+        '{"libro_id": "100", "titulo": "Rayuela", "autor": "Julio Cortázar"}\n'
+        '{"libro_id": "001", "titulo": "Repetido"}\n'
+    )
+    codigo, [resumen] = _ejecutar(
+        capsys, monkeypatch, ["import", "--archivo", archivo_temporal], entrada
+    )
+    assert codigo == SALIDA_RECHAZOS
+    assert (resumen["leidas"], resumen["importadas"]) == (2, 1)
+
+    codigo, encontrados = _ejecutar(
+        capsys,
+        monkeypatch,
+        ["search", "raiuela", "--aproximado", "--archivo", archivo_temporal],
+    )
+    assert codigo == SALIDA_EXITO
+    assert encontrados[0]["autor"] == "Julio Cortázar"
+
+    destino = tmp_path / "catalogo.jsonl"
+    codigo, _ = _ejecutar(
+        capsys,
+        monkeypatch,
+        ["export", "--archivo", archivo_temporal, "--salida", str(destino)],
+    )
+    exportados = [json.loads(linea) for linea in destino.read_text().splitlines()]
+    assert codigo == SALIDA_EXITO
+    assert len(exportados) == len(crear_biblioteca_inicial()) + 1
+
+
+def test_respaldar_y_restaurar(archivo_temporal, capsys, monkeypatch, tmp_path):
+    """Verifica los respaldos desde la línea de comandos."""
+    respaldos = ["--archivo", archivo_temporal, "--directorio", str(tmp_path / "r")]
+    codigo, [completo] = _ejecutar(capsys, monkeypatch, ["backup", *respaldos])
+    _ejecutar(capsys, monkeypatch, ["prestar", "003", "Eva", *respaldos[:2]])
+    codigo, [delta] = _ejecutar(capsys, monkeypatch, ["backup", *respaldos])
+    assert codigo == SALIDA_EXITO
+    assert (completo["tipo"], delta["tipo"], delta["libros"]) == (
+        "completo",
+        "delta",
+        1,
+    )
+
+    Path(archivo_temporal).unlink()
+    codigo, [restaurado] = _ejecutar(capsys, monkeypatch, ["restore", *respaldos])
+    assert codigo == SALIDA_EXITO
+    assert restaurado["numero"] == delta["numero"]
+    assert cargar_datos(archivo_temporal).buscar_por_id("003")["prestado_a"] == "Eva"
@@ -0,0 +1,165 @@
+"""
+Tests para el historial de préstamos de la biblioteca.
+"""
+
+import json
+
+import numpy as np
+import pytest
+
+from Biblioteca import (
+    Catalogo,
+    devolver_libro,
+    devolver_libros_lote,
+    guardar_datos,
+    prestar_libro,
+    prestar_libros_lote,
+)
+from Biblioteca_historial import (
+    SIN_DEVOLVER,
+    HistorialPrestamos,
+    cargar_historial,
+    ruta_historial,
+)
+
+
+@pytest.fixture
+def archivo_temporal(tmp_path):
+    """Crea la ruta de un archivo de biblioteca temporal."""
+    return str(tmp_path / "biblioteca.json")
+
+
+@pytest.fixture
+def libros():
+    """Crea tres libros disponibles."""
+    return [
+        {
+            "libro_id": f"00{i}",
+            "titulo": f"Libro {i}",
+            "autor": "Autor",
+            "isbn": str(i),
+            "prestado_a": None,
+            "fecha_prestamo": None,
+        }
+        for i in range(1, 4)
+    ]
+
+
+def test_consultas_del_historial():
+    """Verifica los más prestados, los aprendices y la duración promedio."""
+    historial = HistorialPrestamos(capacidad=1)
+    prestamos = [
+        ("001", "Ana", "2025-01-01T00:00:00", "2025-01-03T00:00:00"),
+        ("001", "Luis", "2025-01-05T00:00:00", "2025-01-09T00:00:00"),
+        ("002", "Ana", "2025-01-01T00:00:00", "2025-01-07T00:00:00"),
+    ]
+    for libro_id, aprendiz, inicio, fin in prestamos:
+        historial.registrar_prestamo(libro_id, aprendiz, inicio)
+        historial.registrar_devolucion(libro_id, aprendiz, inicio, fin)
+    historial.registrar_prestamo("003", "Ana", "2025-02-01T00:00:00")
+
+    total = 4
+    assert len(historial) == total
+    assert historial.mas_prestados(1) == [("001", 2)]
+    assert historial.aprendices_mas_activos() == [("Ana", 3), ("Luis", 1)]
+    # Solo cuentan los préstamos devueltos: (2 + 4 + 6) / 3 días
+    promedio = 4.0
+    assert historial.duracion_promedio() == promedio
+
+
+def test_historial_vacio():
+    """Verifica las consultas sobre un historial sin préstamos."""
+    historial = HistorialPrestamos()
+
+    assert historial.mas_prestados() == []
+    assert historial.duracion_promedio() is None
+
+
+def test_desde_codigos_permite_cerrar_prestamos_abiertos():
+    """Verifica la carga por columnas codificadas."""
+    historial = HistorialPrestamos.desde_codigos(
+        ["001", "002"],
+        ["Ana"],
+        {
+            "libro": np.array([0, 1, 1]),
+            "aprendiz": np.array([0, 0, 0]),
+            "inicio": np.array([0, 0, 0]),
+            "fin": np.array([86_400, 86_400, SIN_DEVOLVER]),
+        },
+    )
+    historial.registrar_devolucion("002", "Ana", None, "1970-01-04T00:00:00")
+
+    assert historial.mas_prestados() == [("002", 2), ("001", 1)]
+    assert historial.duracion_promedio() is not None
+
+
+def test_devoluciones_se_guardan_en_archivo(archivo_temporal, libros):
+    """Verifica que las devoluciones sencillas y por lote queden en disco."""
+    guardar_datos(libros, archivo_temporal)
+    prestar_libro(libros, "001", "Ana", archivo_temporal)
+    devolver_libro(libros, "001", archivo_temporal)
+    prestar_libros_lote(libros, [("002", "Luis"), ("003", "Eva")], archivo_temporal)
+    devolver_libros_lote(libros, ["002", "003", "999"], archivo_temporal)
+
+    with open(ruta_historial(archivo_temporal), encoding="utf-8") as f:
+        prestamos = [json.loads(linea) for linea in f]
+    assert [(p["libro_id"], p["aprendiz"]) for p in prestamos] == [
+        ("001", "Ana"),
+        ("002", "Luis"),
+        ("003", "Eva"),
+    ]
+    assert all(p["inicio"] <= p["fin"] for p in prestamos)
+
+
+def test_devolucion_tras_una_linea_cortada(archivo_temporal, libros):
+    """Verifica que una línea cortada a medias no arrastre la devolución."""
+    guardar_datos(libros, archivo_temporal)
+    prestar_libro(libros, "001", "Ana", archivo_temporal)
+    devolver_libro(libros, "001", archivo_temporal)
+    ruta = ruta_historial(archivo_temporal)
+    with open(ruta, "rb+") as f:
+        f.truncate(f.seek(0, 2) - 10)
+
+    prestar_libro(libros, "002", "Luis", archivo_temporal)
+    devolver_libro(libros, "002", archivo_temporal)
+
+    assert cargar_historial(archivo_temporal).mas_prestados() == [("002", 1)]
+
+
+def test_cargar_historial_usa_el_indice_de_prestados(
+    archivo_temporal, libros, monkeypatch
+):
+    """Verifica que con un catálogo no se recorran todos los libros."""
+    libros[1]["prestado_a"] = "Luis"
+    libros[1]["fecha_prestamo"] = "2025-01-01T10:00:00"
+    catalogo = Catalogo(libros)
+
+    def sin_recorrer(self):
+        raise AssertionError("se recorrió todo el catálogo")
+
+    monkeypatch.setattr(Catalogo, "__iter__", sin_recorrer)
+    historial = cargar_historial(archivo_temporal, catalogo)
+
+    assert historial.aprendices_mas_activos() == [("Luis", 1)]
+
+
+def test_catalogo_con_historial_en_memoria(archivo_temporal, libros):
+    """Verifica que un catálogo con historial lo mantenga al día."""
+    guardar_datos(libros, archivo_temporal)
+    prestar_libro(libros, "001", "Ana", archivo_temporal)
+    devolver_libro(libros, "001", archivo_temporal)
+    prestar_libro(libros, "002", "Luis", archivo_temporal)
+
+    catalogo = Catalogo(libros)
+    catalogo.historial = cargar_historial(archivo_temporal, catalogo)
+    prestar_libro(catalogo, "001", "Eva", archivo_temporal)
+    devolver_libro(catalogo, "002", archivo_temporal)
+
+    total = 3
+    assert len(catalogo.historial) == total
+    assert catalogo.historial.mas_prestados(1) == [("001", 2)]
+    assert catalogo.historial.aprendices_mas_activos(3) == [
+        ("Ana", 1),
+        ("Luis", 1),
+        ("Eva", 1),
+    ]
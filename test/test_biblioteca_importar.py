@@ -0,0 +1,120 @@
+"""
+Tests para la importación masiva del catálogo de la biblioteca.
+"""
+
+import io
+
+import pytest
+
+from Biblioteca import Catalogo, cargar_datos, crear_biblioteca_inicial, guardar_datos
+from Biblioteca_importar import (
+    MOTIVO_ID_REPETIDO,
+    MOTIVO_ILEGIBLE,
+    MOTIVO_ISBN_REPETIDO,
+    es_isbn_valido,
+    formato_de_archivo,
+    importar_archivo,
+    importar_catalogo,
+    leer_filas,
+    validar_libro,
+)
+from Validar_datos_genericos import es_texto_no_vacio, valor_de_clave
+
+CSV_CATALOGO = """libro_id,titulo,autor,isbn,editorial
+100,Rayuela,Julio Cortázar,978-8437604572,Cátedra
+101,Rayuela (otra edición),Julio Cortázar,978 8437604572,Alfaguara
+102,Ficciones,Jorge Luis Borges,,Emecé
+103,  ,Sin título,978-0000000001,
+104,Pedro Páramo,Juan Rulfo,12345,
+001,Repetido,Alguien,978-1111111111,
+105,Cien años repetido,Gabriel García Márquez,9780307474728,
+"""
+
+
+@pytest.fixture
+def archivo_temporal(tmp_path):
+    """Crea un archivo de biblioteca temporal con los libros iniciales."""
+    archivo = str(tmp_path / "biblioteca.json")
+    guardar_datos(crear_biblioteca_inicial(), archivo)
+    return archivo
+
+
+def test_es_isbn_valido():
+    """Verifica la forma de ISBN-10 e ISBN-13, con guiones o espacios."""
+    assert es_isbn_valido("978-84-376-0457-2") is True
+    assert es_isbn_valido("0-306-40615-X") is True
+    assert es_isbn_valido("12345") is False
+    assert es_isbn_valido(9788437604572) is False
+
+
+def test_validar_libro_con_reglas_propias():
+    """Verifica el motivo de descarte con las reglas por defecto y propias."""
+    assert validar_libro({"libro_id": "1", "titulo": "Rayuela"}) is None
+    assert validar_libro({"libro_id": "1"}) == "falta titulo"
+    reglas = [("falta autor", valor_de_clave("autor", es_texto_no_vacio))]
+    assert validar_libro({"libro_id": "1", "titulo": "X"}, reglas) == "falta autor"
+
+
+def test_importar_csv_deduplica_y_guarda(archivo_temporal):
+    """Verifica validación, deduplicación por ISBN e ID y persistencia."""
+    catalogo = cargar_datos(archivo_temporal)
+    previos = len(catalogo)
+
+    filas = leer_filas(io.StringIO(CSV_CATALOGO), "csv")
+    resumen = importar_catalogo(catalogo, filas, archivo_temporal)
+
+    assert (resumen.leidas, resumen.importadas) == (7, 2)
+    assert resumen.descartadas == {
+        MOTIVO_ISBN_REPETIDO: 2,
+        "falta titulo": 1,
+        "isbn inválido": 1,
+        MOTIVO_ID_REPETIDO: 1,
+    }
+    assert resumen.guardado is True
+    assert resumen.filas_por_segundo > 0
+    assert [libro["libro_id"] for libro in catalogo.buscar_texto("cortazar")] == ["100"]
+
+    recargado = cargar_datos(archivo_temporal)
+    assert len(recargado) == previos + 2
+    assert recargado.buscar_por_id("102")["isbn"] is None
+    assert recargado.buscar_por_id("102")["prestado_a"] is None
+
+
+def test_importar_jsonl_con_lineas_ilegibles(tmp_path):
+    """Verifica que las líneas ilegibles se cuenten sin detener la importación."""
+    ruta = tmp_path / "catalogo.jsonl"
+    ruta.write_text(
+        '{"libro_id": "1", "titulo": "Rayuela", "isbn": "9788437604572"}\n'
+        "{roto\n"
+        "[1, 2]\n"
+        '{"libro_id": "2", "titulo": "Ficciones"}\n',
+        encoding="utf-8",
+    )
+    libros = []
+
+    resumen = importar_archivo(libros, str(ruta), str(tmp_path / "biblioteca.json"))
+
+    assert [libro["libro_id"] for libro in libros] == ["1", "2"]
+    assert resumen.importadas == len(libros)
+    assert resumen.descartadas == {MOTIVO_ILEGIBLE: 2}
+
+
+def test_importar_sin_guardar_deshace(tmp_path):
+    """Verifica que si no se puede guardar no quede nada importado."""
+    catalogo = Catalogo()
+    archivo = str(tmp_path / "no_existe" / "biblioteca.json")
+
+    filas = [{"libro_id": "1", "titulo": "Rayuela"}]
+    resumen = importar_catalogo(catalogo, filas, archivo)
+
+    assert resumen.guardado is False
+    assert resumen.importadas == 0
+    assert len(catalogo) == 0
+
+
+def test_formato_de_archivo():
+    """Verifica la detección del formato por la extensión."""
+    assert formato_de_archivo("datos.CSV") == "csv"
+    assert formato_de_archivo("datos.ndjson") == "jsonl"
+    with pytest.raises(ValueError):
+        formato_de_archivo("datos.xlsx")
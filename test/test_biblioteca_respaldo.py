@@ -0,0 +1,114 @@
+"""
+Tests para los respaldos incrementales de la biblioteca.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from Biblioteca import (
+    a_dict,
+    agregar_libros,
+    anotar_cambios,
+    cargar_datos,
+    crear_biblioteca_inicial,
+    devolver_libro,
+    guardar_datos,
+    prestar_libro,
+    ruta_cambios,
+)
+from Biblioteca_respaldo import (
+    TIPO_COMPLETO,
+    TIPO_DELTA,
+    leer_respaldo,
+    listar_respaldos,
+    respaldar,
+    restaurar,
+)
+
+
+@pytest.fixture
+def archivo_temporal(tmp_path):
+    """Crea un archivo de biblioteca temporal con los libros iniciales."""
+    archivo = str(tmp_path / "biblioteca.json")
+    guardar_datos(crear_biblioteca_inicial(), archivo)
+    return archivo
+
+
+def _estado(archivo: str) -> list[dict]:
+    """Lee la biblioteca como lista de diccionarios."""
+    return [a_dict(libro) for libro in cargar_datos(archivo, cache=False)]
+
+
+def test_sin_respaldo_no_se_anotan_cambios(archivo_temporal):
+    """Verifica que el registro de cambios no crece si no hay respaldos."""
+    anotar_cambios(["001"], archivo_temporal)
+
+    assert not Path(ruta_cambios(archivo_temporal)).exists()
+
+
+def test_delta_contiene_solo_los_libros_modificados(archivo_temporal, tmp_path):
+    """Verifica que tras el respaldo completo solo se respaldan los cambios."""
+    directorio = tmp_path / "respaldos"
+    primero = respaldar(archivo_temporal, directorio)
+    libros = cargar_datos(archivo_temporal)
+    prestar_libro(libros, "001", "Ana", archivo_temporal)
+    agregar_libros(libros, [{"libro_id": "100", "titulo": "Rayuela"}], archivo_temporal)
+
+    segundo = respaldar(archivo_temporal, directorio)
+    tercero = respaldar(archivo_temporal, directorio)
+
+    assert primero.tipo == TIPO_COMPLETO
+    assert primero.libros == len(crear_biblioteca_inicial())
+    assert segundo.tipo == TIPO_DELTA
+    assert [libro["libro_id"] for libro in leer_respaldo(segundo.ruta)] == [
+        "001",
+        "100",
+    ]
+    assert (tercero.tipo, tercero.libros) == (TIPO_DELTA, 0)
+
+
+def test_restaurar_reaplica_los_deltas(archivo_temporal, tmp_path):
+    """Verifica que restaurar reproduce el estado de cada respaldo."""
+    directorio = tmp_path / "respaldos"
+    respaldar(archivo_temporal, directorio)
+    libros = cargar_datos(archivo_temporal)
+    prestar_libro(libros, "002", "Luis", archivo_temporal, diario=True)
+    respaldar(archivo_temporal, directorio)
+    estado_prestado = _estado(archivo_temporal)
+    devolver_libro(libros, "002", archivo_temporal, diario=True)
+    respaldar(archivo_temporal, directorio)
+    estado_final = _estado(archivo_temporal)
+
+    Path(archivo_temporal).write_text("dañado", encoding="utf-8")
+    restaurado = restaurar(archivo_temporal, directorio)
+
+    assert restaurado.numero == len(listar_respaldos(directorio))
+    assert _estado(archivo_temporal) == estado_final
+    restaurar(archivo_temporal, directorio, hasta=restaurado.numero - 1)
+    assert _estado(archivo_temporal) == estado_prestado
+    # Tras restaurar no se sabe qué cambió: el siguiente es completo
+    assert respaldar(archivo_temporal, directorio).tipo == TIPO_COMPLETO
+
+
+def test_respaldo_completo_periodico(archivo_temporal, tmp_path):
+    """Verifica que tras varios deltas el siguiente respaldo es completo."""
+    directorio = tmp_path / "respaldos"
+    tipos = [
+        respaldar(archivo_temporal, directorio, deltas_por_completo=2).tipo
+        for _ in range(5)
+    ]
+
+    assert tipos == [
+        TIPO_COMPLETO,
+        TIPO_DELTA,
+        TIPO_DELTA,
+        TIPO_COMPLETO,
+        TIPO_DELTA,
+    ]
+
+
+def test_restaurar_sin_respaldo_completo(archivo_temporal, tmp_path):
+    """Verifica el error cuando no hay un respaldo completo."""
+    with pytest.raises(FileNotFoundError):
+        restaurar(archivo_temporal, tmp_path / "vacio")
@@ -0,0 +1,214 @@
+"""
+Tests para el servicio HTTP asíncrono de la biblioteca.
+"""
+
+import asyncio
+import json
+import threading
+from http import HTTPStatus
+
+import pytest
+
+import Biblioteca_servidor
+import Biblioteca_sqlite
+from Biblioteca import Catalogo, Libro, cargar_datos, guardar_datos
+from Biblioteca_servidor import ClienteBiblioteca, ServidorBiblioteca
+
+
+@pytest.fixture
+def archivo_temporal(tmp_path):
+    """Crea un archivo de biblioteca temporal con tres libros."""
+    archivo = str(tmp_path / "biblioteca.json")
+    guardar_datos(
+        [
+            {
+                "libro_id": f"00{i}",
+                "titulo": titulo,
+                "autor": autor,
+                "isbn": f"978-{i}",
+                "prestado_a": None,
+                "fecha_prestamo": None,
+            }
+            for i, (titulo, autor) in enumerate(
+                [
+                    ("Cien años de soledad", "Gabriel García Márquez"),
+                    ("Don Quijote", "Miguel de Cervantes"),
+                    ("El amor en los tiempos del cólera", "Gabriel García Márquez"),
+                ],
+                start=1,
+            )
+        ],
+        archivo,
+    )
+    return archivo
+
+
+def _con_servidor(archivo: str, prueba) -> object:
+    """Ejecuta la corrutina ``prueba(servidor, puerto)`` con el servidor activo."""
+
+    async def ejecutar():
+        servidor = ServidorBiblioteca(cargar_datos(archivo), archivo)
+        puerto = await servidor.iniciar(puerto=0)
+        try:
+            return await prueba(servidor, puerto)
+        finally:
+            await servidor.cerrar()
+
+    return asyncio.run(ejecutar())
+
+
+def test_prestar_y_devolver(archivo_temporal):
+    """Verifica los códigos y resultados de préstamo y devolución."""
+
+    async def prueba(servidor, puerto):
+        async with ClienteBiblioteca(puerto) as cliente:
+            assert await cliente.prestar("001", "Ana") == (
+                HTTPStatus.OK,
+                {"libro_id": "001", "exito": True, "motivo": None},
+            )
+            estado, datos = await cliente.prestar("001", "Luis")
+            assert (estado, datos["motivo"]) == (HTTPStatus.CONFLICT, "ya prestado")
+            estado, _ = await cliente.prestar("999", "Luis")
+            assert estado == HTTPStatus.NOT_FOUND
+            estado, datos = await cliente.prestados()
+            assert [libro["libro_id"] for libro in datos["libros"]] == ["001"]
+            estado, datos = await cliente.devolver("001")
+            assert (estado, datos["exito"]) == (HTTPStatus.OK, True)
+
+    _con_servidor(archivo_temporal, prueba)
+    assert cargar_datos(archivo_temporal).buscar_por_id("001")["prestado_a"] is None
+
+
+def test_buscar(archivo_temporal):
+    """Verifica la búsqueda por texto sin acentos."""
+
+    async def prueba(servidor, puerto):
+        async with ClienteBiblioteca(puerto) as cliente:
+            return await cliente.buscar("garcia marquez")
+
+    estado, datos = _con_servidor(archivo_temporal, prueba)
+    assert estado == HTTPStatus.OK
+    assert [libro["libro_id"] for libro in datos["libros"]] == ["001", "003"]
+
+
+def test_errores_de_peticion(archivo_temporal):
+    """Verifica las respuestas a rutas, métodos y cuerpos inválidos."""
+
+    async def prueba(servidor, puerto):
+        async with ClienteBiblioteca(puerto) as cliente:
+            return [
+                (await cliente.solicitar("GET", "/inexistente"))[0],
+                (await cliente.solicitar("GET", "/prestar"))[0],
+                (await cliente.solicitar("POST", "/prestar", {"libro_id": "001"}))[0],
+            ]
+
+    assert _con_servidor(archivo_temporal, prueba) == [
+        HTTPStatus.NOT_FOUND,
+        HTTPStatus.METHOD_NOT_ALLOWED,
+        HTTPStatus.BAD_REQUEST,
+    ]
+
+
+def test_peticiones_concurrentes_se_agrupan(archivo_temporal):
+    """Verifica que la tarea escritora agrupe y serialice los préstamos."""
+
+    async def prueba(servidor, puerto):
+        clientes = [ClienteBiblioteca(puerto) for _ in range(20)]
+        try:
+            respuestas = await asyncio.gather(
+                *(
+                    cliente.prestar(f"00{1 + i % 3}", f"Aprendiz {i}")
+                    for i, cliente in enumerate(clientes)
+                )
+            )
+        finally:
+            for cliente in clientes:
+                await cliente.cerrar()
+        return respuestas, servidor.lotes
+
+    respuestas, lotes = _con_servidor(archivo_temporal, prueba)
+
+    # Cada libro se presta una sola vez aunque lo pidan varios quioscos
+    exitos = [
+        datos["libro_id"] for estado, datos in respuestas if estado == HTTPStatus.OK
+    ]
+    assert sorted(exitos) == ["001", "002", "003"]
+    assert lotes < len(respuestas)
+    with open(archivo_temporal + ".diario", encoding="utf-8") as f:
+        assert len([json.loads(linea) for linea in f]) == len(exitos)
+
+
+def test_consulta_espera_al_lote_en_curso(archivo_temporal, monkeypatch):
+    """Verifica que una consulta no lea el catálogo a mitad de un lote."""
+    empezado, liberar = threading.Event(), threading.Event()
+    prestar_original = Biblioteca_servidor.prestar_libros_lote
+
+    def prestar_lento(*args):
+        empezado.set()
+        liberar.wait()
+        return prestar_original(*args)
+
+    monkeypatch.setattr(Biblioteca_servidor, "prestar_libros_lote", prestar_lento)
+
+    async def prueba(servidor, puerto):
+        async with (
+            ClienteBiblioteca(puerto) as escritor,
+            ClienteBiblioteca(puerto) as lector,
+        ):
+            prestamo = asyncio.create_task(escritor.prestar("001", "Ana"))
+            await asyncio.to_thread(empezado.wait)
+            consulta = asyncio.create_task(lector.prestados())
+            await asyncio.sleep(0.05)
+            en_espera = not consulta.done()
+            liberar.set()
+            await prestamo
+            _, datos = await consulta
+            return en_espera, [libro["libro_id"] for libro in datos["libros"]]
+
+    assert _con_servidor(archivo_temporal, prueba) == (True, ["001"])
+
+
+def test_servidor_sin_diario(tmp_path):
+    """Verifica que el servidor también pueda reescribir el archivo completo."""
+    archivo = str(tmp_path / "biblioteca.json")
+    catalogo = Catalogo([Libro(libro_id="001", titulo="Libro", isbn="1")])
+
+    async def ejecutar():
+        servidor = ServidorBiblioteca(catalogo, archivo, diario=False)
+        puerto = await servidor.iniciar(puerto=0)
+        try:
+            async with ClienteBiblioteca(puerto) as cliente:
+                return await cliente.prestar("001", "Ana")
+        finally:
+            await servidor.cerrar()
+
+    assert asyncio.run(ejecutar())[0] == HTTPStatus.OK
+    assert catalogo.buscar_por_id("001")["prestado_a"] == "Ana"
+
+
+def test_servidor_con_base_sqlite(tmp_path):
+    """Verifica préstamos y consultas con la biblioteca en una base SQLite."""
+    archivo = str(tmp_path / "biblioteca.db")
+    guardar_datos(
+        [{"libro_id": "001", "titulo": "Rayuela", "autor": "Julio Cortázar"}],
+        archivo,
+    )
+
+    async def prueba(servidor, puerto):
+        async with ClienteBiblioteca(puerto) as cliente:
+            prestado = await cliente.prestar("001", "Ana")
+            _, prestados = await cliente.prestados()
+            _, encontrados = await cliente.buscar("rayuela")
+            return prestado, prestados["libros"], encontrados["libros"]
+
+    try:
+        prestado, prestados, encontrados = _con_servidor(archivo, prueba)
+        assert prestado == (
+            HTTPStatus.OK,
+            {"libro_id": "001", "exito": True, "motivo": None},
+        )
+        assert [libro["prestado_a"] for libro in prestados] == ["Ana"]
+        assert [libro["libro_id"] for libro in encontrados] == ["001"]
+        assert cargar_datos(archivo).buscar_por_id("001")["prestado_a"] == "Ana"
+    finally:
+        Biblioteca_sqlite.cerrar(archivo)
@@ -0,0 +1,157 @@
+"""
+Tests para el almacenamiento SQLite de la biblioteca.
+"""
+
+import sqlite3
+
+import pytest
+
+import Biblioteca_sqlite
+from Biblioteca import (
+    buscar_libro,
+    cargar_datos,
+    devolver_libro,
+    guardar_datos,
+    obtener_prestamos_aprendiz,
+    prestar_libro,
+    ver_libros_prestados,
+)
+
+
+@pytest.fixture
+def base_temporal(tmp_path):
+    """Crea la ruta de una base SQLite temporal y la cierra al final."""
+    archivo = str(tmp_path / "biblioteca.db")
+    yield archivo
+    Biblioteca_sqlite.cerrar(archivo)
+
+
+@pytest.fixture
+def libros_con_datos():
+    """Crea una lista de libros con datos de prueba."""
+    return [
+        {
+            "libro_id": "001",
+            "titulo": "Cien Años de Soledad",
+            "autor": "Gabriel García Márquez",
+            "isbn": "978-0307474728",
+            "prestado_a": None,
+            "fecha_prestamo": None,
+        },
+        {
+            "libro_id": "002",
+            "titulo": "Don Quijote de la Mancha",
+            "autor": "Miguel de Cervantes",
+            "isbn": "978-8424936464",
+            "prestado_a": "Juan Pérez",
+            "fecha_prestamo": "2025-01-01T10:00:00",
+        },
+    ]
+
+
+def leer_fila(archivo, libro_id):
+    """Lee una fila directamente de la base, con otra conexión."""
+    with sqlite3.connect(archivo) as conexion:
+        return conexion.execute(
+            "SELECT prestado_a, fecha_prestamo FROM libros WHERE libro_id = ?",
+            (libro_id,),
+        ).fetchone()
+
+
+def test_es_archivo_sqlite():
+    """Verifica la detección del backend por extensión."""
+    assert Biblioteca_sqlite.es_archivo_sqlite("biblioteca.db")
+    assert Biblioteca_sqlite.es_archivo_sqlite("datos/Biblioteca.SQLITE3")
+    assert not Biblioteca_sqlite.es_archivo_sqlite("biblioteca.json")
+
+
+def test_cargar_crea_biblioteca_inicial(base_temporal):
+    """Verifica que una base nueva se llene con la biblioteca inicial."""
+    catalogo = cargar_datos(base_temporal)
+
+    assert len(catalogo) > 0
+    assert len(Biblioteca_sqlite.cargar_libros(base_temporal)) == len(catalogo)
+
+
+def test_guardar_y_cargar(base_temporal, libros_con_datos):
+    """Verifica que guardar_datos y cargar_datos usen la base."""
+    guardar_datos(libros_con_datos, base_temporal)
+
+    catalogo = cargar_datos(base_temporal)
+
+    assert catalogo.buscar_por_id("002")["prestado_a"] == "Juan Pérez"
+    assert catalogo.buscar_por_isbn("978-0307474728")["libro_id"] == "001"
+
+
+def test_guardar_borra_los_libros_quitados(base_temporal, libros_con_datos):
+    """Verifica que la base quede igual al catálogo guardado."""
+    guardar_datos(libros_con_datos, base_temporal)
+
+    guardar_datos(libros_con_datos[1:], base_temporal)
+
+    assert leer_fila(base_temporal, "001") is None
+    assert [
+        libro["libro_id"] for libro in Biblioteca_sqlite.cargar_libros(base_temporal)
+    ] == ["002"]
+    assert buscar_libro([], "soledad", base_temporal) == []
+
+
+def test_prestar_y_devolver_actualizan_la_fila(base_temporal, libros_con_datos):
+    """Verifica que cada operación se persista como un UPDATE."""
+    guardar_datos(libros_con_datos, base_temporal)
+    catalogo = cargar_datos(base_temporal)
+
+    assert prestar_libro(catalogo, "001", "Ana", base_temporal) is True
+    assert leer_fila(base_temporal, "001")[0] == "Ana"
+
+    assert devolver_libro(catalogo, "002", base_temporal) is True
+    assert leer_fila(base_temporal, "002") == (None, None)
+
+
+def test_ver_libros_prestados_consulta_la_base(base_temporal, libros_con_datos):
+    """Verifica la consulta de prestados sobre la base."""
+    guardar_datos(libros_con_datos, base_temporal)
+
+    prestados = ver_libros_prestados([], base_temporal)
+
+    assert [libro["libro_id"] for libro in prestados] == ["002"]
+
+
+def test_prestamos_aprendiz_consulta_la_base(base_temporal, libros_con_datos):
+    """Verifica la consulta de préstamos de un aprendiz sobre la base."""
+    guardar_datos(libros_con_datos, base_temporal)
+
+    libros = obtener_prestamos_aprendiz([], "Juan Pérez", base_temporal)
+
+    assert [libro["libro_id"] for libro in libros] == ["002"]
+    assert obtener_prestamos_aprendiz([], "Ana", base_temporal) == []
+
+
+def test_buscar_libro_con_fts(base_temporal, libros_con_datos):
+    """Verifica la búsqueda por prefijo y sin acentos en la base."""
+    guardar_datos(libros_con_datos, base_temporal)
+
+    resultados = buscar_libro([], "garcia marq", base_temporal)
+
+    assert [libro["libro_id"] for libro in resultados] == ["001"]
+    assert buscar_libro([], "quijote cervantes", base_temporal)[0]["libro_id"] == "002"
+    assert buscar_libro([], "quijote garcia", base_temporal) == []
+
+
+def test_migra_base_sin_fecha_vencimiento(base_temporal):
+    """Verifica que una base antigua reciba la columna de vencimiento."""
+    with sqlite3.connect(base_temporal) as conexion:
+        conexion.execute(
+            "CREATE TABLE libros (libro_id TEXT PRIMARY KEY, titulo TEXT NOT NULL, "
+            "autor TEXT, isbn TEXT, prestado_a TEXT, fecha_prestamo TEXT)"
+        )
+        conexion.execute(
+            "INSERT INTO libros VALUES ('001', 'Rayuela', 'Cortázar', NULL, NULL, NULL)"
+        )
+    conexion.close()
+
+    catalogo = cargar_datos(base_temporal)
+    prestar_libro(catalogo, "001", "Ana", base_temporal)
+
+    libro = Biblioteca_sqlite.cargar_libros(base_temporal)[0]
+    assert libro["fecha_vencimiento"] is not None
@@ -0,0 +1,40 @@
+"""
+Tests para los bloqueos consultivos entre procesos.
+"""
+
+import pytest
+
+from Bloqueo_archivo import bloquear, ruta_bloqueo
+
+fcntl = pytest.importorskip("fcntl")
+
+
+@pytest.fixture
+def archivo_temporal(tmp_path):
+    """Crea la ruta de un archivo temporal para las pruebas."""
+    return str(tmp_path / "datos.json")
+
+
+def _intentar_bloqueo(archivo: str, modo: int) -> bool:
+    """Intenta tomar el bloqueo sin esperar desde otro descriptor."""
+    with open(ruta_bloqueo(archivo), "a") as f:
+        try:
+            fcntl.flock(f.fileno(), modo | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return False
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+        return True
+
+
+def test_bloqueo_exclusivo_impide_otros(archivo_temporal):
+    """Verifica que el bloqueo exclusivo no admita otro bloqueo."""
+    with bloquear(archivo_temporal):
+        assert _intentar_bloqueo(archivo_temporal, fcntl.LOCK_SH) is False
+    assert _intentar_bloqueo(archivo_temporal, fcntl.LOCK_EX) is True
+
+
+def test_bloqueo_compartido_admite_lectores(archivo_temporal):
+    """Verifica que varios lectores puedan bloquear a la vez."""
+    with bloquear(archivo_temporal, compartido=True):
+        assert _intentar_bloqueo(archivo_temporal, fcntl.LOCK_SH) is True
+        assert _intentar_bloqueo(archivo_temporal, fcntl.LOCK_EX) is False
@@ -0,0 +1,83 @@
+"""
+Tests para la escritura atómica de archivos.
+"""
+
+import os
+
+import pytest
+
+from Escritura_atomica import contenido_igual, escribir_atomico
+
+
+@pytest.fixture
+def archivo_temporal(tmp_path):
+    """Crea la ruta de un archivo temporal para las pruebas."""
+    return tmp_path / "datos.json"
+
+
+def test_escribe_archivo_nuevo(archivo_temporal):
+    """Verifica que se cree el archivo con el contenido indicado."""
+    assert escribir_atomico(archivo_temporal, "[1, 2, 3]") is True
+    assert archivo_temporal.read_text(encoding="utf-8") == "[1, 2, 3]"
+
+
+def test_omite_escritura_sin_cambios(archivo_temporal):
+    """Verifica que no se reescriba un archivo con el mismo contenido."""
+    escribir_atomico(archivo_temporal, "ñandú")
+    modificado = archivo_temporal.stat().st_mtime_ns
+
+    assert escribir_atomico(archivo_temporal, "ñandú") is False
+    assert archivo_temporal.stat().st_mtime_ns == modificado
+    assert escribir_atomico(archivo_temporal, "ñandú", omitir_sin_cambios=False)
+
+
+def test_modo_rapido_sin_fsync(monkeypatch, archivo_temporal):
+    """Verifica que sincronizar=False no llame a fsync."""
+    llamadas = []
+    monkeypatch.setattr(os, "fsync", lambda fd: llamadas.append(fd))
+
+    escribir_atomico(archivo_temporal, "rápido", sincronizar=False)
+
+    assert llamadas == []
+    assert archivo_temporal.read_text(encoding="utf-8") == "rápido"
+
+
+def test_error_conserva_el_original(monkeypatch, archivo_temporal):
+    """Verifica que un fallo a mitad no deje el archivo truncado."""
+    escribir_atomico(archivo_temporal, "original")
+
+    def fallar(*args):
+        raise OSError("disco lleno")
+
+    monkeypatch.setattr(os, "replace", fallar)
+
+    with pytest.raises(OSError):
+        escribir_atomico(archivo_temporal, "nuevo contenido")
+
+    assert archivo_temporal.read_text(encoding="utf-8") == "original"
+    assert os.listdir(archivo_temporal.parent) == ["datos.json"]
+
+
+def test_conserva_permisos(archivo_temporal):
+    """Verifica que el reemplazo mantenga los permisos del original."""
+    archivo_temporal.write_text("x", encoding="utf-8")
+    permisos = 0o640
+    os.chmod(archivo_temporal, permisos)
+
+    escribir_atomico(archivo_temporal, "y")
+
+    assert archivo_temporal.stat().st_mode & 0o777 == permisos
+
+
+def test_contenido_igual(archivo_temporal):
+    """Verifica la comparación de contenido."""
+    assert contenido_igual(archivo_temporal, b"x") is False
+    archivo_temporal.write_bytes(b"abc")
+    assert contenido_igual(archivo_temporal, b"abc") is True
+    assert contenido_igual(archivo_temporal, b"abd") is False
+
+
+def test_escribe_bytes(archivo_temporal):
+    """Verifica que también se puedan escribir datos binarios."""
+    assert escribir_atomico(archivo_temporal, b"\x80\x05binario") is True
+    assert archivo_temporal.read_bytes() == b"\x80\x05binario"
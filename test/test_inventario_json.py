@@ -1,5 +1,7 @@
+import json
 import os
 from contextlib import redirect_stdout
+from datetime import datetime
 from io import StringIO
 
 import pytest
@@ -9,13 +11,19 @@ import Inventario_json
 
 @pytest.fixture(autouse=True)
 def limpiar_archivo():
-    """Elimina el archivo JSON antes y después de cada test."""
-    archivo = "inventario.json"
-    if os.path.exists(archivo):
-        os.remove(archivo)
+    """Elimina el archivo JSON (y sus auxiliares) antes y después de cada test."""
+    archivos = [
+        "inventario.json",
+        Inventario_json.ruta_contador("inventario.json"),
+        Inventario_json.ruta_ventas("inventario.json"),
+    ]
+    for archivo in archivos:
+        if os.path.exists(archivo):
+            os.remove(archivo)
     yield
-    if os.path.exists(archivo):
-        os.remove(archivo)
+    for archivo in archivos:
+        if os.path.exists(archivo):
+            os.remove(archivo)
 
 
 def test_cargar_inventario_nuevo():
@@ -166,3 +174,220 @@ def test_mostrar_inventario_vacio(capsys):
     Inventario_json.mostrar_inventario([])
     salida = capsys.readouterr().out
     assert "vacío" in salida
+
+
+def test_inventario_indice_y_contador(tmp_path):
+    """El inventario busca por ID y no reutiliza IDs tras recargar."""
+    archivo = tmp_path / "inventario.json"
+    inventario = Inventario_json.Inventario(
+        [{"id": 7, "nombre": "Rosa", "cantidad": 5, "precio": 1000, "categoria": "F"}]
+    )
+    siguiente = 8
+
+    assert inventario.buscar_por_id(7)["nombre"] == "Rosa"
+    assert inventario.buscar_por_id(1) is None
+    assert inventario.nuevo_id() == siguiente
+    Inventario_json.guardar_inventario(inventario, archivo)
+
+    cargado = Inventario_json.cargar_inventario(archivo)
+    assert cargado == inventario
+    assert cargado.nuevo_id() == siguiente + 1
+
+
+def test_agregar_y_vender_con_inventario(monkeypatch):
+    """Las funciones interactivas usan el índice del Inventario."""
+    inventario_actual = Inventario_json.cargar_inventario()
+    inputs = iter(["Lirio", "10", "2500", "Flores", "1", "4"])
+    monkeypatch.setattr("rich.prompt.Prompt.ask", lambda *a, **kw: next(inputs))
+    monkeypatch.setattr("rich.prompt.IntPrompt.ask", lambda *a, **kw: int(next(inputs)))
+    monkeypatch.setattr(
+        "rich.prompt.FloatPrompt.ask", lambda *a, **kw: float(next(inputs))
+    )
+
+    Inventario_json.agregar_producto(inventario_actual)
+    Inventario_json.vender_producto(inventario_actual)
+    cantidad = 6
+
+    assert inventario_actual.buscar_por_id(1)["cantidad"] == cantidad
+    assert os.path.exists(Inventario_json.ruta_contador("inventario.json"))
+
+
+def test_totales_acumulados(monkeypatch):
+    """Los totales se ajustan con cada alta, venta y edición."""
+    inventario_actual = Inventario_json.Inventario(
+        [
+            {
+                "id": 1,
+                "nombre": "Rosa",
+                "cantidad": 10,
+                "precio": 1.1,
+                "categoria": "F",
+            },
+            {"id": 2, "nombre": "Maceta", "cantidad": 3, "precio": 5, "categoria": "D"},
+        ]
+    )
+    inputs = iter(["1", "4", "2", "Maceta", "3", "5", "F"])
+    monkeypatch.setattr("rich.prompt.IntPrompt.ask", lambda *a, **kw: int(next(inputs)))
+    monkeypatch.setattr("rich.prompt.Prompt.ask", lambda *a, **kw: next(inputs))
+    monkeypatch.setattr(
+        "rich.prompt.FloatPrompt.ask", lambda *a, **kw: float(next(inputs))
+    )
+
+    Inventario_json.vender_producto(inventario_actual)
+    Inventario_json.editar_producto(inventario_actual)
+    totales = Inventario_json.resumen_inventario(inventario_actual)
+    unidades = 9
+
+    assert totales["unidades"] == unidades
+    assert list(totales["valor_por_categoria"]) == ["F"]
+    assert totales == Inventario_json.calcular_totales(inventario_actual.a_lista())
+    assert Inventario_json.verificar_totales(inventario_actual) is True
+
+
+def test_verificar_totales_corrige_desajustes():
+    """Un cambio hecho por fuera se detecta y se corrige al verificar."""
+    inventario_actual = Inventario_json.Inventario(
+        [{"id": 1, "nombre": "Rosa", "cantidad": 2, "precio": 10, "categoria": "F"}]
+    )
+    inventario_actual[0]["cantidad"] = 5
+
+    assert Inventario_json.verificar_totales(inventario_actual) is False
+    assert Inventario_json.verificar_totales(inventario_actual) is True
+    assert (
+        inventario_actual.totales()["valor"]
+        == Inventario_json.calcular_totales(inventario_actual)["valor"]
+    )
+
+
+def _producto(producto_id, cantidad, categoria="Flores", **extra):
+    """Crea un producto de prueba."""
+    return {
+        "id": producto_id,
+        "nombre": f"Producto {producto_id}",
+        "cantidad": cantidad,
+        "precio": 100,
+        "categoria": categoria,
+        **extra,
+    }
+
+
+def test_bajo_umbral_con_umbrales_propios():
+    """Los umbrales del producto y de la categoría cambian quién se repone."""
+    inventario_actual = Inventario_json.Inventario(
+        [
+            _producto(1, 12),
+            _producto(2, 4),
+            _producto(3, 15, umbral=20),
+            _producto(4, 30, "Macetas"),
+        ]
+    )
+
+    assert [p["id"] for p in inventario_actual.bajo_umbral()] == [2, 3]
+
+    inventario_actual.definir_umbral_categoria("Macetas", 40)
+    inventario_actual.actualizar(inventario_actual.buscar_por_id(2), cantidad=50)
+
+    assert [p["id"] for p in inventario_actual.bajo_umbral()] == [4, 3]
+    reconstruido = Inventario_json.Inventario(
+        inventario_actual.a_lista(), umbrales_categoria={"Macetas": 40}
+    )
+    assert reconstruido.bajo_umbral() == inventario_actual.bajo_umbral()
+
+
+def test_exportar_reposicion(tmp_path):
+    """El reporte CSV lista los faltantes del más urgente al menos."""
+    archivo = tmp_path / "inventario.json"
+    inventario_actual = Inventario_json.Inventario(
+        [_producto(1, 9), _producto(2, 2), _producto(3, 50)],
+        umbrales_categoria={"Flores": 10},
+    )
+    Inventario_json.guardar_inventario(inventario_actual, archivo)
+    cargado = Inventario_json.cargar_inventario(archivo)
+
+    reporte = tmp_path / "reposicion.csv"
+    escritos = Inventario_json.exportar_reposicion(cargado, reporte)
+    filas = reporte.read_text(encoding="utf-8").splitlines()
+
+    assert escritos == len(filas) - 1
+    assert filas[0] == ",".join(Inventario_json.COLUMNAS_REPOSICION)
+    assert filas[1] == "2,Producto 2,Flores,2,10,8"
+    assert cargado.umbrales_categoria == {"Flores": 10}
+
+
+def test_registrar_ventas_en_lote(tmp_path):
+    """Un lote descuenta el stock, rechaza por venta y anota las aceptadas."""
+    archivo = str(tmp_path / "inventario.json")
+    inventario_actual = Inventario_json.Inventario(
+        [_producto(1, 5), _producto(2, 3)], siguiente_id=3
+    )
+
+    resultados = Inventario_json.registrar_ventas(
+        inventario_actual,
+        [(1, 2), (2, 4), (1, 3), (9, 1), (1, 1), (2, 0)],
+        archivo,
+        sincronizar=False,
+        fecha=datetime(2026, 3, 1, 10, 30),
+    )
+
+    assert [r["motivo"] for r in resultados] == [
+        None,
+        Inventario_json.MOTIVO_STOCK_INSUFICIENTE,
+        None,
+        Inventario_json.MOTIVO_NO_ENCONTRADO,
+        Inventario_json.MOTIVO_STOCK_INSUFICIENTE,
+        Inventario_json.MOTIVO_CANTIDAD_INVALIDA,
+    ]
+    assert [p["cantidad"] for p in Inventario_json.cargar_inventario(archivo)] == [
+        0,
+        3,
+    ]
+    assert inventario_actual.verificar_totales(corregir=False)
+    with open(Inventario_json.ruta_ventas(archivo), encoding="utf-8") as f:
+        ventas = [json.loads(linea) for linea in f]
+    assert ventas == [
+        {
+            "fecha": "2026-03-01T10:30:00",
+            "id": 1,
+            "cantidad": cantidad,
+            "precio": 100,
+            "categoria": "Flores",
+        }
+        for cantidad in (2, 3)
+    ]
+
+
+def test_registrar_ventas_deshace_si_no_se_guarda(tmp_path, monkeypatch):
+    """Si el inventario no se puede guardar, no queda rastro de las ventas."""
+    archivo = str(tmp_path / "inventario.json")
+    inventario_actual = Inventario_json.Inventario([_producto(1, 5)], siguiente_id=2)
+    Inventario_json.registrar_ventas(inventario_actual, [(1, 1)], archivo)
+    registro = Inventario_json.ruta_ventas(archivo)
+    tamano = os.path.getsize(registro)
+    stock = inventario_actual.buscar_por_id(1)["cantidad"]
+    monkeypatch.setattr(
+        Inventario_json, "guardar_inventario", lambda *args, **kwargs: False
+    )
+
+    [resultado] = Inventario_json.registrar_ventas(inventario_actual, [(1, 2)], archivo)
+
+    assert resultado["motivo"] == Inventario_json.MOTIVO_ERROR_GUARDADO
+    assert inventario_actual.buscar_por_id(1)["cantidad"] == stock
+    assert inventario_actual.verificar_totales(corregir=False)
+    assert os.path.getsize(registro) == tamano
+
+
+def test_registrar_ventas_tras_una_linea_cortada(tmp_path):
+    """Tras una línea cortada a medias, el lote empieza en una línea nueva."""
+    archivo = str(tmp_path / "inventario.json")
+    inventario_actual = Inventario_json.Inventario([_producto(1, 5)], siguiente_id=2)
+    registro = Inventario_json.ruta_ventas(archivo)
+    with open(registro, "w", encoding="utf-8") as f:
+        f.write('{"fecha": "2026-03-0')
+
+    vendidas = 2
+    Inventario_json.registrar_ventas(inventario_actual, [(1, vendidas)], archivo)
+
+    with open(registro, encoding="utf-8") as f:
+        cortada, venta = f.read().splitlines()
+    assert cortada == '{"fecha": "2026-03-0'
+    assert json.loads(venta)["cantidad"] == vendidas
@@ -0,0 +1,153 @@
+"""
+Tests para el registro de ventas del inventario.
+"""
+
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+import Inventario_json
+from Inventario_ventas import (
+    SIN_CATEGORIA,
+    RegistroVentas,
+    a_segundos_locales,
+    cargar_ventas,
+)
+
+
+def _venta(fecha, producto_id, cantidad, precio=100, categoria="Flores"):
+    """Crea una venta con el formato del archivo de ventas."""
+    return {
+        "fecha": fecha,
+        "id": producto_id,
+        "cantidad": cantidad,
+        "precio": precio,
+        "categoria": categoria,
+    }
+
+
+@pytest.fixture
+def registro():
+    """Registro con ventas en dos días, una de ellas fuera de orden."""
+    ventas = RegistroVentas(capacidad=1)
+    ventas.agregar(
+        [
+            _venta("2026-03-01T09:15:00", 1, 2),
+            _venta("2026-03-01T09:45:00", 2, 1, precio=500, categoria="Macetas"),
+            _venta("2026-03-01T18:00:00", 1, 3),
+        ]
+    )
+    ventas.agregar([_venta("2026-03-02T10:00:00", 3, 10, precio=20)])
+    ventas.agregar(
+        [_venta("2026-03-01T23:59:59", 2, 1, precio=500, categoria="Macetas")]
+    )
+    ventas.agregar([_venta("2026-03-02T10:30:00", 3, 5, precio=20)])
+    return ventas
+
+
+def test_ingresos_por_periodo(registro):
+    """Verifica los ingresos por día y por hora, también por categoría."""
+    total = 6
+    assert len(registro) == total
+    assert registro.ingresos_por_periodo() == [
+        (datetime(2026, 3, 1), 1500.0),
+        (datetime(2026, 3, 2), 300.0),
+    ]
+    assert registro.ingresos_por_periodo("hora", hasta=datetime(2026, 3, 1, 19)) == [
+        (datetime(2026, 3, 1, 9), 700.0),
+        (datetime(2026, 3, 1, 18), 300.0),
+    ]
+    assert registro.ingresos_por_periodo(categoria="Macetas") == [
+        (datetime(2026, 3, 1), 1000.0)
+    ]
+    assert registro.ingresos_por_periodo(categoria="Semillas") == []
+
+
+def test_mas_vendidos_en_un_periodo(registro):
+    """Verifica los más vendidos combinando días completos y horas sueltas."""
+    assert registro.mas_vendidos() == [(3, 15), (1, 5), (2, 2)]
+    assert registro.mas_vendidos(1, criterio="ingresos") == [(2, 1000.0)]
+    # Desde las 18:00 del 1 hasta las 10:00 del 2: no entra la hora de las 10
+    assert registro.mas_vendidos(
+        desde=datetime(2026, 3, 1, 18, 30), hasta=datetime(2026, 3, 2, 10)
+    ) == [(1, 3), (2, 1)]
+    assert registro.categorias_mas_vendidas() == [
+        ("Macetas", 1000.0),
+        ("Flores", 800.0),
+    ]
+    assert registro.mas_vendidos(desde=datetime(2026, 4, 1)) == []
+    with pytest.raises(ValueError):
+        registro.mas_vendidos(criterio="precio")
+
+
+def test_acumulados_coinciden_con_las_ventas():
+    """Verifica los acumulados contra un recálculo sobre ventas al azar."""
+    generador = np.random.default_rng(0)
+    filas = 5_000
+    fechas = a_segundos_locales("2026-01-01T00:00:00") + generador.integers(
+        0, 90 * 86_400, filas
+    )
+    productos = generador.integers(0, 50, filas)
+    cantidades = generador.integers(1, 5, filas)
+    precios = generador.integers(10, 1_000, filas).astype(float)
+    registro = RegistroVentas()
+    for lote in np.array_split(np.arange(filas), 7):
+        registro.agregar_columnas(
+            fechas[lote],
+            productos[lote].tolist(),
+            [f"Categoría {p % 4}" for p in productos[lote]],
+            cantidades[lote],
+            precios[lote],
+        )
+
+    desde, hasta = datetime(2026, 1, 10, 7, 20), datetime(2026, 2, 3, 15)
+    elegidas = (fechas >= a_segundos_locales(datetime(2026, 1, 10, 7))) & (
+        fechas < a_segundos_locales(hasta)
+    )
+    unidades = np.bincount(productos[elegidas], weights=cantidades[elegidas])
+    esperado = int(unidades.max())
+    assert registro.mas_vendidos(1, desde, hasta)[0][1] == esperado
+    ingresos = sum(ingreso for _, ingreso in registro.ingresos_por_periodo())
+    assert ingresos == pytest.approx(float(cantidades @ precios))
+
+
+def test_cargar_ventas_registradas(tmp_path):
+    """Verifica que las ventas guardadas se carguen y se sigan sumando."""
+    archivo = str(tmp_path / "inventario.json")
+    inventario = Inventario_json.Inventario(
+        [
+            {
+                "id": 1,
+                "nombre": "Rosa",
+                "cantidad": 10,
+                "precio": 50,
+                "categoria": "Flores",
+            },
+            {
+                "id": 2,
+                "nombre": "Pala",
+                "cantidad": 5,
+                "precio": 200,
+                "categoria": "Herramientas",
+            },
+        ]
+    )
+    Inventario_json.registrar_ventas(inventario, [(1, 4), (2, 1)], archivo)
+    # Una venta anotada sin categoría y una línea cortada a medias
+    with open(Inventario_json.ruta_ventas(archivo), "a", encoding="utf-8") as f:
+        f.write('{"fecha": "2026-03-01T12:00:00", "id": 2, "cantidad": 1, ')
+        f.write('"precio": 200}\n{"fecha": "2026-03-0')
+
+    inventario.ventas = cargar_ventas(archivo)
+    anotadas = 3
+    assert len(inventario.ventas) == anotadas
+    Inventario_json.registrar_ventas(inventario, [(1, 1)], archivo)
+
+    assert inventario.ventas.mas_vendidos() == [(1, 5), (2, 2)]
+    assert cargar_ventas(archivo).mas_vendidos() == [(1, 5), (2, 2)]
+    assert inventario.ventas.categorias_mas_vendidas() == [
+        ("Flores", 250.0),
+        ("Herramientas", 200.0),
+        (SIN_CATEGORIA, 200.0),
+    ]
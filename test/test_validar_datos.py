@@ -15,6 +15,7 @@ from Validar_datos_genericos import (
     negar_validador,
     tiene_clave,
     tiene_longitud_minima,
+    valor_de_clave,
 )
 
 
@@ -99,6 +100,14 @@ def test_tiene_clave():
     assert validador("no_diccionario") is False
 
 
+def test_valor_de_clave():
+    validador = valor_de_clave("nombre", es_texto_no_vacio)
+    assert validador({"nombre": "Juan"}) is True
+    assert validador({"nombre": "  "}) is False
+    assert validador({"edad": 30}) is False
+    assert validador("no_diccionario") is False
+
+
 def test_combinar_validadores_AND():
     validador = combinar_validadores(es_mayor_a_10, es_numero_par)
     assert validador(12) is True